@@ -0,0 +1,252 @@
+"""
+Record/replay of LLM calls for the AutoGen multi-agent system.
+In record mode every chat completion made through a model client is saved,
+together with its timing, to a cassette file. In replay mode the responses
+are served from the cassette without any network access, optionally with
+the recorded timing, so the pipeline can be profiled deterministically.
+
+A cassette is a JSONL file with one request/response record per line.
+Requests are matched on a hash of their parameters; identical requests are
+answered in recorded order.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+CASSETTE_MODES = ("record", "replay")
+
+# Request parameters that do not affect the response
+IGNORED_PARAMETERS = ("stream_options", "timeout", "extra_headers", "extra_query", "extra_body")
+
+_cassettes: Dict[str, "Cassette"] = {}
+_cassettes_lock = threading.Lock()
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+def _jsonable(value: Any) -> Any:
+    """Convert request parameters to JSON-compatible values."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, type):
+        return value.__name__
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """
+    Compute the matching key of a chat completion request.
+
+    Args:
+        request: Keyword arguments of the completions.create call
+
+    Returns:
+        Hex digest identifying the request
+    """
+    relevant = {key: value for key, value in request.items() if key not in IGNORED_PARAMETERS}
+    encoded = json.dumps(_jsonable(relevant), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """A file of recorded chat completion requests and responses."""
+
+    def __init__(self, path: str, mode: str, simulate_timing: bool = False):
+        """
+        Open the cassette.
+
+        Args:
+            path: JSONL file of the cassette
+            mode: "record" to append new calls, "replay" to serve recorded ones
+            simulate_timing: Whether replayed responses take as long as the recorded ones
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.simulate_timing = simulate_timing
+        self._lock = threading.Lock()
+        self._records: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+
+        if mode == "replay":
+            self._load()
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+    def _load(self) -> None:
+        """Read the recorded calls."""
+        with open(self.path, encoding="utf-8") as cassette_file:
+            for line in cassette_file:
+                if line.strip():
+                    record = json.loads(line)
+                    self._records.setdefault(record["key"], []).append(record)
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._records.values())
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Save a recorded call.
+
+        Args:
+            record: Record with the request key, request and response
+        """
+        with self._lock:
+            self._records.setdefault(record["key"], []).append(record)
+            with open(self.path, "a", encoding="utf-8") as cassette_file:
+                cassette_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def lookup(self, key: str) -> Dict[str, Any]:
+        """
+        Get the next recorded call for a request.
+        Identical requests get their recordings in order; once those are
+        used up, the last one is repeated.
+
+        Args:
+            key: Request key
+
+        Returns:
+            The recorded call
+
+        Raises:
+            CassetteMissError: If the request was never recorded
+        """
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                raise CassetteMissError(f"No recorded response for request {key[:12]} in {self.path}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return records[min(position, len(records) - 1)]
+
+
+class _RecordingStream:
+    """Passes the chunks of a streamed response through while recording them."""
+
+    def __init__(self, stream: Any, cassette: Cassette, record: Dict[str, Any], start: float):
+        self._stream = stream
+        self._cassette = cassette
+        self._record = record
+        self._last = start
+        self._iterator = None
+
+    def __aiter__(self) -> "_RecordingStream":
+        return self
+
+    async def __anext__(self) -> ChatCompletionChunk:
+        if self._iterator is None:
+            self._iterator = self._stream.__aiter__()
+        try:
+            chunk = await self._iterator.__anext__()
+        except StopAsyncIteration:
+            self._record["latency_s"] = round(sum(item["delay_s"] for item in self._record["chunks"]), 6)
+            self._cassette.append(self._record)
+            raise
+        now = time.perf_counter()
+        self._record["chunks"].append({"delay_s": round(now - self._last, 6), "chunk": chunk.model_dump(mode="json")})
+        self._last = now
+        return chunk
+
+    async def close(self) -> None:
+        if hasattr(self._stream, "close"):
+            await self._stream.close()
+
+
+class _ReplayStream:
+    """Serves the recorded chunks of a streamed response."""
+
+    def __init__(self, chunks: List[Dict[str, Any]], simulate_timing: bool):
+        self._chunks = iter(chunks)
+        self._simulate_timing = simulate_timing
+
+    def __aiter__(self) -> "_ReplayStream":
+        return self
+
+    async def __anext__(self) -> ChatCompletionChunk:
+        item = next(self._chunks, None)
+        if item is None:
+            raise StopAsyncIteration
+        if self._simulate_timing:
+            await asyncio.sleep(item["delay_s"])
+        return ChatCompletionChunk.model_validate(item["chunk"])
+
+    async def close(self) -> None:
+        pass
+
+
+def use_cassette(client: Any, cassette: Cassette) -> Any:
+    """
+    Record the completions of a client to a cassette, or serve them from it.
+
+    Args:
+        client: AutoGen OpenAI-compatible client
+        cassette: Cassette to record to or replay from
+
+    Returns:
+        The same client
+    """
+    completions = client._client.chat.completions
+    create = completions.create
+
+    async def create_with_cassette(*args, **kwargs):
+        key = request_key(kwargs)
+        stream = bool(kwargs.get("stream"))
+
+        if cassette.mode == "replay":
+            record = cassette.lookup(key)
+            if stream:
+                return _ReplayStream(record["chunks"], cassette.simulate_timing)
+            if cassette.simulate_timing:
+                await asyncio.sleep(record["latency_s"])
+            return ChatCompletion.model_validate(record["response"])
+
+        record = {"key": key, "request": _jsonable(kwargs), "stream": stream}
+        start = time.perf_counter()
+        response = await create(*args, **kwargs)
+        if stream:
+            record["chunks"] = []
+            return _RecordingStream(response, cassette, record, start)
+
+        record["latency_s"] = round(time.perf_counter() - start, 6)
+        record["response"] = response.model_dump(mode="json")
+        cassette.append(record)
+        return response
+
+    completions.create = create_with_cassette
+    return client
+
+
+def get_cassette(path: str, mode: str, simulate_timing: bool = False) -> Cassette:
+    """
+    Get the cassette for a file, shared by all model clients of the process.
+
+    Args:
+        path: JSONL file of the cassette
+        mode: "record" or "replay"
+        simulate_timing: Whether replayed responses take as long as the recorded ones
+
+    Returns:
+        Shared Cassette
+    """
+    with _cassettes_lock:
+        cassette = _cassettes.get(path)
+        if cassette is None or cassette.mode != mode:
+            cassette = Cassette(path, mode, simulate_timing)
+            _cassettes[path] = cassette
+        return cassette
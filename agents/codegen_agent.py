@@ -5,9 +5,8 @@ This agent is responsible for generating Python code based on detailed specifica
 import asyncio
 from typing import Dict, Any
 from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.messages import TextMessage
-from autogen_core import CancellationToken
 from agents.provider import get_llm_model
+from agents.prompt_builder import build_prompt, send_prompt
 
 
 # System message for the code generation agent
@@ -26,6 +25,29 @@ CODEGEN_AGENT_SYSTEM_MESSAGE = """
 请用中文回答。
 """
 
+# Static task instructions, sent before the variable specification
+CODEGEN_TASK_INSTRUCTIONS = """
+请根据以下编程语言、复杂度和需求生成代码（请用中文回答）。
+请生成干净、高效、文档完善的代码。
+"""
+
+
+def build_codegen_prompt(specification: Dict[str, Any]) -> str:
+    """
+    Build the code generation prompt.
+    
+    Args:
+        specification: Detailed requirements specification
+        
+    Returns:
+        Prompt with the static instructions first
+    """
+    return build_prompt(CODEGEN_TASK_INSTRUCTIONS, [
+        ("编程语言", specification.get("language", "python")),
+        ("复杂度", specification.get("complexity", "medium")),
+        ("需求", specification.get("original_requirements", ""))
+    ])
+
 
 # Create the code generation agent
 codegen_agent = AssistantAgent(
@@ -46,30 +68,8 @@ async def generate_code(specification: Dict[str, Any]) -> str:
         Generated Python code as string
     """
     try:
-        # Create a detailed prompt for code generation
-        requirements = specification.get("original_requirements", "")
-        language = specification.get("language", "python")
-        complexity = specification.get("complexity", "medium")
-        
-        prompt = f"""
-请为以下需求生成{language}代码（请用中文回答）：
-需求：{requirements}
-复杂度：{complexity}
-
-请生成干净、高效、文档完善的代码。
-"""
-        
-        # Create a message for the agent
-        message = TextMessage(
-            content=prompt,
-            source="user"
-        )
-        
         # Get response from the agent
-        response = await codegen_agent.on_messages(
-            [message], 
-            CancellationToken()
-        )
+        response = await send_prompt(codegen_agent, build_codegen_prompt(specification))
         
         # Extract the code from the response
         generated_code = response.chat_message.content
@@ -11,6 +11,9 @@ class CodeGenerationRequest(BaseModel):
     requirements: str = Field(..., description="Programming requirements to implement")
     language: str = Field(default="python", description="Programming language for code generation")
     complexity: str = Field(default="medium", description="Complexity level (simple/medium/complex)")
+    refine: bool = Field(default=False, description="Whether to fix the generated code until local checks pass")
+    priority: str = Field(default="interactive", description="Scheduling priority class (interactive/batch)")
+    session_id: Optional[str] = Field(default=None, description="Conversation session the request and its code are recorded in")
 
 
 class CodeReviewResult(BaseModel):
@@ -27,7 +30,9 @@ class CodeOptimizationResult(BaseModel):
     original_code: str = Field(..., description="Original code before optimization")
     optimized_code: str = Field(..., description="Optimized code")
     improvements: List[str] = Field(default_factory=list, description="List of improvements made")
-    performance_gain: float = Field(default=0.0, description="Estimated performance gain percentage")
+    performance_gain: float = Field(default=0.0, description="Measured performance gain percentage")
+    accepted: bool = Field(default=True, description="Whether the optimized code passed benchmarking")
+    benchmark: Optional[Dict[str, Any]] = Field(None, description="Benchmark measurements (speedup, confidence interval, memory delta)")
 
 
 class GeneratedTestResult(BaseModel):
@@ -35,7 +40,25 @@ class GeneratedTestResult(BaseModel):
     source_code: str = Field(..., description="Source code to generate tests for")
     test_code: str = Field(..., description="Generated test code")
     test_cases: List[str] = Field(default_factory=list, description="List of test cases")
-    coverage_percentage: float = Field(default=0.0, description="Estimated code coverage percentage")
+    coverage_percentage: float = Field(default=0.0, description="Measured code coverage percentage (lines and branches)")
+    line_coverage: float = Field(default=0.0, description="Measured line coverage percentage")
+    branch_coverage: float = Field(default=0.0, description="Measured branch coverage percentage")
+    tests_passed: int = Field(default=0, description="Number of generated tests that passed")
+    tests_failed: int = Field(default=0, description="Number of generated tests that failed or errored")
+    coverage_measured: bool = Field(default=False, description="Whether coverage was measured by running the tests")
+
+
+class RefinementResult(BaseModel):
+    """Model for generate-check-fix refinement results."""
+    code: str = Field(..., description="Final code")
+    test_code: Optional[str] = Field(None, description="Generated tests the code was checked against")
+    passed: bool = Field(default=False, description="Whether the final code passed all local checks")
+    iterations: int = Field(default=0, description="Number of fix attempts")
+    stop_reason: str = Field(..., description="Why the loop stopped (passed/max_iterations/token_budget/time_budget/error)")
+    failures: List[str] = Field(default_factory=list, description="Failures remaining in the final code")
+    tokens_used: int = Field(default=0, description="LLM tokens spent by the loop")
+    elapsed_seconds: float = Field(default=0.0, description="Wall-clock time spent by the loop")
+    history: List[Dict[str, Any]] = Field(default_factory=list, description="Failure count per iteration")
 
 
 class AgentResponse(BaseModel):
@@ -59,6 +82,7 @@ class SessionState(BaseModel):
     """Model for maintaining session state."""
     session_id: str = Field(..., description="Unique session identifier")
     user_id: Optional[str] = Field(None, description="User identifier")
-    messages: List[ChatMessage] = Field(default_factory=list, description="Conversation history")
+    messages: List[ChatMessage] = Field(default_factory=list, description="Recent conversation history")
+    summary: Optional[str] = Field(None, description="Rolling summary of turns evicted from the history")
     created_at: datetime = Field(default_factory=datetime.now, description="Session creation time")
     last_activity: datetime = Field(default_factory=datetime.now, description="Last activity timestamp")
\ No newline at end of file
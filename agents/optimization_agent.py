@@ -3,12 +3,15 @@ Code Optimization Agent for the AutoGen multi-agent system.
 This agent is responsible for optimizing generated code for better performance and readability.
 """
 import asyncio
-from typing import List
+from typing import Any, Dict, List, Optional
 from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.messages import TextMessage
-from autogen_core import CancellationToken
 from agents.provider import get_llm_model
+from agents.prompt_builder import build_prompt, fence, send_prompt
 from agents.models import CodeOptimizationResult
+from config.settings import settings
+from utils.benchmark import benchmark_code
+from utils.sandbox import get_default_pool
+from utils.tracing import trace_span
 
 
 # System message for the code optimization agent
@@ -28,6 +31,29 @@ OPTIMIZATION_AGENT_SYSTEM_MESSAGE = """
 请用中文回答。
 """
 
+# Static task instructions, sent before the variable code
+OPTIMIZATION_TASK_INSTRUCTIONS = """
+请优化以下代码以获得更好的性能、可读性和可维护性（请用中文回答）。
+请提供优化后的代码并详细解释所做的改进。
+"""
+
+
+def build_optimization_prompt(code: str, opportunities: List[str]) -> str:
+    """
+    Build the code optimization prompt.
+    
+    Args:
+        code: Python code to optimize
+        opportunities: Optimization opportunities found by static analysis
+        
+    Returns:
+        Prompt with the static instructions first
+    """
+    return build_prompt(OPTIMIZATION_TASK_INSTRUCTIONS, [
+        ("已识别的优化机会", ', '.join(opportunities) if opportunities else '未识别到优化机会'),
+        ("原始代码", fence(code))
+    ])
+
 
 def identify_optimization_opportunities(code: str) -> List[str]:
     """
@@ -55,21 +81,59 @@ def identify_optimization_opportunities(code: str) -> List[str]:
     return opportunities
 
 
-def estimate_performance_gain(original_code: str, optimized_code: str) -> float:
+def run_benchmark(original_code: str, optimized_code: str,
+                  inputs: Optional[Dict[str, List[List[Any]]]] = None) -> Dict[str, Any]:
+    """
+    Benchmark the original code against the optimized code.
+    
+    Args:
+        original_code: Original code
+        optimized_code: Optimized code or agent response containing it
+        inputs: Optional argument lists per entry point
+        
+    Returns:
+        Dictionary with benchmark results
+    """
+    if not settings.benchmark_enabled:
+        return {
+            "status": "skipped",
+            "accepted": True,
+            "reason": "Benchmarking disabled",
+            "entry_points": [],
+            "performance_gain": 0.0
+        }
+    
+    with trace_span("tool.benchmark", repeats=settings.benchmark_repeats) as span:
+        benchmark = benchmark_code(
+            original_code,
+            optimized_code,
+            inputs=inputs,
+            repeats=settings.benchmark_repeats,
+            warmup=settings.benchmark_warmup,
+            timeout=settings.benchmark_timeout,
+            memory_limit_mb=settings.benchmark_memory_limit_mb,
+            pool=get_default_pool(settings.sandbox_workers)
+        )
+        if span is not None:
+            span.set_attribute("status", benchmark["status"])
+            span.set_attribute("accepted", benchmark["accepted"])
+        return benchmark
+
+
+def estimate_performance_gain(original_code: str, optimized_code: str,
+                              inputs: Optional[Dict[str, List[List[Any]]]] = None) -> float:
     """
-    Estimate the performance gain from optimization.
-    In a real implementation, this would run benchmarks.
+    Measure the performance gain from optimization by running benchmarks.
     
     Args:
         original_code: Original code
         optimized_code: Optimized code
+        inputs: Optional argument lists per entry point
         
     Returns:
-        Estimated performance gain percentage
+        Measured performance gain percentage (0.0 if it could not be measured)
     """
-    # This is a simplified implementation
-    # In a real implementation, we would run actual benchmarks
-    return 15.0  # Assume 15% improvement
+    return run_benchmark(original_code, optimized_code, inputs)["performance_gain"]
 
 
 # Create the code optimization agent
@@ -80,12 +144,16 @@ optimization_agent = AssistantAgent(
 )
 
 
-async def optimize_code(code: str) -> CodeOptimizationResult:
+async def optimize_code(code: str,
+                        inputs: Optional[Dict[str, List[List[Any]]]] = None) -> CodeOptimizationResult:
     """
     Optimize code for better performance and readability.
+    The optimized code is benchmarked against the original in the sandbox and
+    rejected if it changes outputs or runs slower.
     
     Args:
         code: Python code to optimize
+        inputs: Optional representative inputs per entry point for benchmarking
         
     Returns:
         CodeOptimizationResult with optimization results
@@ -94,38 +162,14 @@ async def optimize_code(code: str) -> CodeOptimizationResult:
         # Identify optimization opportunities
         opportunities = identify_optimization_opportunities(code)
         
-        # Create a detailed prompt for the agent
-        prompt = f"""
-请优化以下代码以获得更好的性能、可读性和可维护性（请用中文回答）：
-
-原始代码：
-```python
-{code}
-```
-
-已识别的优化机会：
-{', '.join(opportunities) if opportunities else '未识别到优化机会'}
-
-请提供优化后的代码并详细解释所做的改进。
-"""
-        
-        # Create a message for the agent
-        message = TextMessage(
-            content=prompt,
-            source="user"
-        )
-        
         # Get response from the agent
-        response = await optimization_agent.on_messages(
-            [message], 
-            CancellationToken()
-        )
+        response = await send_prompt(optimization_agent, build_optimization_prompt(code, opportunities))
         
         # Extract the optimized code from the response
         optimized_code = response.chat_message.content
         
-        # Estimate performance gain
-        performance_gain = estimate_performance_gain(code, optimized_code)
+        # Benchmark both versions in the execution sandbox
+        benchmark = await asyncio.to_thread(run_benchmark, code, optimized_code, inputs)
         
         # Create improvements list
         improvements = []
@@ -133,11 +177,17 @@ async def optimize_code(code: str) -> CodeOptimizationResult:
             improvements.extend(opportunities)
         improvements.append("Code optimized by AI assistant")
         
+        if not benchmark["accepted"]:
+            improvements.append(f"Optimization rejected: {benchmark['reason']}")
+            optimized_code = code
+        
         return CodeOptimizationResult(
             original_code=code,
             optimized_code=optimized_code,
             improvements=improvements,
-            performance_gain=performance_gain
+            performance_gain=benchmark["performance_gain"],
+            accepted=benchmark["accepted"],
+            benchmark=benchmark
         )
         
     except Exception as e:
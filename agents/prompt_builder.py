@@ -0,0 +1,71 @@
+"""
+Prompt builder for the AutoGen multi-agent system.
+LLM providers cache prompt prefixes, so a request is cheaper and faster when
+it starts with the same bytes as an earlier one. Prompts are therefore laid
+out as: static system message, static task instructions, then the variable
+content (requirements, code) last.
+"""
+import inspect
+from typing import Optional, Sequence, Tuple
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import TextMessage
+from autogen_core import CancellationToken
+from autogen_core.models import UserMessage
+
+
+def fence(code: str, language: str = "python") -> str:
+    """
+    Wrap code in a markdown code fence.
+
+    Args:
+        code: Code to wrap
+        language: Language tag of the fence
+
+    Returns:
+        Fenced code block
+    """
+    body = code.strip("\n")
+    return f"```{language}\n{body}\n```"
+
+
+def build_prompt(instructions: str, sections: Sequence[Tuple[str, Optional[str]]] = ()) -> str:
+    """
+    Assemble a prompt with the static instructions first and variable content last.
+    The instructions are normalized so the same constant always produces a
+    byte-identical prefix, regardless of how it is indented in the source.
+
+    Args:
+        instructions: Static task instructions (must not contain variable content)
+        sections: (title, content) pairs of variable content, ordered from the
+            least to the most variable; sections without content are skipped
+
+    Returns:
+        Prompt text
+    """
+    parts = [inspect.cleandoc(instructions)]
+    for title, content in sections:
+        if content:
+            parts.append(f"{title}：\n{content}")
+    return "\n\n".join(parts) + "\n"
+
+
+async def send_prompt(agent: AssistantAgent, prompt: str) -> Response:
+    """
+    Send a prompt to an agent as a fresh conversation.
+    Only the agent's system message and model client are used: the prompt
+    goes straight to the model with the system message, so every request
+    starts with the same prefix, and concurrent pipelines sharing an agent
+    never see each other's messages.
+
+    Args:
+        agent: Agent to ask
+        prompt: Prompt from build_prompt
+
+    Returns:
+        The agent's response
+    """
+    # The module-level agents are shared by all pipelines, so their model context must not be used
+    messages = [*agent._system_messages, UserMessage(content=prompt, source="user")]
+    result = await agent._model_client.create(messages, cancellation_token=CancellationToken())
+    return Response(chat_message=TextMessage(content=result.content, source=agent.name, models_usage=result.usage))
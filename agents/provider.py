@@ -2,9 +2,83 @@
 Flexible provider configuration for LLM models.
 Based on examples/agent/providers.py pattern.
 """
+import asyncio
 from typing import Optional
+import openai
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from config.settings import settings
+from agents.cassette import get_cassette, use_cassette
+from agents.usage import parse_usage, usage_tracker
+from utils.tracing import trace_span
+
+# Errors after which a model call is retried
+RETRYABLE_ERRORS = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+RETRY_BACKOFF = 0.5
+MAX_RETRY_BACKOFF = 8.0
+
+
+def instrument_client(client: OpenAIChatCompletionClient) -> OpenAIChatCompletionClient:
+    """
+    Record the provider's usage report of every completion made by a client.
+    The usage is attributed to the current task and stage, if any. Retries
+    are done here rather than inside the OpenAI client, so that every
+    attempt is visible as a span.
+    
+    Args:
+        client: AutoGen OpenAI-compatible client
+        
+    Returns:
+        The same client
+    """
+    completions = client._client.chat.completions
+    create = completions.create
+
+    async def create_and_record(*args, **kwargs):
+        model = kwargs.get("model", "unknown")
+        with trace_span("llm.chat_completion", model=model) as span:
+            for attempt in range(settings.llm_max_retries + 1):
+                try:
+                    with trace_span("llm.attempt", attempt=attempt):
+                        response = await create(*args, **kwargs)
+                    break
+                except RETRYABLE_ERRORS:
+                    if attempt >= settings.llm_max_retries:
+                        raise
+                    await asyncio.sleep(min(RETRY_BACKOFF * 2 ** attempt, MAX_RETRY_BACKOFF))
+            
+            usage = getattr(response, "usage", None)
+            usage_tracker.record(model, usage)
+            if span is not None:
+                span.set_attribute("attempts", attempt + 1)
+                for key, value in (parse_usage(usage) or {}).items():
+                    span.set_attribute(key, value)
+            return response
+
+    completions.create = create_and_record
+    return client
+
+
+def configure_client(client: OpenAIChatCompletionClient) -> OpenAIChatCompletionClient:
+    """
+    Apply the configured cassette, if any, and the usage instrumentation to a client.
+    The cassette sits below the instrumentation, so replayed calls are
+    still accounted and traced.
+    
+    Args:
+        client: AutoGen OpenAI-compatible client
+        
+    Returns:
+        The same client
+    """
+    if settings.llm_cassette_mode:
+        if not settings.llm_cassette_path:
+            raise ValueError("LLM_CASSETTE_PATH is required when LLM_CASSETTE_MODE is set")
+        use_cassette(client, get_cassette(
+            settings.llm_cassette_path,
+            settings.llm_cassette_mode,
+            simulate_timing=settings.llm_cassette_simulate_timing
+        ))
+    return instrument_client(client)
 
 
 def get_llm_model(model_choice: Optional[str] = None):
@@ -24,20 +98,22 @@ def get_llm_model(model_choice: Optional[str] = None):
     # Create provider based on configuration
     if provider == "openai":
         base_url = settings.llm_base_url or "https://api.openai.com/v1"
-        return OpenAIChatCompletionClient(
+        return configure_client(OpenAIChatCompletionClient(
             model=llm_choice,
             api_key=api_key,
-            base_url=base_url
-        )
+            base_url=base_url,
+            max_retries=0
+        ))
     elif provider == "gemini":
         # For Google Gemini, we can use the OpenAI-compatible API endpoint
         # Gemini supports OpenAI-compatible API
         base_url = settings.llm_base_url or "https://generativelanguage.googleapis.com/v1beta"
-        return OpenAIChatCompletionClient(
+        return configure_client(OpenAIChatCompletionClient(
             model=llm_choice,
             api_key=api_key,
-            base_url=base_url
-        )
+            base_url=base_url,
+            max_retries=0
+        ))
     else:
         raise ValueError(f"Unsupported LLM provider: {provider}")
 
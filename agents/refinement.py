@@ -0,0 +1,194 @@
+"""
+Refinement loop for the AutoGen multi-agent system.
+Generated code is checked with fast local checks (syntax, pyflakes and the
+generated tests) and the code generation agent is re-prompted with the
+concrete failures until the checks pass or a budget runs out.
+"""
+import asyncio
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from agents.codegen_agent import codegen_agent
+from agents.models import RefinementResult
+from agents.prompt_builder import build_prompt, fence, send_prompt
+from agents.testing_agent import build_testing_prompt, identify_test_cases, run_generated_tests, testing_agent
+from config.settings import settings
+from utils.code_validator import extract_code_block, run_pyflakes_check, validate_python_syntax
+
+
+# Static fix instructions, sent before the variable code and failures
+REFINEMENT_TASK_INSTRUCTIONS = """
+以下代码未通过自动检查。请根据检查失败项修复代码（请用中文回答）。
+只修复列出的问题，保持其余行为不变。
+你的回答应该只包含修复后的完整代码，不要包含额外的解释或markdown格式。
+"""
+
+# Pyflakes prefixes lines with the path of a temporary file
+_PYFLAKES_LOCATION = re.compile(r"^.*?:(\d+):(?:\d+:)?\s*")
+
+
+def build_refinement_prompt(specification: Dict[str, Any], code: str, failures: List[str]) -> str:
+    """
+    Build the prompt asking the code generation agent to fix failures.
+
+    Args:
+        specification: Detailed requirements specification
+        code: Current code
+        failures: Failed checks
+
+    Returns:
+        Prompt with the static instructions first
+    """
+    return build_prompt(REFINEMENT_TASK_INSTRUCTIONS, [
+        ("需求", specification.get("original_requirements", "")),
+        ("当前代码", fence(code)),
+        ("检查失败项", "\n".join(f"- {failure}" for failure in failures))
+    ])
+
+
+def run_local_checks(code: str, test_code: Optional[str] = None) -> List[str]:
+    """
+    Run the fast local checks on code.
+    Checks run in order of cost and stop at the first failing one, since
+    later checks are meaningless on code that does not parse.
+
+    Args:
+        code: Python code to check
+        test_code: Generated tests to run, if any (skipped when test execution is disabled)
+
+    Returns:
+        List of concrete failures; empty if all checks pass
+    """
+    syntax = validate_python_syntax(code)
+    if not syntax["valid"]:
+        return syntax["errors"]
+
+    pyflakes = run_pyflakes_check(code)
+    if pyflakes["issues"]:
+        return [_PYFLAKES_LOCATION.sub(r"line \1: ", issue) for issue in pyflakes["issues"]]
+
+    if test_code and settings.test_execution_enabled:
+        execution = run_generated_tests(code, test_code)
+        if not execution["success"]:
+            return [f"Tests could not be run: {execution['error']}"]
+        if execution["tests_failed"]:
+            return execution["failures"] or [f"{execution['tests_failed']} tests failed"]
+
+    return []
+
+
+def _response_tokens(response) -> int:
+    """Count the prompt and completion tokens of an agent response."""
+    usage = response.chat_message.models_usage
+    if usage is None:
+        return 0
+    return usage.prompt_tokens + usage.completion_tokens
+
+
+async def _ask(agent, prompt: str, timeout: float) -> Tuple[str, int]:
+    """
+    Send a prompt to an agent within the remaining time budget.
+
+    Args:
+        agent: Agent to ask
+        prompt: Prompt to send
+        timeout: Remaining time budget in seconds
+
+    Returns:
+        Tuple of (extracted code, tokens used)
+    """
+    response = await asyncio.wait_for(send_prompt(agent, prompt), timeout=timeout)
+    return extract_code_block(response.chat_message.content), _response_tokens(response)
+
+
+async def refine_code(specification: Dict[str, Any], code: str, test_code: Optional[str] = None,
+                      max_iterations: Optional[int] = None, token_budget: Optional[int] = None,
+                      time_budget: Optional[float] = None) -> RefinementResult:
+    """
+    Iteratively fix generated code until the local checks pass.
+    Tests are generated once for the initial code and re-run on every revision.
+
+    Args:
+        specification: Detailed requirements specification
+        code: Generated code
+        test_code: Tests to check against (generated if not given)
+        max_iterations: Maximum number of fix attempts
+        token_budget: Maximum LLM tokens spent by the loop
+        time_budget: Maximum wall-clock seconds spent by the loop
+
+    Returns:
+        RefinementResult with the final code and the budget used
+    """
+    max_iterations = settings.refinement_max_iterations if max_iterations is None else max_iterations
+    token_budget = settings.refinement_token_budget if token_budget is None else token_budget
+    time_budget = settings.refinement_time_budget if time_budget is None else time_budget
+
+    start = time.monotonic()
+    tokens_used = 0
+    iterations = 0
+    history = []
+    code = extract_code_block(code)
+
+    def result(stop_reason: str, failures: List[str]) -> RefinementResult:
+        return RefinementResult(
+            code=code,
+            test_code=test_code,
+            passed=not failures,
+            iterations=iterations,
+            stop_reason=stop_reason,
+            failures=failures,
+            tokens_used=tokens_used,
+            elapsed_seconds=round(time.monotonic() - start, 3),
+            history=history
+        )
+
+    try:
+        if test_code is None and settings.test_execution_enabled:
+            try:
+                test_code, tokens = await _ask(
+                    testing_agent, build_testing_prompt(code, identify_test_cases(code)), time_budget
+                )
+                tokens_used += tokens
+            except Exception as e:
+                # Refine against the static checks alone
+                print(f"Error generating tests for refinement: {e}")
+
+        while True:
+            failures = await asyncio.to_thread(run_local_checks, code, test_code)
+            history.append({"iteration": iterations, "failures": len(failures)})
+            if not failures:
+                return result("passed", failures)
+            if iterations >= max_iterations:
+                return result("max_iterations", failures)
+            if tokens_used >= token_budget:
+                return result("token_budget", failures)
+            remaining = time_budget - (time.monotonic() - start)
+            if remaining <= 0:
+                return result("time_budget", failures)
+
+            try:
+                revised_code, tokens = await _ask(
+                    codegen_agent, build_refinement_prompt(specification, code, failures), remaining
+                )
+            except asyncio.TimeoutError:
+                return result("time_budget", failures)
+            tokens_used += tokens
+            iterations += 1
+            code = revised_code
+
+    except Exception as e:
+        print(f"Error refining code: {e}")
+        return result("error", [f"Refinement failed: {str(e)}"])
+
+
+# Example usage
+async def main():
+    """Example of how to use the refinement loop."""
+    specification = {"original_requirements": "Create a function that calculates fibonacci numbers"}
+    code = "def fibonacci(n):\n    return fibonacci(n - 1) + fibonacci(n - 2) + undefined\n"
+    refinement = await refine_code(specification, code)
+    print(f"Refinement result: {refinement}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
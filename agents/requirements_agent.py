@@ -5,9 +5,8 @@ This agent is responsible for understanding user requirements and breaking them
 import asyncio
 from typing import Dict, Any
 from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.messages import TextMessage
-from autogen_core import CancellationToken
 from agents.provider import get_llm_model
+from agents.prompt_builder import build_prompt, send_prompt
 
 
 # System message for the requirements analysis agent
@@ -26,6 +25,24 @@ REQUIREMENTS_AGENT_SYSTEM_MESSAGE = """
 请用中文回答。
 """
 
+# Static task instructions, sent before the variable requirements
+REQUIREMENTS_TASK_INSTRUCTIONS = """
+请分析以下需求并提供详细的规范说明（请用中文回答）。
+"""
+
+
+def build_requirements_prompt(user_requirements: str) -> str:
+    """
+    Build the requirements analysis prompt.
+    
+    Args:
+        user_requirements: User requirements description
+        
+    Returns:
+        Prompt with the static instructions first
+    """
+    return build_prompt(REQUIREMENTS_TASK_INSTRUCTIONS, [("需求", user_requirements)])
+
 
 def breakdown_requirements(requirements: str) -> Dict[str, Any]:
     """
@@ -69,17 +86,8 @@ async def analyze_requirements(user_requirements: str) -> Dict[str, Any]:
         Dictionary with detailed requirements specification
     """
     try:
-        # Create a message for the agent
-        message = TextMessage(
-            content=f"请分析以下需求并提供详细的规范说明（请用中文回答）：{user_requirements}",
-            source="user"
-        )
-        
         # Get response from the agent
-        await requirements_agent.on_messages(
-            [message], 
-            CancellationToken()
-        )
+        await send_prompt(requirements_agent, build_requirements_prompt(user_requirements))
         
         # For now, we'll use a simple breakdown
         # In a more advanced implementation, we could parse the agent's response
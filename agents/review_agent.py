@@ -5,9 +5,8 @@ This agent is responsible for reviewing generated code for quality, PEP8 complia
 import asyncio
 from typing import List
 from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.messages import TextMessage
-from autogen_core import CancellationToken
 from agents.provider import get_llm_model
+from agents.prompt_builder import build_prompt, fence, send_prompt
 from agents.models import CodeReviewResult
 
 
@@ -28,6 +27,25 @@ REVIEW_AGENT_SYSTEM_MESSAGE = """
 请用中文回答。
 """
 
+# Static task instructions, sent before the variable code
+REVIEW_TASK_INSTRUCTIONS = """
+请审查以下代码的质量、PEP8合规性和最佳实践（请用中文回答）。
+请提供详细的反馈和具体的改进建议。
+"""
+
+
+def build_review_prompt(code: str) -> str:
+    """
+    Build the code review prompt.
+    
+    Args:
+        code: Python code to review
+        
+    Returns:
+        Prompt with the static instructions first
+    """
+    return build_prompt(REVIEW_TASK_INSTRUCTIONS, [("代码", fence(code))])
+
 
 def check_pep8_compliance(code: str) -> bool:
     """
@@ -132,29 +150,8 @@ async def review_code(code: str) -> CodeReviewResult:
         for suggestion in suggestions:
             review_comments.append(f"Suggestion: {suggestion}")
         
-        # Create a detailed prompt for the agent
-        prompt = f"""
-请审查以下代码的质量、PEP8合规性和最佳实践（请用中文回答）：
-
-代码：
-```
-{code}
-```
-
-请提供详细的反馈和具体的改进建议。
-"""
-        
-        # Create a message for the agent
-        message = TextMessage(
-            content=prompt,
-            source="user"
-        )
-        
         # Get response from the agent
-        response = await review_agent.on_messages(
-            [message], 
-            CancellationToken()
-        )
+        response = await send_prompt(review_agent, build_review_prompt(code))
         
         # Extract the review feedback from the response
         agent_feedback = response.chat_message.content
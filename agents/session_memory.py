@@ -0,0 +1,479 @@
+"""
+Session memory management for the AutoGen multi-agent system.
+Keeps the live conversation of a SessionState within a token budget. Turns
+that fall out of the budget are archived in compact form and folded into a
+rolling summary in the background, so prompt size and memory stay bounded in
+long sessions. Sessions can be persisted to a session store and reloaded
+after being evicted from memory.
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from agents.models import ChatMessage, SessionState
+
+# Default memory limits
+DEFAULT_MAX_TOKENS = 4000
+DEFAULT_SUMMARY_MAX_TOKENS = 500
+DEFAULT_MAX_SESSIONS = 256
+DEFAULT_MAX_ARCHIVED = 200
+
+# Per-message overhead of the chat format, in tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SESSION_BACKENDS = ("memory", "sqlite")
+
+Summarizer = Callable[[Optional[str], List["ArchivedMessage"], int], Awaitable[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+    Uses the common heuristic of about four characters per token, which is
+    accurate enough for budgeting and needs no tokenizer download.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    return (len(text) + 3) // 4
+
+
+def message_tokens(message: ChatMessage) -> int:
+    """
+    Estimate the prompt tokens a chat message takes.
+
+    Args:
+        message: Message to measure
+
+    Returns:
+        Estimated token count including the message overhead
+    """
+    return estimate_tokens(message.content) + MESSAGE_OVERHEAD_TOKENS
+
+
+class ArchivedMessage:
+    """
+    Compact storage for a message evicted from the live conversation.
+    Only the names of the tools used are kept, and the timestamp is stored as
+    a POSIX timestamp instead of a datetime.
+    """
+
+    __slots__ = ("role", "content", "timestamp", "tools")
+
+    def __init__(self, role: str, content: str, timestamp: float, tools: Tuple[str, ...] = ()):
+        self.role = sys.intern(role)
+        self.content = content
+        self.timestamp = timestamp
+        self.tools = tools
+
+    @classmethod
+    def from_message(cls, message: ChatMessage) -> "ArchivedMessage":
+        """Create an archived copy of a chat message."""
+        tools = tuple(sys.intern(str(tool.get("name", tool.get("tool", "")))) for tool in message.tools_used or ())
+        return cls(message.role, message.content, message.timestamp.timestamp(), tools)
+
+    def to_message(self) -> ChatMessage:
+        """Restore the archived message as a chat message."""
+        return ChatMessage(
+            role=self.role,
+            content=self.content,
+            timestamp=datetime.fromtimestamp(self.timestamp),
+            tools_used=[{"name": tool} for tool in self.tools] or None
+        )
+
+    def to_record(self) -> List[Any]:
+        """Serialize the message as a compact JSON-compatible list."""
+        return [self.role, self.content, self.timestamp, list(self.tools)]
+
+    @classmethod
+    def from_record(cls, record: List[Any]) -> "ArchivedMessage":
+        """Deserialize a message written by to_record."""
+        role, content, timestamp, tools = record
+        return cls(role, content, timestamp, tuple(tools))
+
+
+async def extractive_summarizer(previous_summary: Optional[str], messages: List[ArchivedMessage],
+                                max_tokens: int) -> str:
+    """
+    Fold evicted turns into the summary without calling a model.
+    Keeps the first sentence of each turn and drops the oldest lines once the
+    summary exceeds its budget.
+
+    Args:
+        previous_summary: Summary of the turns evicted earlier
+        messages: Newly evicted turns
+        max_tokens: Token budget of the summary
+
+    Returns:
+        Updated summary
+    """
+    lines = previous_summary.splitlines() if previous_summary else []
+    for message in messages:
+        first_sentence = message.content.strip().split("\n", 1)[0].split(". ", 1)[0][:200]
+        lines.append(f"- {message.role}: {first_sentence}")
+
+    while len(lines) > 1 and estimate_tokens("\n".join(lines)) > max_tokens:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+def model_summarizer(model_client) -> Summarizer:
+    """
+    Create a summarizer that asks an LLM to fold evicted turns into the summary.
+
+    Args:
+        model_client: AutoGen chat completion client, e.g. from get_llm_model()
+
+    Returns:
+        Summarizer coroutine function
+    """
+    from autogen_core.models import SystemMessage, UserMessage
+
+    async def summarize(previous_summary: Optional[str], messages: List[ArchivedMessage], max_tokens: int) -> str:
+        transcript = "\n".join(f"{message.role}: {message.content}" for message in messages)
+        prompt = (
+            f"Previous summary:\n{previous_summary or '(none)'}\n\n"
+            f"New conversation turns:\n{transcript}\n\n"
+            f"Write an updated summary of the whole conversation in at most {max_tokens} tokens. "
+            "Keep decisions, requirements and open questions."
+        )
+        result = await model_client.create([
+            SystemMessage(content="You summarize conversations concisely."),
+            UserMessage(content=prompt, source="user")
+        ])
+        return str(result.content)
+
+    return summarize
+
+
+class SessionMemory:
+    """
+    Token-budgeted conversation memory for one session.
+    The live messages of the SessionState act as a ring buffer: when their
+    estimated size exceeds the budget, the oldest turns are moved to the
+    archive and summarized asynchronously. The archive keeps the latest
+    max_archived turns; older ones survive only in the summary.
+    """
+
+    def __init__(self, state: SessionState, max_tokens: int = DEFAULT_MAX_TOKENS,
+                 summary_max_tokens: int = DEFAULT_SUMMARY_MAX_TOKENS,
+                 summarizer: Summarizer = extractive_summarizer,
+                 archive: Optional[List[ArchivedMessage]] = None,
+                 max_archived: int = DEFAULT_MAX_ARCHIVED):
+        """
+        Create the memory for a session.
+
+        Args:
+            state: Session state whose messages are managed
+            max_tokens: Token budget of the live messages
+            summary_max_tokens: Token budget of the rolling summary
+            summarizer: Coroutine function folding evicted turns into the summary
+            archive: Previously archived messages
+            max_archived: Number of archived turns kept
+        """
+        self.state = state
+        self.max_tokens = max_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.summarizer = summarizer
+        self.max_archived = max_archived
+        self.archive: List[ArchivedMessage] = archive or []
+        self._token_counts = deque(message_tokens(message) for message in state.messages)
+        self._tokens = sum(self._token_counts)
+        self._unsummarized: List[ArchivedMessage] = []
+        self._summary_task: Optional[asyncio.Task] = None
+        self._evict()
+
+    @property
+    def tokens(self) -> int:
+        """Estimated tokens of the live messages."""
+        return self._tokens
+
+    def add_message(self, message: ChatMessage) -> None:
+        """
+        Append a message to the conversation, evicting old turns if needed.
+
+        Args:
+            message: Message to append
+        """
+        self.state.messages.append(message)
+        self._token_counts.append(message_tokens(message))
+        self._tokens += self._token_counts[-1]
+        self.state.last_activity = datetime.now()
+        self._evict()
+
+    def _evict(self) -> None:
+        """Archive the oldest turns until the live messages fit the budget."""
+        evict_count = 0
+        # The latest message always stays live, even if it exceeds the budget alone
+        while self._tokens > self.max_tokens and len(self._token_counts) - evict_count > 1:
+            self._tokens -= self._token_counts[evict_count]
+            evict_count += 1
+        if not evict_count:
+            return
+
+        evicted = [ArchivedMessage.from_message(message) for message in self.state.messages[:evict_count]]
+        del self.state.messages[:evict_count]
+        for _ in range(evict_count):
+            self._token_counts.popleft()
+        self.archive.extend(evicted)
+        self._unsummarized.extend(evicted)
+        # Turns not yet in the summary are the newest in the archive and are never dropped
+        excess = len(self.archive) - max(self.max_archived, len(self._unsummarized))
+        if excess > 0:
+            del self.archive[:excess]
+        self._schedule_summary()
+
+    def _schedule_summary(self) -> None:
+        """Start background summarization if an event loop is running."""
+        if self._summary_task is not None and not self._summary_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop: the turns are summarized on the next flush()
+            return
+        self._summary_task = loop.create_task(self._summarize_pending())
+
+    async def _summarize_pending(self) -> None:
+        """Fold all unsummarized turns into the summary."""
+        while self._unsummarized:
+            batch, self._unsummarized = self._unsummarized, []
+            try:
+                self.state.summary = await self.summarizer(self.state.summary, batch, self.summary_max_tokens)
+            except Exception as e:
+                print(f"Error summarizing session {self.state.session_id}: {e}")
+                self._unsummarized = batch + self._unsummarized
+                return
+
+    async def flush(self) -> None:
+        """Wait until all evicted turns are reflected in the summary."""
+        if self._summary_task is not None:
+            await self._summary_task
+        await self._summarize_pending()
+
+    def context_messages(self) -> List[ChatMessage]:
+        """
+        Get the messages to send as conversation context.
+
+        Returns:
+            The summary as a system message, if any, followed by the live messages
+        """
+        messages = list(self.state.messages)
+        if self.state.summary:
+            messages.insert(0, ChatMessage(
+                role="system",
+                content=f"Summary of the earlier conversation:\n{self.state.summary}"
+            ))
+        return messages
+
+    def full_history(self) -> List[ChatMessage]:
+        """
+        Get the conversation, including the archived turns still kept.
+
+        Returns:
+            Archived and live messages in chronological order
+        """
+        return [message.to_message() for message in self.archive] + list(self.state.messages)
+
+    def to_record(self) -> Dict[str, Any]:
+        """
+        Serialize the session, including its archive, for a session store.
+        Unsummarized turns are kept in the archive and re-summarized on load.
+
+        Returns:
+            JSON-compatible dictionary
+        """
+        return {
+            "state": self.state.model_dump(mode="json"),
+            "archive": [message.to_record() for message in self.archive],
+            "unsummarized": len(self._unsummarized)
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], **kwargs) -> "SessionMemory":
+        """
+        Restore a session serialized by to_record.
+
+        Args:
+            record: Serialized session
+            **kwargs: Memory options (max_tokens, summary_max_tokens, summarizer, max_archived)
+
+        Returns:
+            Restored session memory
+        """
+        archive = [ArchivedMessage.from_record(message) for message in record["archive"]]
+        unsummarized = archive[len(archive) - record.get("unsummarized", 0):]
+        memory = cls(SessionState.model_validate(record["state"]), archive=archive, **kwargs)
+        if unsummarized:
+            memory._unsummarized = unsummarized + memory._unsummarized
+            memory._schedule_summary()
+        return memory
+
+
+class SqliteSessionStore(MutableMapping):
+    """
+    Session records kept in a SQLite database in WAL mode, keyed by session ID.
+    Sessions have their own table, so they never mix with the records of
+    the task store even when both use the same database file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open the store.
+
+        Args:
+            path: Database file
+        """
+        self.path = path
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection to the database."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def __getitem__(self, session_id: str) -> Dict[str, Any]:
+        row = self._connection().execute("SELECT data FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        if row is None:
+            raise KeyError(session_id)
+        return json.loads(row[0])
+
+    def __setitem__(self, session_id: str, record: Dict[str, Any]) -> None:
+        self._connection().execute("INSERT OR REPLACE INTO sessions (session_id, data) VALUES (?, ?)",
+                                   (session_id, json.dumps(record)))
+
+    def __delitem__(self, session_id: str) -> None:
+        cursor = self._connection().execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        if cursor.rowcount == 0:
+            raise KeyError(session_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([row[0] for row in self._connection().execute("SELECT session_id FROM sessions")])
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+def get_session_store(backend: str = "memory", path: Optional[str] = None) -> MutableMapping:
+    """
+    Create a session store.
+
+    Args:
+        backend: "memory" or "sqlite"
+        path: Database file of the SQLite backend
+
+    Returns:
+        Dictionary or SqliteSessionStore
+    """
+    if backend == "memory":
+        return {}
+    if backend == "sqlite":
+        return SqliteSessionStore(path or "sessions.db")
+    raise ValueError(f"Unsupported session backend: {backend}")
+
+
+class SessionManager:
+    """
+    Keeps recently used sessions in memory and persists the rest to a session store.
+    The store is any mutable mapping of session IDs to session records, such
+    as a SqliteSessionStore.
+    """
+
+    def __init__(self, store: Optional[MutableMapping] = None,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS, **memory_options):
+        """
+        Create the manager.
+
+        Args:
+            store: Session store sessions are persisted to
+            max_sessions: Number of sessions kept in memory
+            **memory_options: Options passed to every SessionMemory
+        """
+        self.store = store if store is not None else {}
+        self.max_sessions = max_sessions
+        self.memory_options = memory_options
+        self._sessions: "OrderedDict[str, SessionMemory]" = OrderedDict()
+
+    def get(self, session_id: str, user_id: Optional[str] = None) -> SessionMemory:
+        """
+        Get a session, loading it from the store or creating it if needed.
+
+        Args:
+            session_id: Session identifier
+            user_id: User identifier for new sessions
+
+        Returns:
+            Session memory
+        """
+        memory = self._sessions.get(session_id)
+        if memory is not None:
+            self._sessions.move_to_end(session_id)
+            return memory
+
+        record = self.store.get(session_id)
+        if record is not None:
+            memory = SessionMemory.from_record(record, **self.memory_options)
+        else:
+            memory = SessionMemory(SessionState(session_id=session_id, user_id=user_id), **self.memory_options)
+        self._sessions[session_id] = memory
+        self._evict()
+        return memory
+
+    def save(self, session_id: str) -> None:
+        """
+        Persist a session in memory to the store.
+
+        Args:
+            session_id: Session identifier
+        """
+        memory = self._sessions.get(session_id)
+        if memory is not None:
+            self.store[session_id] = memory.to_record()
+
+    def _evict(self) -> None:
+        """Persist and drop the least recently used sessions above the limit."""
+        while len(self._sessions) > self.max_sessions:
+            session_id, memory = self._sessions.popitem(last=False)
+            self.store[session_id] = memory.to_record()
+
+    def close(self) -> None:
+        """Persist all sessions in memory to the store."""
+        for session_id in list(self._sessions):
+            self.save(session_id)
+
+
+# Example usage
+async def main():
+    """Example of how to use the session memory."""
+    memory = SessionMemory(SessionState(session_id="example"), max_tokens=50)
+    for turn in range(10):
+        memory.add_message(ChatMessage(role="user", content=f"Question {turn}. Please explain this in detail."))
+        memory.add_message(ChatMessage(role="assistant", content=f"Answer {turn}. Here is the explanation."))
+    await memory.flush()
+    print(f"Live messages: {len(memory.state.messages)}, archived: {len(memory.archive)}")
+    print(f"Summary:\n{memory.state.summary}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,12 +3,15 @@ Testing Agent for the AutoGen multi-agent system.
 This agent is responsible for generating test cases and test code for the generated code.
 """
 import asyncio
-from typing import List
+from typing import Any, Dict, List, Optional
 from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.messages import TextMessage
-from autogen_core import CancellationToken
 from agents.provider import get_llm_model
+from agents.prompt_builder import build_prompt, fence, send_prompt
 from agents.models import GeneratedTestResult
+from config.settings import settings
+from utils.coverage_runner import measure_coverage
+from utils.sandbox import get_default_pool
+from utils.tracing import trace_span
 
 
 # System message for the testing agent
@@ -29,6 +32,30 @@ TESTING_AGENT_SYSTEM_MESSAGE = """
 请用中文回答。
 """
 
+# Static task instructions, sent before the variable code
+TESTING_TASK_INSTRUCTIONS = """
+请为以下Python代码生成全面的pytest测试用例和测试代码（请用中文回答）。
+请生成干净、可读的测试代码。
+包含正常情况、边界情况和错误条件的测试。
+"""
+
+
+def build_testing_prompt(code: str, test_cases: List[str]) -> str:
+    """
+    Build the test generation prompt.
+    
+    Args:
+        code: Python code to generate tests for
+        test_cases: Test cases found by static analysis
+        
+    Returns:
+        Prompt with the static instructions first
+    """
+    return build_prompt(TESTING_TASK_INSTRUCTIONS, [
+        ("已识别的测试用例", ', '.join(test_cases) if test_cases else '未识别到测试用例'),
+        ("待测试代码", fence(code))
+    ])
+
 
 def identify_test_cases(code: str) -> List[str]:
     """
@@ -53,19 +80,32 @@ def identify_test_cases(code: str) -> List[str]:
     return test_cases
 
 
-def estimate_coverage(test_cases: List[str]) -> float:
+def run_generated_tests(code: str, test_code: str) -> Dict[str, Any]:
     """
-    Estimate code coverage based on test cases.
+    Run the generated tests under coverage.py in the execution sandbox.
     
     Args:
-        test_cases: List of test cases
+        code: Source code under test
+        test_code: Generated test code
         
     Returns:
-        Estimated code coverage percentage
+        Dictionary with measured coverage and pass/fail counts
     """
-    # This is a simplified implementation
-    # In a real implementation, we would use actual coverage tools
-    return min(len(test_cases) * 25.0, 100.0)  # Assume each test case covers 25%
+    if not settings.test_execution_enabled:
+        return {"success": False, "error": "Test execution disabled"}
+    
+    with trace_span("tool.coverage") as span:
+        execution = measure_coverage(
+            code,
+            test_code,
+            timeout=settings.test_execution_timeout,
+            memory_limit_mb=settings.test_execution_memory_limit_mb,
+            pool=get_default_pool(settings.sandbox_workers)
+        )
+        if span is not None:
+            span.set_attribute("success", execution["success"])
+            span.set_attribute("tests_failed", execution.get("tests_failed", 0))
+        return execution
 
 
 # Create the testing agent
@@ -76,12 +116,13 @@ testing_agent = AssistantAgent(
 )
 
 
-async def generate_tests(code: str) -> GeneratedTestResult:
+async def generate_tests(code: str, test_code: Optional[str] = None) -> GeneratedTestResult:
     """
     Generate test cases and test code for the given code.
     
     Args:
         code: Python code to generate tests for
+        test_code: Previously generated tests to reuse instead of asking the agent
         
     Returns:
         TestGenerationResult with test generation results
@@ -90,45 +131,39 @@ async def generate_tests(code: str) -> GeneratedTestResult:
         # Identify test cases
         test_cases = identify_test_cases(code)
         
-        # Create a detailed prompt for the agent
-        prompt = f"""
-请为以下Python代码生成全面的pytest测试用例和测试代码（请用中文回答）：
-
-待测试代码：
-```python
-{code}
-```
-
-已识别的测试用例：
-{', '.join(test_cases) if test_cases else '未识别到测试用例'}
-
-请生成干净、可读的测试代码。
-包含正常情况、边界情况和错误条件的测试。
-"""
-        
-        # Create a message for the agent
-        message = TextMessage(
-            content=prompt,
-            source="user"
-        )
-        
-        # Get response from the agent
-        response = await testing_agent.on_messages(
-            [message], 
-            CancellationToken()
-        )
-        
-        # Extract the test code from the response
-        test_code = response.chat_message.content
+        if test_code is None:
+            # Get response from the agent
+            response = await send_prompt(testing_agent, build_testing_prompt(code, test_cases))
+            
+            # Extract the test code from the response
+            test_code = response.chat_message.content
         
-        # Estimate coverage
-        coverage_percentage = estimate_coverage(test_cases)
+        # Measure coverage by running the tests, when running generated code is enabled
+        if not settings.test_execution_enabled:
+            return GeneratedTestResult(
+                source_code=code,
+                test_code=test_code,
+                test_cases=test_cases
+            )
+        execution = await asyncio.to_thread(run_generated_tests, code, test_code)
+        if not execution["success"]:
+            print(f"Coverage could not be measured: {execution['error']}")
+            return GeneratedTestResult(
+                source_code=code,
+                test_code=test_code,
+                test_cases=test_cases
+            )
         
         return GeneratedTestResult(
             source_code=code,
             test_code=test_code,
             test_cases=test_cases,
-            coverage_percentage=coverage_percentage
+            coverage_percentage=execution["coverage_percentage"],
+            line_coverage=execution["line_coverage"],
+            branch_coverage=execution["branch_coverage"],
+            tests_passed=execution["tests_passed"],
+            tests_failed=execution["tests_failed"],
+            coverage_measured=True
         )
         
     except Exception as e:
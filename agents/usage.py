@@ -0,0 +1,250 @@
+"""
+Token usage accounting for the AutoGen multi-agent system.
+Every completion made through an instrumented model client is recorded in
+the global tracker (per model and per stage) and, when it runs inside a
+tracked task, in that task's usage. Tasks and stages are tracked with
+context variables, so concurrent tasks are attributed correctly.
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+from config.settings import settings
+
+# Stage name for completions made outside any stage
+UNATTRIBUTED_STAGE = "unattributed"
+
+_current_task_usage: ContextVar[Optional["TaskUsage"]] = ContextVar("current_task_usage", default=None)
+_current_stage: ContextVar[str] = ContextVar("current_stage", default=UNATTRIBUTED_STAGE)
+
+
+def _empty_totals() -> Dict[str, int]:
+    """Create zeroed usage counters."""
+    return {"requests": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+
+def _add_usage(totals: Dict[str, int], usage: Dict[str, int]) -> None:
+    """Add one usage record to a set of counters."""
+    totals["requests"] += usage.get("requests", 1)
+    totals["prompt_tokens"] += usage["prompt_tokens"]
+    totals["cached_tokens"] += usage["cached_tokens"]
+    totals["completion_tokens"] += usage["completion_tokens"]
+    totals["total_tokens"] += usage["prompt_tokens"] + usage["completion_tokens"]
+
+
+def parse_usage(usage: Any) -> Optional[Dict[str, int]]:
+    """
+    Extract token counts from the usage object of an OpenAI-compatible response.
+
+    Args:
+        usage: Response usage object, or None
+
+    Returns:
+        Dictionary with prompt, cached and completion tokens, or None
+    """
+    if usage is None:
+        return None
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", None) or 0,
+        "cached_tokens": getattr(details, "cached_tokens", None) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", None) or 0
+    }
+
+
+def estimate_cost(totals: Dict[str, int]) -> float:
+    """
+    Estimate the cost of token usage from the configured prices.
+    Cached prompt tokens are charged at the cached price when one is set.
+
+    Args:
+        totals: Usage counters
+
+    Returns:
+        Cost in USD
+    """
+    cached_price = settings.llm_cached_prompt_cost_per_1k
+    if cached_price is None:
+        cached_price = settings.llm_prompt_cost_per_1k
+    uncached_tokens = totals["prompt_tokens"] - totals["cached_tokens"]
+    cost = (
+        uncached_tokens * settings.llm_prompt_cost_per_1k
+        + totals["cached_tokens"] * cached_price
+        + totals["completion_tokens"] * settings.llm_completion_cost_per_1k
+    ) / 1000
+    return round(cost, 6)
+
+
+def _with_derived(totals: Dict[str, int]) -> Dict[str, Any]:
+    """Add the cached ratio and cost to a copy of usage counters."""
+    stats = dict(totals)
+    prompt_tokens = totals["prompt_tokens"]
+    stats["cached_ratio"] = round(totals["cached_tokens"] / prompt_tokens, 4) if prompt_tokens else 0.0
+    stats["cost_usd"] = estimate_cost(totals)
+    return stats
+
+
+class TaskUsage:
+    """Token usage of one task, per stage, with an optional budget."""
+
+    def __init__(self, token_budget: Optional[int] = None):
+        """
+        Create the usage record of a task.
+
+        Args:
+            token_budget: Maximum total tokens of the task, or None for no limit
+        """
+        self.token_budget = token_budget
+        self.stages: Dict[str, Dict[str, int]] = {}
+        self.totals = _empty_totals()
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, usage: Dict[str, int]) -> None:
+        """
+        Record one completion.
+
+        Args:
+            stage: Stage that made the completion
+            usage: Token counts from parse_usage
+        """
+        with self._lock:
+            _add_usage(self.stages.setdefault(stage, _empty_totals()), usage)
+            _add_usage(self.totals, usage)
+
+    @property
+    def total_tokens(self) -> int:
+        """Total prompt and completion tokens of the task."""
+        return self.totals["total_tokens"]
+
+    @property
+    def budget_exceeded(self) -> bool:
+        """Whether the task has used up its token budget."""
+        return bool(self.token_budget) and self.total_tokens >= self.token_budget
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the usage for the task result.
+
+        Returns:
+            Dictionary with per-stage and total usage, cost and budget state
+        """
+        with self._lock:
+            return {
+                "stages": {stage: _with_derived(totals) for stage, totals in self.stages.items()},
+                "total": _with_derived(self.totals),
+                "token_budget": self.token_budget,
+                "budget_exceeded": self.budget_exceeded
+            }
+
+
+class UsageTracker:
+    """
+    Accumulates token usage reported by the provider across all tasks.
+    Includes the prompt tokens served from the provider's prefix cache,
+    which the AutoGen client does not surface in its own usage results.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[str, Dict[str, int]] = {}
+        self._stages: Dict[str, Dict[str, int]] = {}
+        self._totals = _empty_totals()
+        self._tasks = 0
+        self._tasks_over_budget = 0
+
+    def record(self, model: str, usage: Any) -> None:
+        """
+        Record the usage of one completion response.
+        The usage is also added to the current task, if one is being tracked.
+
+        Args:
+            model: Model name
+            usage: The usage object of an OpenAI-compatible response
+        """
+        counts = parse_usage(usage)
+        if counts is None:
+            return
+        stage = _current_stage.get()
+        with self._lock:
+            _add_usage(self._models.setdefault(model, _empty_totals()), counts)
+            _add_usage(self._stages.setdefault(stage, _empty_totals()), counts)
+            _add_usage(self._totals, counts)
+
+        task_usage = _current_task_usage.get()
+        if task_usage is not None:
+            task_usage.record(stage, counts)
+
+    def record_task(self, task_usage: TaskUsage) -> None:
+        """
+        Count a finished task.
+
+        Args:
+            task_usage: Usage of the task
+        """
+        with self._lock:
+            self._tasks += 1
+            self._tasks_over_budget += task_usage.budget_exceeded
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get aggregate usage.
+
+        Returns:
+            Dictionary with usage and cost per model, per stage and in total
+        """
+        with self._lock:
+            return {
+                "models": {model: _with_derived(totals) for model, totals in self._models.items()},
+                "stages": {stage: _with_derived(totals) for stage, totals in self._stages.items()},
+                "total": _with_derived(self._totals),
+                "tasks": self._tasks,
+                "tasks_over_budget": self._tasks_over_budget
+            }
+
+    def reset(self) -> None:
+        """Clear all recorded usage."""
+        with self._lock:
+            self._models.clear()
+            self._stages.clear()
+            self._totals = _empty_totals()
+            self._tasks = 0
+            self._tasks_over_budget = 0
+
+
+# Global usage tracker for all model clients
+usage_tracker = UsageTracker()
+
+
+@contextmanager
+def track_task_usage(token_budget: Optional[int] = None) -> Iterator[TaskUsage]:
+    """
+    Attribute the completions made in this context to a task.
+
+    Args:
+        token_budget: Maximum total tokens of the task, or None for no limit
+
+    Yields:
+        The task's usage record
+    """
+    task_usage = TaskUsage(token_budget)
+    token = _current_task_usage.set(task_usage)
+    try:
+        yield task_usage
+    finally:
+        _current_task_usage.reset(token)
+        usage_tracker.record_task(task_usage)
+
+
+@contextmanager
+def usage_stage(stage: str) -> Iterator[None]:
+    """
+    Attribute the completions made in this context to a pipeline stage.
+
+    Args:
+        stage: Stage name
+    """
+    token = _current_stage.set(stage)
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
@@ -25,6 +25,10 @@ class Settings(BaseSettings):
     llm_api_key: str = Field(...)
     llm_model: str = Field(default="gpt-4")
     llm_base_url: Optional[str] = Field(default=None)
+    llm_max_retries: int = Field(default=2)
+    llm_cassette_mode: Optional[str] = Field(default=None)
+    llm_cassette_path: Optional[str] = Field(default=None)
+    llm_cassette_simulate_timing: bool = Field(default=False)
     
     # Application Configuration
     app_env: str = Field(default="development")
@@ -34,6 +38,77 @@ class Settings(BaseSettings):
     # Server Configuration
     host: str = Field(default="127.0.0.1")
     port: int = Field(default=8000)
+    workers: int = Field(default=1)
+    response_compression_min_size: int = Field(default=1024)
+    status_cache_entries: int = Field(default=256)
+    
+    # Task Storage Configuration
+    task_backend: str = Field(default="memory")
+    task_db_path: str = Field(default="tasks.db")
+    task_poll_interval: float = Field(default=0.1)
+    
+    # Session Storage Configuration
+    session_backend: str = Field(default="memory")
+    session_db_path: str = Field(default="sessions.db")
+    
+    # Pipeline Execution Configuration
+    pipeline_mode: str = Field(default="inline")
+    job_queue_path: Optional[str] = Field(default=None)
+    job_lease_seconds: float = Field(default=60.0)
+    task_lease_seconds: float = Field(default=60.0)
+    job_max_attempts: int = Field(default=3)
+    worker_poll_interval: float = Field(default=0.5)
+    shutdown_drain_timeout: float = Field(default=30.0)
+    
+    # Scheduling Configuration
+    pipeline_concurrency: int = Field(default=4)
+    scheduler_interactive_weight: float = Field(default=4.0)
+    scheduler_batch_weight: float = Field(default=1.0)
+    scheduler_client_header: str = Field(default="X-API-Key")
+    
+    # Sandbox Configuration
+    sandbox_workers: int = Field(default=4)
+    
+    # Result Cache Configuration
+    result_cache_enabled: bool = Field(default=True)
+    result_cache_max_entries: int = Field(default=1024)
+    result_cache_max_bytes: int = Field(default=64 * 1024 * 1024)
+    result_cache_dir: Optional[str] = Field(default=None)
+    result_cache_disk_max_bytes: int = Field(default=512 * 1024 * 1024)
+    
+    # Benchmark Configuration (runs generated code; enable only where the sandbox is available)
+    benchmark_enabled: bool = Field(default=False)
+    benchmark_repeats: int = Field(default=15)
+    benchmark_warmup: int = Field(default=3)
+    benchmark_timeout: float = Field(default=60.0)
+    benchmark_memory_limit_mb: int = Field(default=512)
+    
+    # Test Execution Configuration (runs generated code; enable only where the sandbox is available)
+    test_execution_enabled: bool = Field(default=False)
+    test_execution_timeout: float = Field(default=120.0)
+    test_execution_memory_limit_mb: int = Field(default=1024)
+    
+    # Refinement Configuration
+    refinement_max_iterations: int = Field(default=3)
+    refinement_token_budget: int = Field(default=20000)
+    refinement_time_budget: float = Field(default=180.0)
+    
+    # Usage Accounting Configuration
+    task_token_budget: Optional[int] = Field(default=None)
+    llm_prompt_cost_per_1k: float = Field(default=0.0)
+    llm_cached_prompt_cost_per_1k: Optional[float] = Field(default=None)
+    llm_completion_cost_per_1k: float = Field(default=0.0)
+    
+    # Tracing Configuration
+    tracing_enabled: bool = Field(default=False)
+    tracing_sample_rate: float = Field(default=1.0)
+    tracing_jsonl_path: Optional[str] = Field(default=None)
+    tracing_otlp_endpoint: Optional[str] = Field(default=None)
+    
+    # Lint Daemon Configuration
+    lint_daemon_enabled: bool = Field(default=False)
+    lint_daemon_socket: Optional[str] = Field(default=None)
+    lint_daemon_max_jobs: int = Field(default=1000)
     
     @field_validator("llm_api_key")
     @classmethod
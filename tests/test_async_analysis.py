@@ -0,0 +1,58 @@
+"""
+Unit tests for the concurrent analysis variants.
+"""
+import asyncio
+import time
+import pytest
+from tools import code_quality_tool
+from tools.code_quality_tool import get_detailed_feedback, get_detailed_feedback_async
+from utils import code_validator
+from utils.code_validator import comprehensive_code_validation_async
+from utils.result_cache import get_result_cache
+
+
+class TestAsyncAnalysis:
+    """Test cases for the concurrent analysis variants."""
+
+    CODE = "def add(a, b):\n  return a + b\n"
+
+    @pytest.mark.asyncio
+    async def test_detailed_feedback_matches_sync(self):
+        """Test that the async feedback has the same shape as the sync one."""
+        get_result_cache().clear()
+        async_feedback = await get_detailed_feedback_async(self.CODE)
+        sync_feedback = get_detailed_feedback(self.CODE)
+        assert async_feedback.keys() == sync_feedback.keys()
+        assert async_feedback["pep8_compliance"] == sync_feedback["pep8_compliance"]
+        assert async_feedback["overall_quality"] == sync_feedback["overall_quality"]
+
+    @pytest.mark.asyncio
+    async def test_comprehensive_validation_async(self):
+        """Test the async comprehensive validation result."""
+        result = await comprehensive_code_validation_async("import os\n\nx = 1\n")
+        assert result["syntax"]["valid"] is True
+        assert result["imports"]["imports"] == ["os"]
+        assert "pyflakes" in result
+        assert "overall_valid" in result
+
+    @pytest.mark.asyncio
+    async def test_checks_run_concurrently(self, monkeypatch):
+        """Test that wall-clock time is bounded by the slowest check."""
+        async def slow_tool(command, code, timeout=30):
+            await asyncio.sleep(0.3)
+            return ""
+
+        monkeypatch.setattr(code_quality_tool, "run_tool_on_code_async", slow_tool)
+        monkeypatch.setattr(code_validator, "run_tool_on_code_async", slow_tool)
+        get_result_cache().clear()
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            get_detailed_feedback_async("x = 1\n"),
+            comprehensive_code_validation_async("y = 2\n")
+        )
+        assert time.perf_counter() - start < 0.6
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
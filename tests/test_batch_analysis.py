@@ -0,0 +1,52 @@
+"""
+Unit tests for the batch analysis tool.
+"""
+import json
+import pytest
+from tools.batch_analysis import _chunks, analyze_batch, main, read_snippets
+
+
+class TestBatchAnalysis:
+    """Test cases for the batch analysis tool."""
+
+    SNIPPETS = [
+        ("clean", "def add(a, b):\n    return a + b\n"),
+        ("unused", "import os\n\n\nx = 1\n"),
+        ("broken", "def broken(:\n    pass\n"),
+        ("style", "def f(a,b):\n  return a+b\n")
+    ]
+
+    def test_chunks(self):
+        """Test that snippets are split into bounded chunks."""
+        assert [len(chunk) for chunk in _chunks(range(5), 2)] == [2, 2, 1]
+
+    def test_analyze_batch(self):
+        """Test that every snippet gets a result with both checks."""
+        results = {result["id"]: result for result in analyze_batch(self.SNIPPETS, workers=2, chunk_size=1)}
+        assert set(results) == {snippet_id for snippet_id, _ in self.SNIPPETS}
+        assert all(result["success"] for result in results.values())
+        assert results["clean"]["validation"]["overall_valid"] is True
+        assert results["broken"]["validation"]["syntax"]["valid"] is False
+        assert results["style"]["feedback"]["pep8_compliance"] is False
+
+    def test_cli(self, tmp_path, capsys):
+        """Test the JSONL command line entry point."""
+        input_path = tmp_path / "snippets.jsonl"
+        output_path = tmp_path / "results.jsonl"
+        input_path.write_text("".join(json.dumps({"id": i, "code": code}) + "\n" for i, code in self.SNIPPETS))
+
+        main([str(input_path), str(output_path), "--workers", "2", "--chunk-size", "3"])
+
+        results = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert sorted(result["id"] for result in results) == sorted(i for i, _ in self.SNIPPETS)
+        assert "snippets/s" in capsys.readouterr().err
+
+    def test_read_snippets_defaults_id(self, tmp_path):
+        """Test that records without an id are numbered by line."""
+        input_path = tmp_path / "snippets.jsonl"
+        input_path.write_text('{"code": "x = 1"}\n\n{"id": "b", "code": "y = 2"}\n')
+        assert list(read_snippets(str(input_path))) == [(1, "x = 1"), ("b", "y = 2")]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,98 @@
+"""
+Unit tests for the micro-benchmark harness.
+"""
+import pytest
+from utils.benchmark import benchmark_code, extract_entry_points, synthesize_inputs
+
+
+class TestBenchmark:
+    """Test cases for the micro-benchmark harness."""
+
+    def test_extract_entry_points(self):
+        """Test that only public top-level functions are entry points."""
+        code = """
+def fibonacci(n):
+    return n
+
+def _helper():
+    pass
+
+def main():
+    pass
+
+class Calculator:
+    def add(self, a, b):
+        return a + b
+"""
+        assert extract_entry_points(code) == ["fibonacci"]
+        assert extract_entry_points("def broken(:") == []
+
+    def test_synthesize_inputs(self):
+        """Test input synthesis from parameter names and annotations."""
+        code = """
+def process(items, text: str, n, scale=2):
+    return items
+"""
+        inputs = synthesize_inputs(code, "process")
+        assert len(inputs) == 2
+        for args in inputs:
+            # Parameters with defaults are left out
+            assert len(args) == 3
+            assert isinstance(args[0], list)
+            assert isinstance(args[1], str)
+            assert isinstance(args[2], int)
+
+    def test_benchmark_faster_code_accepted(self):
+        """Test that a faster equivalent version is accepted."""
+        original = """
+def fibonacci(n):
+    if n <= 1:
+        return n
+    return fibonacci(n - 1) + fibonacci(n - 2)
+"""
+        optimized = """
+```python
+def fibonacci(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+```
+"""
+        result = benchmark_code(original, optimized, repeats=5, warmup=1)
+        assert result["status"] == "measured"
+        assert result["accepted"] is True
+        assert result["speedup"] > 1
+        assert result["speedup_ci"][0] <= result["speedup"] <= result["speedup_ci"][1]
+        assert result["performance_gain"] > 0
+        assert "memory_delta_kb" in result
+
+    def test_benchmark_changed_output_rejected(self):
+        """Test that a version with different outputs is rejected."""
+        result = benchmark_code(
+            "def add_one(n):\n    return n + 1\n",
+            "def add_one(n):\n    return n + 2\n",
+            repeats=3,
+            warmup=1
+        )
+        assert result["status"] == "rejected"
+        assert result["accepted"] is False
+
+    def test_benchmark_slower_code_rejected(self):
+        """Test that a significantly slower version is rejected."""
+        original = "def total(items):\n    return sum(items)\n"
+        optimized = "def total(items):\n    import time\n    time.sleep(0.002)\n    return sum(items)\n"
+        result = benchmark_code(original, optimized, inputs={"total": [[[1, 2, 3]]]}, repeats=5, warmup=1)
+        assert result["status"] == "rejected"
+        assert result["performance_gain"] < 0
+
+    def test_benchmark_without_entry_points_skipped(self):
+        """Test that code without common entry points is skipped."""
+        result = benchmark_code("x = 1", "x = 2")
+        assert result["status"] == "skipped"
+        assert result["accepted"] is True
+        assert result["performance_gain"] == 0.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
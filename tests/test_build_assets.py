@@ -0,0 +1,63 @@
+"""
+Unit tests for the frontend asset build.
+"""
+import gzip
+import json
+import pytest
+from tools.build_assets import build_assets, hashed_name, rewrite_index
+
+
+@pytest.fixture
+def frontend(tmp_path):
+    """Create a small frontend source directory."""
+    source = tmp_path / "frontend"
+    source.mkdir()
+    (source / "index.html").write_text(
+        '<link href="https://cdn.example.com/x.css" rel="stylesheet">\n'
+        '<link href="style.css" rel="stylesheet">\n<script src="script.js"></script>\n'
+    )
+    (source / "script.js").write_text("console.log('hello');\n" * 50)
+    (source / "style.css").write_text("body { margin: 0; }\n")
+    return source
+
+
+class TestBuildAssets:
+    """Test cases for the frontend asset build."""
+
+    def test_hashed_name(self):
+        """Test that hashed names change with the content only."""
+        assert hashed_name("script.js", b"a") == hashed_name("script.js", b"a")
+        assert hashed_name("script.js", b"a") != hashed_name("script.js", b"b")
+        assert hashed_name("script.js", b"a").startswith("script.") and hashed_name("script.js", b"a").endswith(".js")
+
+    def test_rewrite_index(self):
+        """Test that only known assets are rewritten."""
+        html = '<script src="script.js"></script><img src="logo.png">'
+        assert rewrite_index(html, {"script.js": "script.abc.js"}) == \
+            '<script src="script.abc.js"></script><img src="logo.png">'
+
+    def test_build(self, frontend, tmp_path):
+        """Test that the build writes hashed, precompressed assets and a rewritten index."""
+        output = tmp_path / "dist"
+        manifest = build_assets(str(frontend), str(output))
+
+        script = manifest["script.js"]
+        assert script != "script.js"
+        assert (output / script).read_text() == (frontend / "script.js").read_text()
+        assert gzip.decompress((output / f"{script}.gz").read_bytes()) == (frontend / "script.js").read_bytes()
+
+        index = (output / "index.html").read_text()
+        assert f'src="{script}"' in index
+        assert f'href="{manifest["style.css"]}"' in index
+        assert "https://cdn.example.com/x.css" in index
+        assert (output / "index.html.gz").exists()
+        assert json.loads((output / "manifest.json").read_text()) == manifest
+
+        # Rebuilding the same sources is reproducible
+        first = (output / f"{script}.gz").read_bytes()
+        build_assets(str(frontend), str(output))
+        assert (output / f"{script}.gz").read_bytes() == first
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
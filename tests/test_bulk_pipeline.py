@@ -0,0 +1,93 @@
+"""
+Unit tests for the bulk pipeline tool.
+"""
+import asyncio
+import json
+import pytest
+from tools import bulk_pipeline
+from tools.bulk_pipeline import load_checkpoint, main, read_items, run_bulk
+from web.api import tasks_storage
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Replace the pipeline with a fake that fails requirements containing "fail"."""
+    calls = []
+
+    async def fake_process(task_id, request):
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        if "fail" in request.requirements:
+            tasks_storage[task_id].update(status="failed", error="Model error")
+        else:
+            tasks_storage[task_id].update(status="completed", result={
+                "generated_code": "x = 1\n",
+                "usage": {"total": {"total_tokens": 100, "cost_usd": 0.01}}
+            })
+
+    monkeypatch.setattr(bulk_pipeline, "process_code_generation", fake_process)
+    return calls
+
+
+def write_items(path, items):
+    """Write request records as JSONL."""
+    path.write_text("".join(json.dumps(item) + "\n" for item in items))
+
+
+class TestBulkPipeline:
+    """Test cases for the bulk pipeline tool."""
+
+    def test_read_items(self, tmp_path):
+        """Test reading requirements and backlog-style records."""
+        input_path = tmp_path / "requests.jsonl"
+        write_items(input_path, [
+            {"id": "a", "requirements": "Add numbers", "refine": True},
+            {"request_id": "user-001", "title": "Sorting", "body": "Sort a list"},
+            {"requirements": "Reverse a string"}
+        ])
+        assert list(read_items(str(input_path))) == [
+            ("a", {"refine": True, "requirements": "Add numbers"}),
+            ("user-001", {"requirements": "Sorting\n\nSort a list"}),
+            (3, {"requirements": "Reverse a string"})
+        ]
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_items(self, tmp_path, pipeline):
+        """Test that a second run only repeats the items that did not complete."""
+        input_path = tmp_path / "requests.jsonl"
+        output_path = tmp_path / "results.jsonl"
+        write_items(input_path, [{"id": i, "requirements": f"Task {i}"} for i in range(5)]
+                    + [{"id": "bad", "requirements": "This will fail"}])
+
+        stats = await run_bulk(str(input_path), str(output_path), concurrency=3)
+        assert (stats["completed"], stats["failed"], stats["skipped"]) == (5, 1, 0)
+        assert stats["total_tokens"] == 500
+        assert stats["cost_usd"] == 0.05
+        assert load_checkpoint(f"{output_path}.checkpoint") == {json.dumps(i) for i in range(5)}
+        assert not any(task_id.startswith("bulk-") for task_id in tasks_storage)
+
+        pipeline.clear()
+        stats = await run_bulk(str(input_path), str(output_path), concurrency=3)
+        assert (stats["completed"], stats["failed"], stats["skipped"]) == (0, 1, 5)
+        assert [request.requirements for request in pipeline] == ["This will fail"]
+
+        results = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert len(results) == 7
+        assert {result["id"] for result in results if result["status"] == "completed"} == set(range(5))
+
+    def test_cli(self, tmp_path, capsys, pipeline):
+        """Test the JSONL command line entry point."""
+        input_path = tmp_path / "requests.jsonl"
+        output_path = tmp_path / "results.jsonl"
+        checkpoint_path = tmp_path / "run.checkpoint"
+        write_items(input_path, [{"id": "a", "requirements": "Add numbers"}])
+
+        main([str(input_path), str(output_path), "--checkpoint", str(checkpoint_path), "--refine"])
+
+        assert pipeline[0].refine is True
+        assert checkpoint_path.read_text() == '"a"\n'
+        assert "items/s" in capsys.readouterr().err
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,118 @@
+"""
+Unit tests for LLM call record/replay.
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+from agents.cassette import Cassette, CassetteMissError, request_key, use_cassette
+
+REQUEST = {"model": "gpt-4", "messages": [{"role": "user", "content": "Write a function"}]}
+
+
+def make_completion(content):
+    """Create a chat completion response."""
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 3, "total_tokens": 8}
+    })
+
+
+def make_chunk(content):
+    """Create a streamed chat completion chunk."""
+    return ChatCompletionChunk.model_validate({
+        "id": "chatcmpl-1",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "gpt-4",
+        "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}]
+    })
+
+
+async def chunk_stream(contents):
+    """Stream chunks with a short delay between them."""
+    for content in contents:
+        await asyncio.sleep(0.01)
+        yield make_chunk(content)
+
+
+def cassette_client(cassette, create=None):
+    """Create a client whose completions go through a cassette."""
+    async def unavailable(**kwargs):
+        raise AssertionError("The model must not be called in replay mode")
+
+    completions = SimpleNamespace(create=create or unavailable)
+    use_cassette(SimpleNamespace(_client=SimpleNamespace(chat=SimpleNamespace(completions=completions))), cassette)
+    return completions
+
+
+class TestCassette:
+    """Test cases for LLM call record/replay."""
+
+    def test_request_key(self):
+        """Test that keys depend on the request but not on transport options."""
+        assert request_key(REQUEST) == request_key(dict(REQUEST, stream_options={"include_usage": True}))
+        assert request_key(REQUEST) != request_key(dict(REQUEST, model="gpt-4o"))
+
+    @pytest.mark.asyncio
+    async def test_record_and_replay(self, tmp_path):
+        """Test that recorded responses are replayed in order for identical requests."""
+        path = str(tmp_path / "cassettes" / "pipeline.jsonl")
+        contents = iter(["first", "second"])
+
+        async def create(**kwargs):
+            return make_completion(next(contents))
+
+        recording = cassette_client(Cassette(path, "record"), create)
+        assert (await recording.create(**REQUEST)).choices[0].message.content == "first"
+        assert (await recording.create(**REQUEST)).choices[0].message.content == "second"
+
+        cassette = Cassette(path, "replay")
+        assert len(cassette) == 2
+        replaying = cassette_client(cassette)
+        replies = [(await replaying.create(**REQUEST)).choices[0].message.content for _ in range(3)]
+        assert replies == ["first", "second", "second"]
+        assert (await replaying.create(**REQUEST)).usage.prompt_tokens == 5
+
+    @pytest.mark.asyncio
+    async def test_record_and_replay_stream(self, tmp_path):
+        """Test that streamed chunks and their timing are recorded and replayed."""
+        path = str(tmp_path / "stream.jsonl")
+
+        async def create(**kwargs):
+            return chunk_stream(["def ", "f(): ", "pass"])
+
+        recording = cassette_client(Cassette(path, "record"), create)
+        request = dict(REQUEST, stream=True)
+        assert [chunk.choices[0].delta.content async for chunk in await recording.create(**request)] == \
+            ["def ", "f(): ", "pass"]
+
+        replaying = cassette_client(Cassette(path, "replay", simulate_timing=True))
+        start = time.perf_counter()
+        chunks = [chunk async for chunk in await replaying.create(**request)]
+        assert time.perf_counter() - start >= 0.02
+        assert "".join(chunk.choices[0].delta.content for chunk in chunks) == "def f(): pass"
+        assert all(isinstance(chunk, ChatCompletionChunk) for chunk in chunks)
+
+    @pytest.mark.asyncio
+    async def test_replay_miss(self, tmp_path):
+        """Test that an unrecorded request fails instead of calling the model."""
+        path = tmp_path / "empty.jsonl"
+        path.write_text("")
+        replaying = cassette_client(Cassette(str(path), "replay"))
+        with pytest.raises(CassetteMissError):
+            await replaying.create(**REQUEST)
+
+    def test_unknown_mode(self, tmp_path):
+        """Test that an unknown mode is rejected."""
+        with pytest.raises(ValueError):
+            Cassette(str(tmp_path / "cassette.jsonl"), "rewind")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
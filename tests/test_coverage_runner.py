@@ -0,0 +1,88 @@
+"""
+Unit tests for the coverage runner.
+"""
+import pytest
+from utils import coverage_runner
+from utils.coverage_runner import measure_coverage
+
+
+class TestCoverageRunner:
+    """Test cases for the coverage runner."""
+
+    SOURCE = """
+def divide(a, b):
+    if b == 0:
+        raise ValueError("Cannot divide by zero")
+    return a / b
+"""
+
+    def test_measure_partial_coverage(self):
+        """Test line and branch coverage for tests that skip a branch."""
+        tests = """
+from calculator import divide
+
+
+def test_divide():
+    assert divide(6, 3) == 2
+"""
+        result = measure_coverage(self.SOURCE, tests)
+        assert result["success"] is True
+        assert result["tests_passed"] == 1
+        assert result["tests_failed"] == 0
+        assert result["line_coverage"] == 75.0
+        assert result["branch_coverage"] == 50.0
+        assert 0 < result["coverage_percentage"] < 100
+
+    def test_measure_full_coverage_with_failures(self):
+        """Test full coverage and failure counting from a fenced agent response."""
+        tests = """Here are the tests:
+```python
+import pytest
+from solution import divide
+
+
+def test_divide():
+    assert divide(6, 3) == 2
+
+
+def test_divide_by_zero():
+    with pytest.raises(ValueError):
+        divide(1, 0)
+
+
+def test_wrong_expectation():
+    assert divide(1, 1) == 2
+```
+"""
+        result = measure_coverage(self.SOURCE, tests)
+        assert result["success"] is True
+        assert result["tests_passed"] == 2
+        assert result["tests_failed"] == 1
+        assert result["failures"][0].startswith("test_wrong_expectation: assert 1.0 == 2")
+        assert result["coverage_percentage"] == 100.0
+
+    def test_project_module_names_are_aliased(self):
+        """Test that names resolved only by the host, not the sandbox, are aliased to the source."""
+        assert coverage_runner._imported_modules("import os\nimport pytest\nfrom config import divide\n") == [
+            "config", "pytest"
+        ]
+        tests = "from config import divide\n\n\ndef test_divide():\n    assert divide(9, 3) == 3\n"
+        result = measure_coverage(self.SOURCE, tests)
+        assert result["success"] is True
+        assert result["tests_passed"] == 1
+
+    def test_results_are_cached(self, monkeypatch):
+        """Test that identical source and tests are only executed once."""
+        tests = "from solution import divide\n\n\ndef test_divide():\n    assert divide(4, 2) == 2\n"
+        first = measure_coverage(self.SOURCE, tests)
+
+        def fail_execute(*args, **kwargs):
+            raise AssertionError("Cached run was executed again")
+
+        monkeypatch.setattr(coverage_runner, "_execute", fail_execute)
+        second = measure_coverage(self.SOURCE, tests)
+        assert first == second
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,76 @@
+"""
+Unit tests for the durable job queue.
+"""
+import time
+from datetime import datetime
+import pytest
+from web.job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Create a job queue in a temporary database."""
+    return JobQueue(str(tmp_path / "queue" / "jobs.db"), lease_seconds=0.2)
+
+
+class TestJobQueue:
+    """Test cases for the durable job queue."""
+
+    def test_fifo_claims(self, queue):
+        """Test that jobs are claimed once, oldest first."""
+        queue.enqueue("task-1", {"requirements": "first"})
+        queue.enqueue("task-2", {"requirements": "second"})
+
+        first = queue.claim("worker-a")
+        second = queue.claim("worker-b")
+        assert (first["task_id"], first["payload"], first["attempts"]) == ("task-1", {"requirements": "first"}, 1)
+        assert second["task_id"] == "task-2"
+        assert queue.claim("worker-a") is None
+
+        queue.complete(first["id"])
+        queue.fail(second["id"], "boom")
+        assert queue.stats() == {"queued": 0, "running": 0, "done": 1, "failed": 1}
+
+    def test_expired_lease_is_reclaimed(self, queue):
+        """Test that a job of a dead worker is claimed again, and heartbeats prevent that."""
+        job_id = queue.enqueue("task-1", {"requirements": "work"})
+        assert queue.claim("worker-a")["id"] == job_id
+
+        time.sleep(0.1)
+        queue.heartbeat(job_id)
+        time.sleep(0.15)
+        assert queue.claim("worker-b") is None
+
+        time.sleep(0.1)
+        reclaimed = queue.claim("worker-b")
+        assert reclaimed["id"] == job_id
+        assert reclaimed["attempts"] == 2
+
+    def test_fair_claims(self, queue):
+        """Test that interactive jobs go before batch jobs and batch clients take turns."""
+        for i in range(3):
+            queue.enqueue(f"bulk-{i}", {"requirements": "work"}, priority="batch", client="bulk")
+        queue.enqueue("other", {"requirements": "work"}, priority="batch", client="other")
+        queue.enqueue("user", {"requirements": "work"}, client="user")
+
+        status = queue.queue_status("other")
+        assert status["position"] == 2
+        assert datetime.fromisoformat(status["estimated_start"]) > datetime.now()
+        assert queue.queue_status("missing") is None
+
+        claimed = [queue.claim("worker-a")["task_id"] for _ in range(5)]
+        assert claimed == ["user", "bulk-0", "other", "bulk-1", "bulk-2"]
+        assert queue.queue_status("user") is None
+
+        with pytest.raises(ValueError):
+            queue.enqueue("task-1", {"requirements": "work"}, priority="urgent")
+
+    def test_durable(self, queue):
+        """Test that queued jobs survive reopening the queue."""
+        queue.enqueue("task-1", {"requirements": "work"})
+        reopened = JobQueue(queue.path)
+        assert reopened.claim("worker-a")["task_id"] == "task-1"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,135 @@
+"""
+Unit tests for the lint daemon.
+"""
+import asyncio
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import pytest
+from utils.lint_daemon import LintDaemonClient, LintDaemonError, _ANALYZERS
+
+SAMPLE_CODE = """import os
+def branchy(x):
+    if x > 1:
+        return 1
+    elif x < 0:
+        return 2
+    return unused_name
+"""
+
+
+class TestLintDaemon:
+    """Test cases for the lint daemon."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a client with a private socket and a small job budget."""
+        socket_dir = tempfile.mkdtemp(prefix="lint-")
+        lint_client = LintDaemonClient(socket_path=os.path.join(socket_dir, "lint.sock"), max_jobs=5)
+        yield lint_client
+        lint_client.close()
+        if lint_client._process is not None:
+            lint_client._process.kill()
+            lint_client._process.wait()
+        shutil.rmtree(socket_dir, ignore_errors=True)
+
+    @pytest.mark.parametrize("tool, command", [
+        ("pycodestyle", ["pycodestyle"]),
+        ("pyflakes", ["pyflakes"]),
+        ("radon_cc", ["radon", "cc"])
+    ])
+    def test_output_matches_command_line(self, tool, command, tmp_path):
+        """Test that in-process analysis reproduces the tool's CLI output."""
+        path = tmp_path / "sample.py"
+        path.write_text(SAMPLE_CODE)
+        expected = subprocess.run([*command, str(path)], capture_output=True, text=True).stdout
+        assert _ANALYZERS[tool](SAMPLE_CODE, str(path)).strip() == expected.strip()
+
+    def test_analyze(self, client):
+        """Test a request served by an on-demand daemon."""
+        output = client.analyze("pyflakes", SAMPLE_CODE)
+        assert "imported but unused" in output
+        assert client.restarts == 1
+
+    def test_unknown_tool(self, client):
+        """Test that analysis errors are reported to the caller."""
+        with pytest.raises(LintDaemonError):
+            client.analyze("pylint", SAMPLE_CODE)
+
+    def test_multiplexed_requests(self, client):
+        """Test concurrent requests over a single connection."""
+        async def analyze_all():
+            return await asyncio.gather(*[
+                client.analyze_async(tool, SAMPLE_CODE) for tool in ("pycodestyle", "pyflakes", "radon_cc")
+            ])
+
+        pycodestyle_output, pyflakes_output, radon_output = asyncio.run(analyze_all())
+        assert "E302" in pycodestyle_output
+        assert "undefined name" in pyflakes_output
+        assert "branchy" in radon_output
+        assert client.restarts == 1
+
+    def test_recycled_after_max_jobs(self, client):
+        """Test that the daemon exits after its job budget and is restarted."""
+        for _ in range(7):
+            assert "undefined name" in client.analyze("pyflakes", SAMPLE_CODE)
+        assert client.restarts == 2
+
+    def test_concurrent_requests_across_recycles(self, client):
+        """Test that requests cut off by a recycle are retried on the restarted daemon."""
+        async def analyze_all():
+            return await asyncio.gather(*[client.analyze_async("pyflakes", SAMPLE_CODE) for _ in range(8)])
+
+        outputs = asyncio.run(analyze_all())
+        assert all("undefined name" in output for output in outputs)
+        assert client.restarts >= 2
+
+    def test_connecting_does_not_block_other_callers(self, client, monkeypatch):
+        """Test that waiting for the daemon to start does not hold the lock the reader thread needs."""
+        connecting = threading.Event()
+        release = threading.Event()
+        connect = client._connect
+
+        def slow_connect():
+            connecting.set()
+            release.wait(5)
+            return connect()
+
+        monkeypatch.setattr(client, "_connect", slow_connect)
+        caller = threading.Thread(target=client.analyze, args=("pyflakes", SAMPLE_CODE))
+        caller.start()
+        assert connecting.wait(5)
+        acquired = client._lock.acquire(timeout=1)
+        if acquired:
+            client._lock.release()
+        release.set()
+        caller.join()
+        assert acquired
+
+    def test_restarted_after_crash(self, client):
+        """Test that a crashed daemon is restarted transparently."""
+        client.analyze("pyflakes", SAMPLE_CODE)
+        os.kill(client._process.pid, signal.SIGKILL)
+        client._process.wait()
+        assert "undefined name" in client.analyze("pyflakes", SAMPLE_CODE)
+        assert client.restarts == 2
+
+    def test_tools_route_through_daemon(self, client, monkeypatch):
+        """Test that the analysis tools use the daemon when it is enabled."""
+        from config.settings import settings
+        from utils import code_validator
+        monkeypatch.setattr(settings, "lint_daemon_enabled", True)
+        monkeypatch.setattr(settings, "result_cache_enabled", False)
+        monkeypatch.setattr(code_validator, "get_lint_client", lambda: client)
+
+        result = code_validator.run_pyflakes_check(SAMPLE_CODE)
+        assert result["success"] is True
+        assert any("undefined name" in issue for issue in result["issues"])
+        assert client.restarts == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
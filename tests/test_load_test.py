@@ -0,0 +1,69 @@
+"""
+Unit tests for the load testing tool.
+"""
+import json
+import pytest
+from tools.load_test import compare_to_baseline, percentile, read_rss_mb, summarize_latencies, summarize_stages
+
+
+class TestLoadTest:
+    """Test cases for the load testing tool."""
+
+    def test_percentile(self):
+        """Test percentiles with interpolation between ranks."""
+        values = list(range(1, 101))
+        assert percentile(values, 0.5) == pytest.approx(50.5)
+        assert percentile(values, 0.99) == pytest.approx(99.01)
+        assert percentile([7], 0.95) == 7
+        assert percentile([], 0.5) is None
+
+    def test_summarize_latencies(self):
+        """Test the latency summary of an empty and a non-empty sample."""
+        assert summarize_latencies([])["p95"] is None
+        summary = summarize_latencies([10.0, 20.0, 30.0])
+        assert summary["count"] == 3
+        assert summary["p50"] == 20.0
+
+    def test_summarize_stages(self, tmp_path):
+        """Test that stage spans from a trace file are summarized per stage."""
+        trace_path = tmp_path / "spans.jsonl"
+        spans = [
+            {"name": "stage.codegen", "duration_ms": 10.0},
+            {"name": "stage.codegen", "duration_ms": 30.0},
+            {"name": "queue", "duration_ms": 1.0},
+            {"name": "llm.attempt", "duration_ms": 5.0}
+        ]
+        trace_path.write_text("".join(json.dumps(span) + "\n" for span in spans))
+
+        stages = summarize_stages(str(trace_path))
+        assert set(stages) == {"codegen", "queue"}
+        assert stages["codegen"]["p50"] == 20.0
+        assert summarize_stages(str(tmp_path / "missing.jsonl")) == {}
+
+    def test_compare_to_baseline(self):
+        """Test that throughput drops and latency increases beyond the tolerance are regressions."""
+        baseline = {
+            "requests_per_second": 10.0,
+            "latency_ms": {"p95": 100.0, "p99": 200.0},
+            "stages": {"codegen": {"p95": 50.0, "p99": 60.0}},
+            "peak_rss_mb": 100.0
+        }
+        report = {
+            "requests_per_second": 9.0,
+            "latency_ms": {"p95": 110.0, "p99": 260.0},
+            "stages": {"codegen": {"p95": 70.0, "p99": 60.0}, "review": {"p95": 5.0, "p99": 5.0}},
+            "peak_rss_mb": 110.0
+        }
+        regressions = compare_to_baseline(report, baseline, tolerance=0.2)
+        assert len(regressions) == 2
+        assert regressions[0].startswith("latency p99")
+        assert regressions[1].startswith("stage codegen p95")
+        assert compare_to_baseline(baseline, baseline) == []
+
+    def test_read_rss_mb(self):
+        """Test that the memory of a missing process is unknown."""
+        assert read_rss_mb(-1) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+"""
+Unit tests for the mock LLM server.
+"""
+import json
+import time
+import urllib.error
+import urllib.request
+import pytest
+from tools.mock_llm_server import LatencyModel, MockLLMServer
+
+
+def post(server, body):
+    """Post a chat completion request to the mock server."""
+    request = urllib.request.Request(
+        f"{server.base_url}/chat/completions",
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    return urllib.request.urlopen(request, timeout=10)
+
+
+class TestMockLLMServer:
+    """Test cases for the mock LLM server."""
+
+    REQUEST = {"model": "gpt-4", "messages": [{"role": "user", "content": "Write a function"}]}
+
+    def test_completion(self):
+        """Test that a complete response has content and usage."""
+        with MockLLMServer(content="x = 1\n") as server:
+            with post(server, self.REQUEST) as response:
+                completion = json.loads(response.read())
+        assert completion["choices"][0]["message"]["content"] == "x = 1\n"
+        assert completion["model"] == "gpt-4"
+        assert completion["usage"]["prompt_tokens"] > 0
+        assert server.stats["requests"] == 1
+
+    def test_streaming(self):
+        """Test that a streamed response reassembles to the content and ends with usage."""
+        content = "def f():\n    return 1\n"
+        with MockLLMServer(content=content, stream_chunks=4) as server:
+            body = dict(self.REQUEST, stream=True, stream_options={"include_usage": True})
+            with post(server, body) as response:
+                assert response.headers["Content-Type"] == "text/event-stream"
+                events = [line[len("data: "):] for line in response.read().decode().splitlines()
+                          if line.startswith("data: ")]
+        assert events[-1] == "[DONE]"
+        chunks = [json.loads(event) for event in events[:-1]]
+        assert "".join(chunk["choices"][0]["delta"].get("content", "") for chunk in chunks if chunk["choices"]) == content
+        assert chunks[-1]["usage"]["completion_tokens"] > 0
+        assert server.stats["streamed"] == 1
+
+    def test_error_rates(self):
+        """Test that configured fractions of requests fail or are rate limited."""
+        with MockLLMServer(error_rate=1.0) as server:
+            with pytest.raises(urllib.error.HTTPError) as error:
+                post(server, self.REQUEST)
+            assert error.value.code == 500
+        with MockLLMServer(rate_limit_rate=1.0) as server:
+            with pytest.raises(urllib.error.HTTPError) as error:
+                post(server, self.REQUEST)
+            assert error.value.code == 429
+            assert server.stats["rate_limited"] == 1
+
+    def test_latency(self):
+        """Test that responses are delayed by the latency model."""
+        with MockLLMServer(latency=LatencyModel("constant", 100)) as server:
+            start = time.perf_counter()
+            post(server, self.REQUEST).read()
+            assert time.perf_counter() - start >= 0.1
+
+    @pytest.mark.parametrize("distribution", ["constant", "uniform", "exponential", "lognormal"])
+    def test_latency_distributions(self, distribution):
+        """Test that every distribution draws non-negative latencies around the mean."""
+        model = LatencyModel(distribution, 100, spread=0.5, seed=1)
+        samples = [model.sample() for _ in range(2000)]
+        assert min(samples) >= 0
+        assert 0.08 < sum(samples) / len(samples) < 0.12
+
+    def test_unknown_distribution(self):
+        """Test that an unknown distribution is rejected."""
+        with pytest.raises(ValueError):
+            LatencyModel("pareto", 100)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,62 @@
+"""
+Unit tests for task result payloads.
+"""
+import pytest
+from web.payloads import artifact_id, normalize_result, resolve_result, select_fields
+
+CODE = "def add(a, b):\n    return a + b\n"
+OPTIMIZED = "add = lambda a, b: a + b\n"
+
+
+def make_result():
+    """Create a task result with the same code in several stages."""
+    return {
+        "specification": {"original_requirements": "Add numbers"},
+        "generated_code": CODE,
+        "review_result": {"code": CODE, "issues": []},
+        "optimization_result": {"original_code": CODE, "optimized_code": OPTIMIZED, "performance_gain": 12.5},
+        "test_result": {"source_code": CODE, "test_code": "def test_add():\n    pass\n"},
+        "refinement_result": None,
+        "usage": {"total": {"total_tokens": 100}}
+    }
+
+
+class TestPayloads:
+    """Test cases for task result payloads."""
+
+    def test_normalize_stores_code_once(self):
+        """Test that repeated code becomes one artifact referenced by id."""
+        result = make_result()
+        normalized = normalize_result(result)
+
+        assert len(normalized["artifacts"]) == 3
+        assert normalized["generated_code"] == artifact_id(CODE)
+        assert normalized["review_result"]["code"] == artifact_id(CODE)
+        assert normalized["optimization_result"]["optimized_code"] == artifact_id(OPTIMIZED)
+        assert normalized["optimization_result"]["performance_gain"] == 12.5
+        assert result["review_result"]["code"] == CODE
+        assert resolve_result(normalized) == result
+
+    def test_select_fields(self):
+        """Test selecting top-level and nested fields with their artifacts."""
+        normalized = normalize_result(make_result())
+        payload = select_fields(normalized, ["optimization_result.optimized_code", "usage", "missing"])
+
+        assert payload == {
+            "optimization_result": {"optimized_code": artifact_id(OPTIMIZED)},
+            "usage": {"total": {"total_tokens": 100}},
+            "missing": None,
+            "artifacts": {artifact_id(OPTIMIZED): OPTIMIZED}
+        }
+
+    def test_exclude_code(self):
+        """Test that include_code=False leaves out all artifacts."""
+        normalized = normalize_result(make_result())
+        payload = select_fields(normalized, include_code=False)
+        assert "artifacts" not in payload
+        assert payload["generated_code"] == artifact_id(CODE)
+        assert len(str(payload)) < len(str(make_result()))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,108 @@
+"""
+Unit tests for the prompt builder and provider usage reporting.
+"""
+import asyncio
+import os
+from types import SimpleNamespace
+import pytest
+from autogen_agentchat.agents import AssistantAgent
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from agents.codegen_agent import build_codegen_prompt
+from agents.optimization_agent import build_optimization_prompt
+from agents.prompt_builder import build_prompt, fence, send_prompt
+from agents.provider import get_llm_model, instrument_client
+from agents.usage import UsageTracker, usage_tracker
+from agents.requirements_agent import build_requirements_prompt
+from agents.review_agent import build_review_prompt
+from agents.testing_agent import build_testing_prompt
+
+CODE_A = "def add(a, b):\n    return a + b\n"
+CODE_B = "def sub(a, b):\n    return a - b\n"
+
+
+class TestPromptBuilder:
+    """Test cases for the prompt builder."""
+
+    def test_build_prompt_layout(self):
+        """Test that instructions come first and empty sections are skipped."""
+        prompt = build_prompt("""
+            Do the task.
+            """, [("A", "first"), ("B", None), ("C", fence("x = 1"))])
+        assert prompt == "Do the task.\n\nA：\nfirst\n\nC：\n```python\nx = 1\n```\n"
+
+    @pytest.mark.parametrize("first, second, variable", [
+        (build_requirements_prompt("Sort a list"), build_requirements_prompt("Parse a CSV file"), "Sort a list"),
+        (build_codegen_prompt({"original_requirements": "Sort a list"}),
+         build_codegen_prompt({"original_requirements": "Parse a CSV file"}), "Sort a list"),
+        (build_review_prompt(CODE_A), build_review_prompt(CODE_B), CODE_A),
+        (build_optimization_prompt(CODE_A, []), build_optimization_prompt(CODE_B, []), CODE_A),
+        (build_testing_prompt(CODE_A, ["Test edge cases"]), build_testing_prompt(CODE_B, ["Test edge cases"]), CODE_A)
+    ])
+    def test_variable_content_comes_last(self, first, second, variable):
+        """Test that prompts for different inputs share all static instructions."""
+        prefix = os.path.commonprefix([first, second])
+        assert prefix.startswith(first.split("\n", 1)[0])
+        assert "请用中文回答" in prefix
+        assert first.rstrip("`\n").endswith(variable.strip())
+
+    @pytest.mark.asyncio
+    async def test_concurrent_prompts_do_not_share_history(self):
+        """Test that concurrent prompts to a shared agent each send only the system message and their own prompt."""
+        sent = []
+
+        class RecordingClient(ReplayChatCompletionClient):
+            async def create(self, messages, **kwargs):
+                sent.append([message.content for message in messages])
+                await asyncio.sleep(0.01)
+                return await super().create(messages, **kwargs)
+
+        agent = AssistantAgent(name="SharedAgent", system_message="System",
+                               model_client=RecordingClient(["first", "second"]))
+        responses = await asyncio.gather(send_prompt(agent, "A"), send_prompt(agent, "B"))
+        assert sorted(sent) == [["System", "A"], ["System", "B"]]
+        assert sorted(response.chat_message.content for response in responses) == ["first", "second"]
+        assert responses[0].chat_message.source == "SharedAgent"
+
+
+class TestUsageTracker:
+    """Test cases for provider usage reporting."""
+
+    def test_record_cached_tokens(self):
+        """Test that cached prompt tokens are accumulated per model."""
+        tracker = UsageTracker()
+        usage = SimpleNamespace(prompt_tokens=1000, completion_tokens=50,
+                                prompt_tokens_details=SimpleNamespace(cached_tokens=768))
+        tracker.record("gpt-4", usage)
+        tracker.record("gpt-4", SimpleNamespace(prompt_tokens=1000, completion_tokens=50, prompt_tokens_details=None))
+
+        stats = tracker.stats()["models"]["gpt-4"]
+        assert stats["requests"] == 2
+        assert stats["prompt_tokens"] == 2000
+        assert stats["cached_tokens"] == 768
+        assert stats["cached_ratio"] == 0.384
+
+    @pytest.mark.asyncio
+    async def test_instrumented_client_records_usage(self):
+        """Test that completions made through an instrumented client are recorded."""
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=2,
+                                prompt_tokens_details=SimpleNamespace(cached_tokens=8))
+
+        async def create(**kwargs):
+            return SimpleNamespace(usage=usage)
+
+        completions = SimpleNamespace(create=create)
+        client = SimpleNamespace(_client=SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+        instrument_client(client)
+
+        usage_tracker.reset()
+        await completions.create(model="test-model", messages=[])
+        assert usage_tracker.stats()["models"]["test-model"]["cached_tokens"] == 8
+
+    def test_llm_clients_are_instrumented(self):
+        """Test that configured model clients report provider usage."""
+        client = get_llm_model()
+        assert client._client.chat.completions.create.__name__ == "create_and_record"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
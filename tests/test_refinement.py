@@ -0,0 +1,102 @@
+"""
+Unit tests for the refinement loop.
+"""
+import asyncio
+import pytest
+from agents import refinement
+from config.settings import settings
+from agents.refinement import build_refinement_prompt, refine_code, run_local_checks
+
+SPECIFICATION = {"original_requirements": "Create a function that adds two numbers"}
+GOOD_CODE = "def add(a, b):\n    return a + b\n"
+BROKEN_CODE = "def add(a, b):\n    return a + c\n"
+TESTS = "from solution import add\n\n\ndef test_add():\n    assert add(2, 3) == 5\n"
+
+
+@pytest.fixture(autouse=True)
+def test_execution_enabled(monkeypatch):
+    """Run the generated tests, which the settings leave disabled by default."""
+    monkeypatch.setattr(settings, "test_execution_enabled", True)
+
+
+def scripted_agent(monkeypatch, responses, tokens=100, delay=0.0):
+    """Replace the agent calls with scripted responses and record the prompts."""
+    prompts = []
+
+    async def fake_ask(agent, prompt, timeout):
+        prompts.append(prompt)
+        await asyncio.sleep(delay)
+        return responses.pop(0), tokens
+
+    monkeypatch.setattr(refinement, "_ask", fake_ask)
+    return prompts
+
+
+class TestRefinement:
+    """Test cases for the refinement loop."""
+
+    def test_local_checks(self):
+        """Test that each check reports concrete failures."""
+        assert run_local_checks(GOOD_CODE, TESTS) == []
+        assert run_local_checks("def add(a, b)\n")[0].startswith("Syntax error at line 1")
+        assert run_local_checks(BROKEN_CODE) == ["line 2: undefined name 'c'"]
+        failures = run_local_checks("def add(a, b):\n    return a - b\n", TESTS)
+        assert failures[0].startswith("test_add: assert -1 == 5")
+
+    def test_local_checks_without_test_execution(self, monkeypatch):
+        """Test that the tests are skipped, not reported as failing, when execution is disabled."""
+        monkeypatch.setattr(settings, "test_execution_enabled", False)
+        assert run_local_checks("def add(a, b):\n    return a - b\n", TESTS) == []
+
+    @pytest.mark.asyncio
+    async def test_exits_early_when_checks_pass(self, monkeypatch):
+        """Test that passing code is returned without calling the code generator."""
+        prompts = scripted_agent(monkeypatch, [])
+        result = await refine_code(SPECIFICATION, GOOD_CODE, test_code=TESTS)
+        assert result.passed is True
+        assert result.stop_reason == "passed"
+        assert result.iterations == 0
+        assert prompts == []
+
+    @pytest.mark.asyncio
+    async def test_fixes_failures(self, monkeypatch):
+        """Test that the code generator is re-prompted with the failures."""
+        prompts = scripted_agent(monkeypatch, [TESTS, GOOD_CODE])
+        result = await refine_code(SPECIFICATION, BROKEN_CODE)
+        assert result.passed is True
+        assert result.code == GOOD_CODE
+        assert result.test_code == TESTS
+        assert result.iterations == 1
+        assert result.tokens_used == 200
+        assert result.history == [{"iteration": 0, "failures": 1}, {"iteration": 1, "failures": 0}]
+        assert prompts[1] == build_refinement_prompt(SPECIFICATION, BROKEN_CODE, ["line 2: undefined name 'c'"])
+
+    @pytest.mark.asyncio
+    async def test_stops_at_max_iterations(self, monkeypatch):
+        """Test that the loop is capped by the iteration count."""
+        scripted_agent(monkeypatch, [BROKEN_CODE, BROKEN_CODE])
+        result = await refine_code(SPECIFICATION, BROKEN_CODE, test_code=TESTS, max_iterations=2)
+        assert result.passed is False
+        assert result.stop_reason == "max_iterations"
+        assert result.iterations == 2
+        assert result.failures == ["line 2: undefined name 'c'"]
+
+    @pytest.mark.asyncio
+    async def test_stops_at_token_budget(self, monkeypatch):
+        """Test that the loop is capped by the token budget."""
+        scripted_agent(monkeypatch, [BROKEN_CODE, BROKEN_CODE], tokens=600)
+        result = await refine_code(SPECIFICATION, BROKEN_CODE, test_code=TESTS, token_budget=1000)
+        assert result.stop_reason == "token_budget"
+        assert result.tokens_used == 1200
+
+    @pytest.mark.asyncio
+    async def test_stops_at_time_budget(self, monkeypatch):
+        """Test that the loop is capped by the wall-clock budget."""
+        scripted_agent(monkeypatch, [BROKEN_CODE] * 10, delay=0.2)
+        result = await refine_code(SPECIFICATION, BROKEN_CODE, test_code=TESTS, max_iterations=10, time_budget=0.3)
+        assert result.stop_reason == "time_budget"
+        assert result.iterations < 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
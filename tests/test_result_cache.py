@@ -0,0 +1,113 @@
+"""
+Unit tests for the static analysis result cache.
+"""
+import pytest
+from utils.result_cache import ResultCache, cached_result, get_result_cache, make_key
+
+
+class TestResultCache:
+    """Test cases for the static analysis result cache."""
+
+    def test_key_depends_on_code_and_config(self):
+        """Test that keys change with the code, the tool and the configuration."""
+        key = make_key("pycodestyle", "x = 1", config={"max_line_length": 79})
+        assert key == make_key("pycodestyle", "x = 1", config={"max_line_length": 79})
+        assert key != make_key("pycodestyle", "x = 2", config={"max_line_length": 79})
+        assert key != make_key("pycodestyle", "x = 1", config={"max_line_length": 120})
+        assert key != make_key("pyflakes", "x = 1", config={"max_line_length": 79})
+
+    def test_lru_eviction_by_entries_and_size(self):
+        """Test that the memory tier evicts least recently used entries."""
+        cache = ResultCache(max_entries=2)
+        cache.put("a", {"value": 1})
+        cache.put("b", {"value": 2})
+        assert cache.get("a") == {"value": 1}
+        cache.put("c", {"value": 3})
+        assert cache.get("b") is None
+        assert cache.get("a") == {"value": 1}
+
+        small_cache = ResultCache(max_bytes=40)
+        small_cache.put("a", {"value": "x" * 10})
+        small_cache.put("b", {"value": "y" * 10})
+        assert small_cache.get("a") is None
+        assert small_cache.stats()["evictions"] == 1
+
+    def test_disk_tier(self, tmp_path):
+        """Test that entries survive in the disk tier and are evicted by size."""
+        cache = ResultCache(disk_dir=str(tmp_path))
+        cache.put("ab12", {"issues": ["E501"]})
+
+        fresh_cache = ResultCache(disk_dir=str(tmp_path))
+        assert fresh_cache.get("ab12") == {"issues": ["E501"]}
+        assert fresh_cache.stats()["disk_hits"] == 1
+
+        bounded_cache = ResultCache(disk_dir=str(tmp_path / "bounded"), disk_max_bytes=100)
+        for index in range(10):
+            bounded_cache.put(f"key{index}", {"value": "z" * 20})
+        assert bounded_cache.stats()["disk_bytes"] <= 100
+
+    def test_hit_ratio_counters(self):
+        """Test hit ratio accounting."""
+        cache = ResultCache()
+        cache.put("a", [1])
+        cache.get("a")
+        cache.get("missing")
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    def test_cached_result_decorator(self):
+        """Test that decorated checks run once per code and configuration."""
+        calls = []
+
+        @cached_result("test_check")
+        def check(code, strict=False):
+            calls.append(code)
+            return {"success": True, "code_length": len(code), "strict": strict}
+
+        get_result_cache().clear()
+        first = check("x = 1")
+        first["mutated"] = True
+        assert check("x = 1") == {"success": True, "code_length": 5, "strict": False}
+        check("x = 1", strict=True)
+        assert calls == ["x = 1", "x = 1"]
+
+    def test_failed_results_not_cached(self):
+        """Test that transient failures are not cached."""
+        calls = []
+
+        @cached_result("flaky_check")
+        def check(code):
+            calls.append(code)
+            return {"success": False, "error": "timed out"}
+
+        check("y = 2")
+        check("y = 2")
+        assert len(calls) == 2
+
+    def test_validation_timestamp_is_fresh_on_hits(self, monkeypatch):
+        """Test that a cached validation result is stamped with the time of the call."""
+        from utils import code_validator
+
+        timestamps = iter(["2024-01-01T00:00:00", "2024-01-01T00:01:00"])
+
+        class FakeDatetime:
+            @staticmethod
+            def now():
+                return FakeDatetime()
+
+            def isoformat(self):
+                return next(timestamps)
+
+        monkeypatch.setattr(code_validator, "datetime", FakeDatetime)
+        get_result_cache().clear()
+        first = code_validator.comprehensive_code_validation("z = 3\n")
+        second = code_validator.comprehensive_code_validation("z = 3\n")
+        assert first["timestamp"] == "2024-01-01T00:00:00"
+        assert second["timestamp"] == "2024-01-01T00:01:00"
+        assert {**second, "timestamp": None} == {**first, "timestamp": None}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,128 @@
+"""
+Unit tests for the sandboxed execution service.
+"""
+import asyncio
+import pytest
+from utils.sandbox import SandboxPool
+
+
+class TestSandbox:
+    """Test cases for the sandboxed execution service."""
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def pool(cls):
+        """Create a small sandbox pool shared by the tests."""
+        with SandboxPool(workers=2) as sandbox_pool:
+            yield sandbox_pool
+
+    def test_run_job_with_payload(self, pool):
+        """Test that a job reads its payload and reports a result with usage."""
+        result = pool.run("result = sum(payload)", payload=[1, 2, 3])
+        assert result["success"] is True
+        assert result["result"] == 6
+        assert result["exit_code"] == 0
+        assert result["peak_rss_kb"] > 0
+        assert result["cpu_time_s"] >= 0
+
+    def test_scratch_directory_and_output(self, pool):
+        """Test that files land in a private scratch directory and output is captured."""
+        code = """
+import os
+print("hello")
+result = [os.path.basename(os.getcwd()).startswith("sandbox-"), open("input.txt").read()]
+"""
+        result = pool.run(code, files={"input.txt": "data"})
+        assert result["result"] == [True, "data"]
+        assert result["stdout"] == "hello\n"
+
+    def test_environment_is_cleared(self, pool):
+        """Test that secrets in the environment are not visible to jobs."""
+        result = pool.run("import os\nresult = os.environ.get('LLM_API_KEY')")
+        assert result["result"] is None
+
+    def test_application_is_not_reachable(self, pool):
+        """Test that jobs share no memory or modules with the application."""
+        code = "import sys\nresult = [name for name in ('config', 'config.settings', 'agents', 'web') if name in sys.modules]"
+        assert pool.run(code)["result"] == []
+        result = pool.run("import config.settings")
+        assert result["success"] is False
+        assert "ModuleNotFoundError" in result["error"]
+
+    def test_only_scratch_directory_is_writable(self, pool, tmp_path):
+        """Test that jobs cannot write outside their scratch directory."""
+        target = tmp_path / "escaped.txt"
+        code = f"open({str(target)!r}, 'w').write('data')"
+        result = pool.run(code)
+        assert result["success"] is False
+        assert not target.exists()
+        assert pool.run("open('output.txt', 'w').write('data')\nresult = open('output.txt').read()")["result"] == "data"
+
+    def test_host_processes_are_hidden(self, pool):
+        """Test that jobs cannot read the environment of host processes."""
+        code = "import os\nresult = os.listdir('/proc')"
+        assert pool.run(code)["result"] == []
+
+    def test_job_error(self, pool):
+        """Test that exceptions are reported as errors."""
+        result = pool.run("raise ValueError('boom')")
+        assert result["success"] is False
+        assert result["error"] == "ValueError: boom"
+
+    def test_wall_clock_timeout(self, pool):
+        """Test that jobs exceeding the wall-clock timeout are killed."""
+        result = pool.run("import time\ntime.sleep(5)", timeout=0.5)
+        assert result["success"] is False
+        assert result["timed_out"] is True
+
+    def test_cpu_limit(self, pool):
+        """Test that jobs exceeding the CPU time limit are stopped."""
+        result = pool.run("while True:\n    pass", timeout=10, cpu_seconds=1)
+        assert result["success"] is False
+        assert result["error"] == "CPU time limit exceeded"
+
+    def test_memory_limit(self, pool):
+        """Test that jobs exceeding the memory limit fail."""
+        result = pool.run("data = bytearray(256 * 1024 * 1024)", memory_limit_mb=64)
+        assert result["success"] is False
+        assert "MemoryError" in result["error"]
+
+    def test_network_disabled(self, pool):
+        """Test that jobs cannot open network connections, even through the low-level module."""
+        code = "import socket\nsocket.create_connection(('127.0.0.1', 80), timeout=1)"
+        result = pool.run(code)
+        assert result["success"] is False
+
+        code = "import _socket\ns = _socket.socket()\ns.settimeout(1)\ns.connect(('1.1.1.1', 80))"
+        result = pool.run(code)
+        assert result["success"] is False
+        assert "unreachable" in result["error"].lower()
+
+    def test_async_submission(self, pool):
+        """Test concurrent submission from async code."""
+        async def submit_all():
+            return await asyncio.gather(*[pool.submit("result = payload * 2", payload=i) for i in range(4)])
+
+        results = asyncio.run(submit_all())
+        assert [result["result"] for result in results] == [0, 2, 4, 6]
+
+    def test_dead_worker_not_reused(self, monkeypatch):
+        """Test that a crashed worker that cannot be replaced is discarded, not handed the next job."""
+        with SandboxPool(workers=1) as sandbox_pool:
+            worker = sandbox_pool._idle.queue[0]
+            worker.process.kill()
+            worker.process.wait()
+
+            def fail_start():
+                raise OSError("cannot start worker")
+
+            monkeypatch.setattr(sandbox_pool, "_start_worker", fail_start)
+            assert sandbox_pool.run("result = 1")["error"] == "Sandbox worker crashed"
+            assert list(sandbox_pool._idle.queue) == [None]
+
+            monkeypatch.undo()
+            assert sandbox_pool.run("result = 1")["result"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
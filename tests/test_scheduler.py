@@ -0,0 +1,85 @@
+"""
+Unit tests for pipeline scheduling.
+"""
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from web.scheduler import ANONYMOUS_CLIENT, FairScheduler, class_weight, client_identity, estimate_start
+
+
+class TestScheduler:
+    """Test cases for pipeline scheduling."""
+
+    def test_client_identity(self):
+        """Test that clients are identified by a hash of their API key."""
+        assert client_identity(None) == ANONYMOUS_CLIENT
+        assert client_identity("secret-key") == client_identity("secret-key")
+        assert client_identity("secret-key") != client_identity("other-key")
+        assert "secret" not in client_identity("secret-key")
+
+    def test_class_weight(self):
+        """Test that unknown priority classes are rejected."""
+        assert class_weight("interactive") > class_weight("batch")
+        with pytest.raises(ValueError):
+            class_weight("urgent")
+
+    def test_estimate_start(self):
+        """Test that queued runs start when enough running runs finish."""
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        assert estimate_start(0, running=1, capacity=2, average_seconds=60, now=now) == now
+        assert estimate_start(0, running=2, capacity=2, average_seconds=60, now=now) == now + timedelta(seconds=60)
+        assert estimate_start(3, running=2, capacity=2, average_seconds=60, now=now) == now + timedelta(seconds=120)
+
+    def test_fair_order(self):
+        """Test that interactive runs go first and batch clients take turns."""
+        order = []
+
+        async def run():
+            release = asyncio.Event()
+            scheduler = FairScheduler(concurrency=1)
+
+            def job(name, wait=False):
+                async def pipeline():
+                    if wait:
+                        await release.wait()
+                    order.append(name)
+                return pipeline
+
+            scheduler.submit("blocker", job("blocker", wait=True))
+            for i in range(4):
+                scheduler.submit(f"bulk-{i}", job(f"bulk-{i}"), priority="batch", client="bulk")
+            for i in range(2):
+                scheduler.submit(f"user-{i}", job(f"user-{i}"), client="user")
+            scheduler.submit("other", job("other"), priority="batch", client="other")
+
+            status = scheduler.queue_status("other")
+            assert status["position"] == 3
+            assert scheduler.queue_status("blocker") is None
+
+            release.set()
+            while len(order) < 8:
+                await asyncio.sleep(0.01)
+
+        asyncio.run(run())
+        assert order == ["blocker", "user-0", "user-1", "bulk-0", "other", "bulk-1", "bulk-2", "bulk-3"]
+
+    def test_concurrency_limit_and_cancel(self):
+        """Test that at most `concurrency` runs are in progress and queued runs can be dropped."""
+        async def run():
+            release = asyncio.Event()
+            scheduler = FairScheduler(concurrency=2)
+            for i in range(5):
+                scheduler.submit(f"task-{i}", release.wait)
+            await asyncio.sleep(0)
+            assert len(scheduler.running) == 2
+            assert sorted(scheduler.task_ids()) == [f"task-{i}" for i in range(5)]
+            dropped = scheduler.cancel_queued()
+            release.set()
+            await asyncio.gather(*scheduler.running)
+            return dropped
+
+        assert asyncio.run(run()) == ["task-2", "task-3", "task-4"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,61 @@
+"""
+Unit tests for fast response serialization.
+"""
+import json
+from datetime import datetime
+import pytest
+from fastapi.testclient import TestClient
+from tools.serialization_benchmark import make_status, run_benchmark
+from web.api import create_task, status_cache, tasks_storage, update_task
+from web.main import app
+from web.serialization import SerializedCache, dumps
+
+
+class TestSerialization:
+    """Test cases for fast response serialization."""
+
+    def test_dumps(self):
+        """Test that datetimes are encoded and the output is compact JSON."""
+        now = datetime(2024, 1, 2, 3, 4, 5)
+        body = dumps({"updated_at": now, "values": [1, 2.5, None, "ü"]})
+        assert json.loads(body) == {"updated_at": "2024-01-02T03:04:05", "values": [1, 2.5, None, "ü"]}
+        assert b" " not in body
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test the bounded LRU cache of serialized bodies."""
+        cache = SerializedCache(max_entries=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        assert cache.get("a") == b"1"
+        cache.put("c", b"3")
+        assert cache.get("b") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_status_body_cached_per_version(self):
+        """Test that polls of an unchanged task reuse the serialized body."""
+        client = TestClient(app)
+        task_id = create_task()
+        try:
+            first = client.get(f"/api/v1/code-status/{task_id}")
+            hits = status_cache.hits
+            assert client.get(f"/api/v1/code-status/{task_id}").content == first.content
+            assert status_cache.hits == hits + 1
+
+            update_task(task_id, status="processing")
+            data = client.get(f"/api/v1/code-status/{task_id}").json()
+            assert data["status"] == "processing"
+            assert data["version"] == 1
+            assert isinstance(datetime.fromisoformat(data["updated_at"]), datetime)
+        finally:
+            tasks_storage.pop(task_id)
+
+    def test_benchmark(self):
+        """Test the benchmark on a 100 KB payload."""
+        assert len(dumps(make_status(100)["result"])) >= 100 * 1024
+        report = run_benchmark(payload_kb=100, number=3)
+        assert set(report["microseconds_per_serialization"]) == {"pydantic_default", "fast_dumps", "cached"}
+        assert report["speedup_cached"] > 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,120 @@
+"""
+Unit tests for the session memory manager.
+"""
+import json
+import pytest
+from agents.models import ChatMessage, SessionState
+from agents.session_memory import (ArchivedMessage, SessionManager, SessionMemory, SqliteSessionStore,
+                                   get_session_store, message_tokens)
+
+
+def make_message(turn: int) -> ChatMessage:
+    """Create a chat message of about 20 tokens."""
+    return ChatMessage(
+        role="user" if turn % 2 == 0 else "assistant",
+        content=f"Turn {turn}. " + "x" * 60,
+        tools_used=[{"name": "check_code_quality", "args": {"code": "x = 1"}}]
+    )
+
+
+class TestSessionMemory:
+    """Test cases for the session memory manager."""
+
+    @pytest.mark.asyncio
+    async def test_live_messages_stay_within_budget(self):
+        """Test that old turns are archived and summarized in the background."""
+        memory = SessionMemory(SessionState(session_id="s1"), max_tokens=100)
+        for turn in range(20):
+            memory.add_message(make_message(turn))
+            assert memory.tokens <= 100
+
+        assert memory.tokens == sum(message_tokens(message) for message in memory.state.messages)
+        assert len(memory.archive) + len(memory.state.messages) == 20
+        await memory.flush()
+        assert "Turn 0" in memory.state.summary
+
+        context = memory.context_messages()
+        assert context[0].role == "system"
+        assert context[1:] == memory.state.messages
+
+    def test_oversized_message_stays_live(self):
+        """Test that the latest message is kept even if it exceeds the budget."""
+        memory = SessionMemory(SessionState(session_id="s1"), max_tokens=10)
+        memory.add_message(make_message(0))
+        memory.add_message(make_message(1))
+        assert len(memory.state.messages) == 1
+        assert memory.state.messages[0].content.startswith("Turn 1")
+
+    def test_archived_messages_are_compact(self):
+        """Test that archived messages use slots and keep only tool names."""
+        archived = ArchivedMessage.from_message(make_message(0))
+        assert not hasattr(archived, "__dict__")
+        assert archived.tools == ("check_code_quality",)
+        assert archived.to_message().content == make_message(0).content
+
+    @pytest.mark.asyncio
+    async def test_archive_is_capped(self):
+        """Test that only the latest archived turns are kept once they are summarized."""
+        memory = SessionMemory(SessionState(session_id="s1"), max_tokens=30, max_archived=3)
+        for turn in range(10):
+            memory.add_message(make_message(turn))
+            await memory.flush()
+        assert [message.content.split(".")[0] for message in memory.archive] == ["Turn 6", "Turn 7", "Turn 8"]
+        assert "Turn 0" in memory.state.summary
+
+    @pytest.mark.asyncio
+    async def test_summarizer_failure_keeps_turns(self):
+        """Test that turns are summarized later if the summarizer fails."""
+        calls = []
+
+        async def flaky_summarizer(previous_summary, messages, max_tokens):
+            calls.append(len(messages))
+            if len(calls) == 1:
+                raise RuntimeError("model unavailable")
+            return f"{len(messages)} turns"
+
+        memory = SessionMemory(SessionState(session_id="s1"), max_tokens=30, summarizer=flaky_summarizer)
+        memory.add_message(make_message(0))
+        memory.add_message(make_message(1))
+        await memory.flush()
+        assert memory.state.summary == "1 turns"
+
+    def test_manager_persists_evicted_sessions(self):
+        """Test that sessions evicted from memory are reloaded from the store."""
+        store = {}
+        manager = SessionManager(store=store, max_sessions=1, max_tokens=50)
+        first = manager.get("first", user_id="alice")
+        for turn in range(6):
+            first.add_message(make_message(turn))
+
+        manager.get("second")
+        assert list(store) == ["first"]
+        json.dumps(store["first"])
+
+        reloaded = manager.get("first")
+        assert reloaded is not first
+        assert reloaded.state.user_id == "alice"
+        assert [message.content for message in reloaded.full_history()] == [
+            message.content for message in first.full_history()
+        ]
+
+    def test_sqlite_store(self, tmp_path):
+        """Test that sessions persisted to SQLite are reloaded by another manager."""
+        path = str(tmp_path / "sessions" / "sessions.db")
+        manager = SessionManager(store=get_session_store("sqlite", path))
+        manager.get("first", user_id="alice").add_message(make_message(0))
+        manager.close()
+
+        store = SqliteSessionStore(path)
+        assert list(store) == ["first"]
+        reloaded = SessionManager(store=store).get("first")
+        assert reloaded.state.user_id == "alice"
+        assert reloaded.state.messages[0].content == make_message(0).content
+        del store["first"]
+        assert len(store) == 0
+        with pytest.raises(ValueError):
+            get_session_store("redis")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
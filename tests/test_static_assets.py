@@ -0,0 +1,54 @@
+"""
+Unit tests for precompressed static asset serving.
+"""
+import pytest
+from starlette.applications import Starlette
+from fastapi.testclient import TestClient
+from tools.build_assets import build_assets
+from web.static_assets import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, PrecompressedStaticFiles
+
+
+@pytest.fixture
+def client(tmp_path):
+    """Serve a frontend build."""
+    source = tmp_path / "frontend"
+    source.mkdir()
+    (source / "index.html").write_text('<script src="script.js"></script>\n')
+    (source / "script.js").write_text("console.log('hello');\n" * 50)
+    manifest = build_assets(str(source), str(tmp_path / "dist"))
+
+    app = Starlette()
+    app.mount("/static", PrecompressedStaticFiles(directory=str(tmp_path / "dist")), name="static")
+    return TestClient(app), manifest
+
+
+class TestStaticAssets:
+    """Test cases for precompressed static asset serving."""
+
+    def test_precompressed_variant(self, client):
+        """Test that hashed assets are served precompressed and immutable."""
+        test_client, manifest = client
+        response = test_client.get(f"/static/{manifest['script.js']}", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert "javascript" in response.headers["content-type"]
+        assert response.text == "console.log('hello');\n" * 50
+
+    def test_uncompressed_fallback(self, client):
+        """Test that clients without gzip get the plain file."""
+        test_client, manifest = client
+        response = test_client.get(f"/static/{manifest['script.js']}", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+    def test_index_is_revalidated(self, client):
+        """Test that the index is revalidated and points at the hashed assets."""
+        test_client, manifest = client
+        response = test_client.get("/static/index.html", headers={"Accept-Encoding": "br;q=0, gzip"})
+        assert response.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+        assert manifest["script.js"] in response.text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,113 @@
+"""
+Unit tests for the task storage backends.
+"""
+import asyncio
+import time
+from datetime import datetime
+import pytest
+from web.task_store import MemoryTaskStore, SqliteTaskStore, get_task_store
+
+
+def new_task():
+    """Create an initial task record."""
+    now = datetime.now()
+    return {"status": "pending", "result": None, "error": None, "created_at": now, "updated_at": now, "version": 0}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Create a task store of each backend."""
+    return get_task_store(request.param, str(tmp_path / "tasks.db"), poll_interval=0.01)
+
+
+class TestTaskStore:
+    """Test cases for the task storage backends."""
+
+    def test_dictionary_interface(self, store):
+        """Test storing, reading, updating and removing tasks."""
+        store["task-1"] = new_task()
+        assert "task-1" in store
+        assert "task-2" not in store
+        assert list(store) == ["task-1"]
+
+        task = store.update("task-1", status="completed", result={"usage": {"total": {"total_tokens": 5}}})
+        assert task["version"] == 1
+        assert store["task-1"]["status"] == "completed"
+        assert store["task-1"]["result"]["usage"]["total"]["total_tokens"] == 5
+        assert isinstance(store["task-1"]["updated_at"], datetime)
+
+        assert store.pop("task-1")["version"] == 1
+        assert store.pop("task-1", None) is None
+        assert store.get("task-1") is None
+        with pytest.raises(KeyError):
+            store["task-1"]
+
+    def test_conditional_update(self, store):
+        """Test that an update with an expected version only applies to that version."""
+        store["task-1"] = new_task()
+        assert store.update("task-1", expected_version=0, status="processing")["version"] == 1
+        assert store.update("task-1", expected_version=0, status="failed") is None
+        assert store["task-1"]["status"] == "processing"
+        assert store["task-1"]["version"] == 1
+
+    def test_leases(self, store):
+        """Test that leases are kept apart from the task version and only taken once expired."""
+        store["task-1"] = new_task()
+        assert store.lease_expires("task-1") is None
+        assert store.set_lease("task-1", 100.0)
+        assert store.set_lease("task-1", 200.0)
+        assert store.lease_expires("task-1") == 200.0
+        assert store["task-1"]["version"] == 0
+
+        assert not store.set_lease("task-1", 300.0, expired_by=150.0)
+        assert store.set_lease("task-1", 300.0, expired_by=250.0)
+        assert store.lease_expires("task-1") == 300.0
+
+        store.pop("task-1")
+        assert store.lease_expires("task-1") is None
+
+    def test_wait_for_change(self, store):
+        """Test that waits end on an update and otherwise at the timeout."""
+        store["task-1"] = new_task()
+
+        async def run():
+            start = time.perf_counter()
+            await store.wait_for_change("task-1", 0, timeout=0.05)
+            timed_out = time.perf_counter() - start
+
+            asyncio.get_running_loop().call_later(0.05, lambda: store.update("task-1", status="processing"))
+            start = time.perf_counter()
+            await store.wait_for_change("task-1", 0, timeout=10)
+            return timed_out, time.perf_counter() - start
+
+        timed_out, woken = asyncio.run(run())
+        assert timed_out >= 0.05
+        assert woken < 5
+
+    def test_sqlite_shared_between_workers(self, tmp_path):
+        """Test that a store sees the tasks and updates of another process's store."""
+        path = str(tmp_path / "shared" / "tasks.db")
+        api_worker = SqliteTaskStore(path, poll_interval=0.01)
+        other_worker = SqliteTaskStore(path, poll_interval=0.01)
+        api_worker["task-1"] = new_task()
+        assert other_worker["task-1"]["status"] == "pending"
+
+        async def run():
+            asyncio.get_running_loop().call_later(0.05, lambda: other_worker.update("task-1", status="completed"))
+            start = time.perf_counter()
+            await api_worker.wait_for_change("task-1", 0, timeout=10)
+            return time.perf_counter() - start
+
+        assert asyncio.run(run()) < 5
+        assert api_worker["task-1"]["status"] == "completed"
+        assert api_worker["task-1"]["version"] == 1
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend is rejected."""
+        with pytest.raises(ValueError):
+            get_task_store("redis")
+        assert isinstance(get_task_store(), MemoryTaskStore)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
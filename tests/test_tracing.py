@@ -0,0 +1,176 @@
+"""
+Unit tests for pipeline tracing.
+"""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from types import SimpleNamespace
+import httpx
+import openai
+import pytest
+from agents import provider
+from agents.provider import instrument_client
+from utils import tracing
+from utils.code_validator import run_tool_on_code
+from utils.tracing import JsonlSpanExporter, OtlpHttpSpanExporter, Tracer
+
+
+class CollectingExporter:
+    """Exporter keeping spans in memory."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """Install a process-wide tracer that collects spans in memory."""
+    collecting_exporter = CollectingExporter()
+    tracer = Tracer([collecting_exporter], flush_interval=60)
+    monkeypatch.setattr(tracing, "_tracer", tracer)
+    yield collecting_exporter
+    tracer.shutdown()
+
+
+class TestTracing:
+    """Test cases for pipeline tracing."""
+
+    def test_span_tree(self, exporter):
+        """Test that spans nest under one trace and record errors."""
+        tracer = tracing.get_tracer()
+        with tracer.trace("code_generation", trace_key="task-1", task_id="task-1") as root:
+            with tracer.span("stage.codegen", stage="codegen"):
+                pass
+            with pytest.raises(ValueError):
+                with tracer.span("stage.review"):
+                    raise ValueError("boom")
+        tracer.flush()
+
+        spans = {span.name: span for span in exporter.spans}
+        assert {span.trace_id for span in exporter.spans} == {root.trace_id}
+        assert spans["stage.codegen"].parent_id == root.span_id
+        assert spans["stage.codegen"].attributes == {"stage": "codegen"}
+        assert spans["stage.review"].status == "error"
+        assert spans["stage.review"].error == "ValueError: boom"
+        assert spans["code_generation"].duration_ms >= 0
+
+    def test_no_spans_outside_trace(self, exporter):
+        """Test that code running outside a trace records nothing."""
+        with tracing.trace_span("tool.run"):
+            pass
+        tracing.get_tracer().flush()
+        assert exporter.spans == []
+
+    def test_sampling(self):
+        """Test that unsampled traces record no spans and sampling is deterministic."""
+        collecting_exporter = CollectingExporter()
+        tracer = Tracer([collecting_exporter], sample_rate=0.0)
+        with tracer.trace("code_generation", trace_key="task-1") as root:
+            with tracer.span("stage.codegen") as span:
+                assert root is None and span is None
+        tracer.shutdown()
+        assert collecting_exporter.spans == []
+
+        half = Tracer([], sample_rate=0.5)
+        decisions = [half.is_sampled(f"{i:032x}") for i in range(0, 2 ** 64, 2 ** 60)]
+        assert decisions == [half.is_sampled(f"{i:032x}") for i in range(0, 2 ** 64, 2 ** 60)]
+        assert sum(decisions) == len(decisions) // 2
+        half.shutdown()
+
+    def test_tool_spans_cross_threads(self, exporter):
+        """Test that tool invocations in worker threads join the current trace."""
+        tracer = tracing.get_tracer()
+
+        async def run():
+            with tracer.trace("code_generation", trace_key="task-2") as root:
+                await asyncio.to_thread(run_tool_on_code, ["pyflakes"], "x = 1\n")
+            return root
+
+        root = asyncio.run(run())
+        tracer.flush()
+        tool_span = next(span for span in exporter.spans if span.name == "tool.run")
+        assert tool_span.parent_id == root.span_id
+        assert tool_span.attributes["tool"] == "pyflakes"
+
+    @pytest.mark.asyncio
+    async def test_model_call_retries_are_traced(self, exporter, monkeypatch):
+        """Test that each model call attempt gets its own span."""
+        monkeypatch.setattr(provider, "RETRY_BACKOFF", 0.0)
+        attempts = []
+
+        async def flaky_create(**kwargs):
+            attempts.append(kwargs)
+            if len(attempts) == 1:
+                raise openai.APIConnectionError(request=httpx.Request("POST", "http://localhost"))
+            return SimpleNamespace(usage=SimpleNamespace(prompt_tokens=5, completion_tokens=1,
+                                                         prompt_tokens_details=None))
+
+        completions = SimpleNamespace(create=flaky_create)
+        instrument_client(SimpleNamespace(_client=SimpleNamespace(chat=SimpleNamespace(completions=completions))))
+
+        tracer = tracing.get_tracer()
+        with tracer.trace("code_generation", trace_key="task-3"):
+            await completions.create(model="gpt-4", messages=[])
+        tracer.flush()
+
+        call = next(span for span in exporter.spans if span.name == "llm.chat_completion")
+        attempt_spans = [span for span in exporter.spans if span.name == "llm.attempt"]
+        assert call.attributes["attempts"] == 2
+        assert call.attributes["prompt_tokens"] == 5
+        assert [span.status for span in attempt_spans] == ["error", "ok"]
+        assert all(span.parent_id == call.span_id for span in attempt_spans)
+
+    def test_jsonl_exporter(self, tmp_path):
+        """Test that spans are written as JSON lines."""
+        path = tmp_path / "traces" / "spans.jsonl"
+        tracer = Tracer([JsonlSpanExporter(str(path))])
+        with tracer.trace("code_generation", trace_key="task-4"):
+            tracer.record_span("queue", 1, 2, queued=True)
+        tracer.shutdown()
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [record["name"] for record in records] == ["queue", "code_generation"]
+        assert records[0]["duration_ms"] == 1e-6
+
+    def test_otlp_exporter(self):
+        """Test export to a local stand-in for an OpenTelemetry collector."""
+        received = []
+
+        class CollectorHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                received.append((self.path, json.loads(body)))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), CollectorHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            endpoint = f"http://127.0.0.1:{server.server_port}/v1/traces"
+            tracer = Tracer([OtlpHttpSpanExporter(endpoint)])
+            with tracer.trace("code_generation", trace_key="task-5", task_id="task-5"):
+                with tracer.span("stage.codegen", attempt=1, cached=False):
+                    pass
+            tracer.shutdown()
+        finally:
+            server.shutdown()
+
+        path, request = received[0]
+        assert path == "/v1/traces"
+        spans = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        child, root = spans
+        assert child["parentSpanId"] == root["spanId"]
+        assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+        assert {"key": "attempt", "value": {"intValue": "1"}} in child["attributes"]
+        assert {"key": "cached", "value": {"boolValue": False}} in child["attributes"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
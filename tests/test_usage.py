@@ -0,0 +1,118 @@
+"""
+Unit tests for token usage accounting.
+"""
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from agents import codegen_agent, optimization_agent, requirements_agent, review_agent, testing_agent
+from agents.models import CodeGenerationRequest
+from agents.provider import instrument_client
+from agents.usage import TaskUsage, track_task_usage, usage_stage, usage_tracker
+from config.settings import settings
+from web import api
+
+
+def make_usage(prompt_tokens, completion_tokens, cached_tokens=0):
+    """Create an OpenAI-style usage object."""
+    return SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                           prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens))
+
+
+def fake_client(usage):
+    """Create an instrumented client whose completions report the given usage."""
+    async def create(**kwargs):
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(usage=usage)
+
+    completions = SimpleNamespace(create=create)
+    instrument_client(SimpleNamespace(_client=SimpleNamespace(chat=SimpleNamespace(completions=completions))))
+    return completions
+
+
+class TestUsage:
+    """Test cases for token usage accounting."""
+
+    def test_task_budget(self):
+        """Test per-stage totals and budget detection."""
+        task_usage = TaskUsage(token_budget=150)
+        task_usage.record("codegen", {"prompt_tokens": 80, "cached_tokens": 40, "completion_tokens": 20})
+        assert not task_usage.budget_exceeded
+        task_usage.record("review", {"prompt_tokens": 40, "cached_tokens": 0, "completion_tokens": 10})
+        assert task_usage.budget_exceeded
+
+        usage = task_usage.to_dict()
+        assert usage["stages"]["codegen"]["total_tokens"] == 100
+        assert usage["total"]["total_tokens"] == 150
+        assert usage["total"]["requests"] == 2
+
+    def test_cost_uses_cached_price(self, monkeypatch):
+        """Test that cached prompt tokens are charged at the cached price."""
+        monkeypatch.setattr(settings, "llm_prompt_cost_per_1k", 1.0)
+        monkeypatch.setattr(settings, "llm_cached_prompt_cost_per_1k", 0.5)
+        monkeypatch.setattr(settings, "llm_completion_cost_per_1k", 2.0)
+        task_usage = TaskUsage()
+        task_usage.record("codegen", {"prompt_tokens": 1000, "cached_tokens": 600, "completion_tokens": 500})
+        assert task_usage.to_dict()["total"]["cost_usd"] == 0.4 + 0.3 + 1.0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_are_attributed(self):
+        """Test that completions are attributed to the task and stage that made them."""
+        completions = fake_client(make_usage(100, 10, cached_tokens=50))
+        usage_tracker.reset()
+
+        async def run_task(stages):
+            with track_task_usage() as task_usage:
+                for stage in stages:
+                    with usage_stage(stage):
+                        await completions.create(model="gpt-4", messages=[])
+            return task_usage
+
+        first, second = await asyncio.gather(run_task(["codegen", "review"]), run_task(["codegen"]))
+        assert first.total_tokens == 220
+        assert set(first.stages) == {"codegen", "review"}
+        assert second.total_tokens == 110
+
+        stats = usage_tracker.stats()
+        assert stats["tasks"] == 2
+        assert stats["stages"]["codegen"]["requests"] == 2
+        assert stats["models"]["gpt-4"]["cached_tokens"] == 150
+
+    @pytest.mark.asyncio
+    async def test_pipeline_skips_optional_stages_over_budget(self, monkeypatch):
+        """Test that review, optimization and tests are skipped once the budget is used."""
+        completions = fake_client(make_usage(900, 200))
+
+        async def fake_analyze(requirements):
+            await completions.create(model="gpt-4", messages=[])
+            return {"original_requirements": requirements}
+
+        async def fake_generate(specification):
+            await completions.create(model="gpt-4", messages=[])
+            return "def add(a, b):\n    return a + b\n"
+
+        monkeypatch.setattr(requirements_agent, "analyze_requirements", fake_analyze)
+        monkeypatch.setattr(codegen_agent, "generate_code", fake_generate)
+        monkeypatch.setattr(review_agent, "review_code", None)
+        monkeypatch.setattr(optimization_agent, "optimize_code", None)
+        monkeypatch.setattr(testing_agent, "generate_tests", None)
+        monkeypatch.setattr(settings, "task_token_budget", 2000)
+
+        now = datetime.now()
+        api.tasks_storage["budget-task"] = {"status": "pending", "result": None, "error": None,
+                                            "created_at": now, "updated_at": now}
+        await api.process_code_generation("budget-task", CodeGenerationRequest(requirements="Add numbers"))
+
+        task = api.tasks_storage.pop("budget-task")
+        assert task["status"] == "completed"
+        result = task["result"]
+        assert result["skipped_stages"] == ["review", "optimization", "testing"]
+        assert result["review_result"] is None
+        assert result["usage"]["stages"]["requirements"]["total_tokens"] == 1100
+        assert result["usage"]["budget_exceeded"] is True
+        assert task["stages"]["codegen"]["status"] == "completed"
+        assert task["stages"]["review"]["status"] == "skipped"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,9 +1,20 @@
 """
 Unit tests for the Web Interface.
 """
+import asyncio
+import time
+from datetime import datetime, timedelta
 import pytest
 from fastapi.testclient import TestClient
+from agents import codegen_agent, optimization_agent, requirements_agent, review_agent, testing_agent
+from agents.models import CodeGenerationRequest, CodeOptimizationResult, CodeReviewResult, GeneratedTestResult
+from agents.session_memory import SessionManager
+from web import api
+from web.api import create_task, tasks_storage, update_task, wait_for_task_change
 from web.main import app
+from web.payloads import artifact_id, normalize_result
+from web.scheduler import FairScheduler
+from web.task_store import MemoryTaskStore
 
 
 class TestWebInterface:
@@ -74,6 +85,343 @@ class TestWebInterface:
         response = client.get("/api/v1/code-status/non-existent-task-id")
         assert response.status_code == 404
         
+    def test_code_status_field_selection(self, client):
+        """Test selecting result fields and leaving out code in the status endpoint."""
+        code = "def add(a, b):\n    return a + b\n" * 200
+        now = datetime.now()
+        tasks_storage["status-task"] = {
+            "status": "completed",
+            "result": normalize_result({
+                "generated_code": code,
+                "review_result": {"code": code, "issues": []},
+                "usage": {"total": {"total_tokens": 10}}
+            }),
+            "error": None,
+            "created_at": now,
+            "updated_at": now
+        }
+        try:
+            full = client.get("/api/v1/code-status/status-task").json()["result"]
+            assert full["artifacts"] == {artifact_id(code): code}
+            
+            response = client.get("/api/v1/code-status/status-task?fields=usage&include_code=false")
+            assert response.json()["result"] == {"usage": {"total": {"total_tokens": 10}}}
+            
+            response = client.get("/api/v1/code-status/status-task", headers={"Accept-Encoding": "gzip"})
+            assert response.headers["content-encoding"] in ("gzip", "br")
+        finally:
+            tasks_storage.pop("status-task")
+        
+    def test_code_status_etag(self, client):
+        """Test that unchanged tasks answer If-None-Match with 304."""
+        task_id = create_task()
+        try:
+            response = client.get(f"/api/v1/code-status/{task_id}")
+            etag = response.headers["etag"]
+            assert response.json()["version"] == 0
+            
+            response = client.get(f"/api/v1/code-status/{task_id}", headers={"If-None-Match": etag})
+            assert response.status_code == 304
+            
+            update_task(task_id, status="completed", result={"usage": {}})
+            response = client.get(f"/api/v1/code-status/{task_id}?wait=30", headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.json()["version"] == 1
+            assert response.headers["etag"] != etag
+            
+            # Finished tasks are not held even in long-poll mode
+            start = time.perf_counter()
+            response = client.get(f"/api/v1/code-status/{task_id}?wait=30",
+                                  headers={"If-None-Match": response.headers["etag"]})
+            assert response.status_code == 304
+            assert time.perf_counter() - start < 5
+        finally:
+            tasks_storage.pop(task_id)
+    
+    @pytest.mark.asyncio
+    async def test_long_poll_wakes_on_update(self):
+        """Test that a long-poll wait ends when the task changes, or at the timeout."""
+        task_id = create_task()
+        try:
+            start = time.perf_counter()
+            await wait_for_task_change(task_id, 0, timeout=0.05)
+            assert time.perf_counter() - start >= 0.05
+            
+            asyncio.get_running_loop().call_later(0.05, lambda: update_task(task_id, status="processing"))
+            start = time.perf_counter()
+            await wait_for_task_change(task_id, 0, timeout=10)
+            assert time.perf_counter() - start < 5
+            assert tasks_storage[task_id]["version"] == 1
+        finally:
+            tasks_storage.pop(task_id)
+        
+    @pytest.mark.asyncio
+    async def test_pipeline_publishes_stages_as_they_land(self, monkeypatch):
+        """Test that each stage's status and output is stored before the next stage runs."""
+        task_id = create_task()
+        seen = {}
+        
+        async def fake_analyze(requirements):
+            return {"original_requirements": requirements}
+        
+        async def fake_generate(specification):
+            task = tasks_storage[task_id]
+            seen["stages"] = task["stages"]
+            seen["result"] = task["result"]
+            return "def add(a, b):\n    return a + b\n"
+        
+        async def fail_review(code):
+            raise RuntimeError("review failed")
+        
+        monkeypatch.setattr(requirements_agent, "analyze_requirements", fake_analyze)
+        monkeypatch.setattr(codegen_agent, "generate_code", fake_generate)
+        monkeypatch.setattr(review_agent, "review_code", fail_review)
+        monkeypatch.setattr(optimization_agent, "optimize_code", None)
+        monkeypatch.setattr(testing_agent, "generate_tests", None)
+        try:
+            await api.process_code_generation(task_id, CodeGenerationRequest(requirements="Add numbers"))
+            
+            assert seen["stages"]["requirements"]["status"] == "completed"
+            assert seen["stages"]["codegen"]["status"] == "running"
+            assert seen["stages"]["review"]["status"] == "pending"
+            assert seen["stages"]["refinement"]["status"] == "skipped"
+            assert seen["result"]["specification"]["original_requirements"] == "Add numbers"
+            
+            # A failed task keeps the output of the stages that completed
+            task = tasks_storage[task_id]
+            assert task["status"] == "failed"
+            assert task["stages"]["codegen"]["status"] == "completed"
+            assert task["stages"]["review"]["status"] == "failed"
+            assert task["result"]["generated_code"] in task["result"]["artifacts"]
+        finally:
+            tasks_storage.pop(task_id)
+        
+    @pytest.mark.asyncio
+    async def test_pipeline_records_session_turn(self, pipelines, monkeypatch):
+        """Test that a completed request and its code are recorded in the request's session."""
+        async def fake_analyze(requirements):
+            return {"original_requirements": requirements}
+        
+        async def fake_generate(specification):
+            return "def add(a, b):\n    return a + b\n"
+        
+        async def fake_review(code):
+            return CodeReviewResult(code=code, issues=[], suggestions=[], pep8_compliance=True)
+        
+        async def fake_optimize(code):
+            return CodeOptimizationResult(original_code=code, optimized_code=code, improvements=[])
+        
+        async def fake_tests(code, test_code=None):
+            return GeneratedTestResult(source_code=code, test_code="", test_cases=[])
+        
+        monkeypatch.setattr(api, "session_manager", SessionManager())
+        monkeypatch.setattr(requirements_agent, "analyze_requirements", fake_analyze)
+        monkeypatch.setattr(codegen_agent, "generate_code", fake_generate)
+        monkeypatch.setattr(review_agent, "review_code", fake_review)
+        monkeypatch.setattr(optimization_agent, "optimize_code", fake_optimize)
+        monkeypatch.setattr(testing_agent, "generate_tests", fake_tests)
+        task_id = create_task()
+        await api.process_code_generation(task_id, CodeGenerationRequest(requirements="Add numbers", session_id="s1"))
+        
+        assert pipelines[task_id]["status"] == "completed"
+        assert [message.content for message in api.session_manager.get("s1").state.messages] == [
+            "Add numbers", "def add(a, b):\n    return a + b\n"
+        ]
+        assert "s1" in api.session_manager.store
+        assert "s1" not in pipelines
+    
+    @pytest.mark.asyncio
+    async def test_pipeline_resumes_from_checkpoint(self, monkeypatch):
+        """Test that a failed task reruns only the stages that did not complete."""
+        calls = []
+        
+        async def fake_analyze(requirements):
+            calls.append("requirements")
+            return {"original_requirements": requirements}
+        
+        async def fake_generate(specification):
+            calls.append("codegen")
+            return "def add(a, b):\n    return a + b\n"
+        
+        async def fail_review(code):
+            raise RuntimeError("review failed")
+        
+        async def fake_review(code):
+            calls.append("review")
+            return CodeReviewResult(code=code, issues=[], suggestions=[], pep8_compliance=True)
+        
+        async def fake_optimize(code):
+            calls.append("optimization")
+            return CodeOptimizationResult(original_code=code, optimized_code=code, improvements=[])
+        
+        async def fake_tests(code, test_code=None):
+            calls.append("testing")
+            return GeneratedTestResult(source_code=code, test_code="def test_add():\n    assert add(1, 2) == 3\n",
+                                       test_cases=[])
+        
+        monkeypatch.setattr(requirements_agent, "analyze_requirements", fake_analyze)
+        monkeypatch.setattr(codegen_agent, "generate_code", fake_generate)
+        monkeypatch.setattr(review_agent, "review_code", fail_review)
+        monkeypatch.setattr(optimization_agent, "optimize_code", fake_optimize)
+        monkeypatch.setattr(testing_agent, "generate_tests", fake_tests)
+        request = CodeGenerationRequest(requirements="Add numbers")
+        task_id = create_task(request=request)
+        try:
+            await api.process_code_generation(task_id, request)
+            assert tasks_storage[task_id]["status"] == "failed"
+            
+            monkeypatch.setattr(review_agent, "review_code", fake_review)
+            calls.clear()
+            await api.process_code_generation(task_id, request)
+            
+            task = tasks_storage[task_id]
+            assert task["status"] == "completed"
+            assert task["error"] is None
+            assert calls == ["review", "optimization", "testing"]
+            assert task["result"]["specification"]["original_requirements"] == "Add numbers"
+            assert task["result"]["review_result"]["code"] == task["result"]["generated_code"]
+        finally:
+            tasks_storage.pop(task_id)
+    
+    def test_resume_endpoint(self, client):
+        """Test that only failed tasks can be resumed."""
+        response = client.post("/api/v1/tasks/missing/resume")
+        assert response.status_code == 404
+        
+        task_id = create_task()
+        try:
+            update_task(task_id, status="completed")
+            response = client.post(f"/api/v1/tasks/{task_id}/resume")
+            assert response.status_code == 409
+            
+            # Tasks created without their request cannot be rerun
+            update_task(task_id, status="failed")
+            response = client.post(f"/api/v1/tasks/{task_id}/resume")
+            assert response.status_code == 409
+        finally:
+            tasks_storage.pop(task_id)
+    
+    @pytest.fixture
+    def pipelines(self, monkeypatch):
+        """Run pipelines inline with a fresh scheduler and an empty task store, restored afterwards."""
+        monkeypatch.setattr(api.settings, "pipeline_mode", "inline")
+        monkeypatch.setattr(api, "scheduler", FairScheduler(concurrency=2))
+        store = MemoryTaskStore()
+        monkeypatch.setattr(api, "tasks_storage", store)
+        return store
+    
+    @pytest.mark.asyncio
+    async def test_drain_interrupts_and_restart_resumes(self, pipelines, monkeypatch):
+        """Test that pipelines still running at the drain deadline are interrupted and resumed later."""
+        started = asyncio.Event()
+        
+        async def fake_analyze(requirements):
+            return {"original_requirements": requirements}
+        
+        async def slow_generate(specification):
+            started.set()
+            await asyncio.sleep(30)
+        
+        monkeypatch.setattr(requirements_agent, "analyze_requirements", fake_analyze)
+        monkeypatch.setattr(codegen_agent, "generate_code", slow_generate)
+        request = CodeGenerationRequest(requirements="Add numbers")
+        task_id = create_task(request=request)
+        api.start_pipeline(task_id, request)
+        await started.wait()
+        assert await api.drain_pipelines(timeout=0.05) == 1
+        
+        task = pipelines[task_id]
+        assert task["status"] == "interrupted"
+        assert task["stages"]["requirements"]["status"] == "completed"
+        assert task["stages"]["codegen"]["status"] == "pending"
+        assert not api.scheduler.running
+        
+        # The next server run resumes the task
+        resumed = []
+        monkeypatch.setattr(api, "start_pipeline", lambda task_id, request, client: resumed.append(task_id))
+        assert api.reconcile_interrupted_tasks()["resumed"] == [task_id]
+        assert resumed == [task_id]
+        assert pipelines[task_id]["status"] == "pending"
+    
+    def test_resume_requeues_task(self, pipelines, monkeypatch):
+        """Test that a resumed task's queue time starts at the resume, not at its creation."""
+        monkeypatch.setattr(api, "start_pipeline", lambda task_id, request, client: None)
+        task_id = create_task(request=CodeGenerationRequest(requirements="Add numbers"))
+        update_task(task_id, status="interrupted", queued_at=datetime.now() - timedelta(hours=1))
+        assert api.resume_task(task_id)
+        assert pipelines[task_id]["queued_at"] > pipelines[task_id]["created_at"]
+    
+    def test_reconcile_fails_unresumable_tasks(self, pipelines):
+        """Test that processing tasks with an expired lease and without a stored request are failed."""
+        task_id = create_task()
+        update_task(task_id, status="processing")
+        pipelines.set_lease(task_id, time.time() - 1)
+        assert api.reconcile_interrupted_tasks()["failed"] == [task_id]
+        assert pipelines[task_id]["status"] == "failed"
+    
+    def test_reconcile_skips_records_that_are_not_tasks(self, pipelines):
+        """Test that records without a task status do not break reconciliation."""
+        pipelines["other:record"] = {"summary": "not a task"}
+        task_id = create_task()
+        update_task(task_id, status="interrupted")
+        assert api.reconcile_interrupted_tasks() == {"resumed": [], "failed": [task_id]}
+        assert pipelines["other:record"] == {"summary": "not a task"}
+    
+    def test_reconcile_skips_tasks_with_live_lease(self, pipelines, monkeypatch):
+        """Test that tasks still leased by another server process are not resumed."""
+        resumed = []
+        monkeypatch.setattr(api, "start_pipeline", lambda task_id, request, client: resumed.append(task_id))
+        request = CodeGenerationRequest(requirements="Add numbers")
+        live_id = create_task(request=request)
+        expired_id = create_task(request=request)
+        update_task(live_id, status="processing")
+        update_task(expired_id, status="processing")
+        pipelines.set_lease(expired_id, time.time() - 1)
+        assert api.reconcile_interrupted_tasks()["resumed"] == [expired_id]
+        assert resumed == [expired_id]
+        assert pipelines[live_id]["status"] == "processing"
+    
+    @pytest.mark.asyncio
+    async def test_leases_renewed_for_queued_tasks(self, pipelines, monkeypatch):
+        """Test that the tasks queued in this process keep their lease without a version bump."""
+        monkeypatch.setattr(api.settings, "task_lease_seconds", 0.06)
+        monkeypatch.setattr(api, "scheduler", FairScheduler(concurrency=0))
+        task_id = create_task()
+        api.scheduler.submit(task_id, asyncio.sleep)
+        expires = pipelines.lease_expires(task_id)
+        renewal = asyncio.create_task(api.renew_task_leases())
+        await asyncio.sleep(0.1)
+        renewal.cancel()
+        assert pipelines.lease_expires(task_id) > expires
+        assert pipelines[task_id]["version"] == 0
+    
+    def test_rejects_work_while_shutting_down(self, client, monkeypatch):
+        """Test that new tasks are refused once the server stops accepting work."""
+        monkeypatch.setattr(api, "accepting_work", False)
+        response = client.post("/api/v1/generate-code", json={"requirements": "Add numbers"})
+        assert response.status_code == 503
+    
+    def test_queued_task_reports_position(self, client, monkeypatch):
+        """Test that a queued task reports its queue position and estimated start time."""
+        monkeypatch.setattr(api.settings, "pipeline_mode", "inline")
+        monkeypatch.setattr(api, "scheduler", FairScheduler(concurrency=0))
+        response = client.post("/api/v1/generate-code", json={"requirements": "Add numbers", "priority": "urgent"})
+        assert response.status_code == 400
+        
+        task_ids = [client.post("/api/v1/generate-code", json={"requirements": "Add numbers", "priority": "batch"},
+                                headers={"X-API-Key": f"key-{i}"}).json()["task_id"] for i in range(2)]
+        try:
+            response = client.get(f"/api/v1/code-status/{task_ids[1]}")
+            data = response.json()
+            assert data["status"] == "pending"
+            assert data["queue"]["position"] == 1
+            assert data["queue"]["estimated_start"]
+            assert response.headers["etag"] == 'W/"0.1"'
+            assert tasks_storage[task_ids[1]]["client"] != tasks_storage[task_ids[0]]["client"]
+        finally:
+            for task_id in task_ids:
+                tasks_storage.pop(task_id)
+    
     def test_agents_endpoint(self, client):
         """Test the agents listing endpoint."""
         response = client.get("/api/v1/agents")
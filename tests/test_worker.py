@@ -0,0 +1,63 @@
+"""
+Unit tests for the pipeline worker.
+"""
+import asyncio
+import pytest
+from web import worker
+from web.api import create_task, tasks_storage, update_task
+from web.job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Create a job queue in a temporary database."""
+    return JobQueue(str(tmp_path / "jobs.db"), max_attempts=2)
+
+
+class TestWorker:
+    """Test cases for the pipeline worker."""
+
+    @pytest.mark.asyncio
+    async def test_runs_queued_jobs(self, queue, monkeypatch):
+        """Test that the worker runs queued jobs concurrently and completes them."""
+        running = []
+        peak = []
+
+        async def fake_process(task_id, request):
+            running.append(task_id)
+            peak.append(len(running))
+            await asyncio.sleep(0.05)
+            running.remove(task_id)
+            update_task(task_id, status="completed", result={"requirements": request.requirements})
+
+        monkeypatch.setattr(worker, "process_code_generation", fake_process)
+        task_ids = [create_task() for _ in range(4)]
+        for i, task_id in enumerate(task_ids):
+            queue.enqueue(task_id, {"requirements": f"Task {i}"})
+
+        try:
+            assert await worker.run_worker(concurrency=2, poll_interval=0.01, queue=queue, max_jobs=4) == 4
+            assert max(peak) == 2
+            assert [tasks_storage[task_id]["result"]["requirements"] for task_id in task_ids] == \
+                [f"Task {i}" for i in range(4)]
+            assert queue.stats()["done"] == 4
+        finally:
+            for task_id in task_ids:
+                tasks_storage.pop(task_id)
+
+    @pytest.mark.asyncio
+    async def test_gives_up_abandoned_jobs(self, queue):
+        """Test that a job claimed too often fails its task instead of running again."""
+        task_id = create_task()
+        job = {"id": queue.enqueue(task_id, {"requirements": "work"}), "task_id": task_id,
+               "payload": {"requirements": "work"}, "attempts": 3}
+        try:
+            await worker.run_job(queue, job)
+            assert tasks_storage[task_id]["status"] == "failed"
+            assert queue.stats()["failed"] == 1
+        finally:
+            tasks_storage.pop(task_id)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,169 @@
+"""
+Batch Analysis Tool for the AutoGen multi-agent system.
+This tool runs the code validation and quality checks over many code snippets,
+sharding them in chunks across worker processes and streaming results back
+as they complete.
+"""
+import argparse
+import concurrent.futures
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from tools.code_quality_tool import get_detailed_feedback
+from utils.code_validator import comprehensive_code_validation
+
+# Default batch parameters
+DEFAULT_CHUNK_SIZE = 16
+MAX_CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+def analyze_snippet(snippet_id: Any, code: str) -> Dict[str, Any]:
+    """
+    Run the validation and quality checks on one snippet.
+
+    Args:
+        snippet_id: Identifier of the snippet
+        code: Python code to analyze
+
+    Returns:
+        Dictionary with the snippet id and both check results
+    """
+    try:
+        return {
+            "id": snippet_id,
+            "success": True,
+            "validation": comprehensive_code_validation(code),
+            "feedback": get_detailed_feedback(code),
+            "error": None
+        }
+    except Exception as e:
+        return {
+            "id": snippet_id,
+            "success": False,
+            "validation": None,
+            "feedback": None,
+            "error": f"Error analyzing snippet: {str(e)}"
+        }
+
+
+def _analyze_chunk(chunk: List[Tuple[Any, str]]) -> List[Dict[str, Any]]:
+    """Analyze a chunk of snippets in a worker process."""
+    return [analyze_snippet(snippet_id, code) for snippet_id, code in chunk]
+
+
+def _chunks(items: Iterable[Tuple[Any, str]], chunk_size: int) -> Iterator[List[Tuple[Any, str]]]:
+    """Split the snippets into lists of at most chunk_size items."""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def analyze_batch(items: Iterable[Tuple[Any, str]], workers: Optional[int] = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze many snippets in parallel, yielding results as they complete.
+    The input is consumed lazily, with a bounded number of chunks in flight,
+    so arbitrarily large batches run in constant memory. Results are yielded
+    in completion order; use their "id" to match them to the input.
+
+    Args:
+        items: Iterable of (id, code) pairs
+        workers: Number of worker processes (defaults to the CPU count)
+        chunk_size: Number of snippets sent to a worker at a time
+
+    Yields:
+        Per-snippet result dictionaries as returned by analyze_snippet
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(items, chunk_size)
+    max_in_flight = workers * MAX_CHUNKS_IN_FLIGHT_PER_WORKER
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = set()
+        for chunk in itertools.islice(chunks, max_in_flight):
+            in_flight.add(executor.submit(_analyze_chunk, chunk))
+
+        while in_flight:
+            done, in_flight = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            for chunk in itertools.islice(chunks, len(done)):
+                in_flight.add(executor.submit(_analyze_chunk, chunk))
+            for future in done:
+                yield from future.result()
+
+
+def read_snippets(path: str) -> Iterator[Tuple[Any, str]]:
+    """
+    Read (id, code) pairs from a JSONL file with "id" and "code" fields.
+
+    Args:
+        path: Path of the JSONL file
+
+    Yields:
+        (id, code) pairs; lines without an id are numbered by line
+    """
+    with open(path, encoding="utf-8") as input_file:
+        for line_number, line in enumerate(input_file, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield record.get("id", line_number), record["code"]
+
+
+def run_batch_file(input_path: str, output_path: str, workers: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Analyze the snippets of a JSONL file and write the results as JSONL.
+
+    Args:
+        input_path: JSONL file with "id" and "code" fields
+        output_path: JSONL file the results are written to
+        workers: Number of worker processes
+        chunk_size: Number of snippets sent to a worker at a time
+
+    Returns:
+        Dictionary with snippet counts, elapsed time and throughput
+    """
+    start = time.perf_counter()
+    count = 0
+    failed = 0
+    with open(output_path, "w", encoding="utf-8") as output_file:
+        for result in analyze_batch(read_snippets(input_path), workers=workers, chunk_size=chunk_size):
+            output_file.write(json.dumps(result, default=str) + "\n")
+            count += 1
+            failed += not result["success"]
+    elapsed = time.perf_counter() - start
+
+    return {
+        "snippets": count,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+        "snippets_per_second": round(count / elapsed, 2) if elapsed > 0 else 0.0
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run batch analysis from the command line."""
+    parser = argparse.ArgumentParser(description="Run code validation and quality checks over a JSONL file")
+    parser.add_argument("input", help="JSONL file with 'id' and 'code' fields")
+    parser.add_argument("output", help="JSONL file to write the results to")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Snippets per worker task")
+    args = parser.parse_args(argv)
+
+    stats = run_batch_file(args.input, args.output, workers=args.workers, chunk_size=args.chunk_size)
+    print(
+        f"Analyzed {stats['snippets']} snippets ({stats['failed']} failed) in {stats['elapsed_s']}s "
+        f"({stats['snippets_per_second']} snippets/s)",
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
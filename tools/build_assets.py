@@ -0,0 +1,135 @@
+"""
+Frontend Asset Build Tool for the AutoGen multi-agent system.
+This tool copies the frontend assets to a build directory under
+content-hashed file names, writes precompressed .gz and .br variants, and
+rewrites index.html to reference the hashed names. Hashed assets never
+change, so they can be cached by browsers indefinitely.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+from typing import Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "web", "frontend")
+DEFAULT_OUTPUT_DIR = os.path.join(FRONTEND_DIR, "dist")
+
+# Files referenced from index.html that get hashed names
+HASHED_EXTENSIONS = (".js", ".css")
+# Files worth compressing
+COMPRESSIBLE_EXTENSIONS = (".html", ".js", ".css", ".json", ".svg")
+INDEX_FILE = "index.html"
+MANIFEST_FILE = "manifest.json"
+HASH_LENGTH = 10
+
+
+def hashed_name(name: str, data: bytes) -> str:
+    """
+    Build the content-hashed file name of an asset.
+
+    Args:
+        name: Original file name, e.g. script.js
+        data: File content
+
+    Returns:
+        Hashed name, e.g. script.0123456789.js
+    """
+    stem, extension = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{extension}"
+
+
+def write_compressed(path: str, data: bytes) -> None:
+    """Write the .gz variant of a file, and the .br variant when brotli is installed."""
+    with open(path + ".gz", "wb") as gz_file:
+        # mtime=0 keeps the output reproducible
+        gz_file.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + ".br", "wb") as br_file:
+            br_file.write(brotli.compress(data, quality=11))
+
+
+def rewrite_index(html: str, manifest: Dict[str, str]) -> str:
+    """
+    Point the src and href attributes of index.html at the hashed asset names.
+
+    Args:
+        html: Content of index.html
+        manifest: Original to hashed name mapping
+
+    Returns:
+        Rewritten HTML
+    """
+    def replace(match: re.Match) -> str:
+        attribute, quote, reference = match.group(1), match.group(2), match.group(3)
+        return f"{attribute}={quote}{manifest.get(reference, reference)}{quote}"
+
+    return re.sub(r'(src|href)=(["\'])([^"\']+)\2', replace, html)
+
+
+def build_assets(source_dir: str = FRONTEND_DIR, output_dir: str = DEFAULT_OUTPUT_DIR) -> Dict[str, str]:
+    """
+    Build the frontend assets.
+
+    Args:
+        source_dir: Directory with index.html and its assets
+        output_dir: Directory the build is written to (replaced if it exists)
+
+    Returns:
+        Manifest mapping original to hashed asset names
+    """
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    os.makedirs(output_dir)
+
+    manifest = {}
+    for name in sorted(os.listdir(source_dir)):
+        path = os.path.join(source_dir, name)
+        if not os.path.isfile(path) or name == INDEX_FILE:
+            continue
+        with open(path, "rb") as asset_file:
+            data = asset_file.read()
+        target = hashed_name(name, data) if name.endswith(HASHED_EXTENSIONS) else name
+        manifest[name] = target
+        output_path = os.path.join(output_dir, target)
+        with open(output_path, "wb") as output_file:
+            output_file.write(data)
+        if target.endswith(COMPRESSIBLE_EXTENSIONS):
+            write_compressed(output_path, data)
+
+    with open(os.path.join(source_dir, INDEX_FILE), encoding="utf-8") as index_file:
+        index = rewrite_index(index_file.read(), manifest).encode("utf-8")
+    index_path = os.path.join(output_dir, INDEX_FILE)
+    with open(index_path, "wb") as output_file:
+        output_file.write(index)
+    write_compressed(index_path, index)
+
+    with open(os.path.join(output_dir, MANIFEST_FILE), "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    return manifest
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Build the frontend assets from the command line."""
+    parser = argparse.ArgumentParser(description="Build hashed, precompressed frontend assets")
+    parser.add_argument("--source", default=FRONTEND_DIR, help="Frontend source directory")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help="Build output directory")
+    args = parser.parse_args(argv)
+
+    manifest = build_assets(args.source, args.output)
+    for name, target in manifest.items():
+        print(f"{name} -> {target}", file=sys.stderr)
+    if brotli is None:
+        print("brotli is not installed; only .gz variants were written", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Bulk Pipeline Tool for the AutoGen multi-agent system.
+This tool runs the full code generation pipeline over the requirements in a
+JSONL file, without going through the web server. Items run concurrently,
+results stream to an output JSONL file as they complete, and completed items
+are recorded in a checkpoint file so an interrupted run resumes where it
+stopped. Failed items are not checkpointed and are retried on resume.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from agents.models import CodeGenerationRequest
+from web.api import create_task, process_code_generation, tasks_storage
+
+# Default bulk run parameters
+DEFAULT_CONCURRENCY = 4
+
+# Request fields that may be given per item
+REQUEST_FIELDS = ("language", "complexity", "refine")
+
+
+def read_items(path: str) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+    """
+    Read code generation requests from a JSONL file.
+    Each record has a "requirements" field, or "title" and "body" fields as
+    in a backlog file, plus optional "language", "complexity" and "refine".
+
+    Args:
+        path: Path of the JSONL file
+
+    Yields:
+        (id, request fields) pairs; the id is taken from "id" or
+        "request_id", or is the line number
+    """
+    with open(path, encoding="utf-8") as input_file:
+        for line_number, line in enumerate(input_file, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            requirements = record.get("requirements")
+            if requirements is None:
+                requirements = "\n\n".join(record[key] for key in ("title", "body") if record.get(key))
+            fields = {key: record[key] for key in REQUEST_FIELDS if key in record}
+            fields["requirements"] = requirements
+            yield record.get("id", record.get("request_id", line_number)), fields
+
+
+def _checkpoint_key(item_id: Any) -> str:
+    """Encode an item id for the checkpoint file."""
+    return json.dumps(item_id)
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    """
+    Read the ids of the items completed by earlier runs.
+
+    Args:
+        path: Checkpoint file, one JSON-encoded id per line
+
+    Returns:
+        Set of encoded item ids
+    """
+    try:
+        with open(path, encoding="utf-8") as checkpoint_file:
+            return {line.strip() for line in checkpoint_file if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+async def run_item(item_id: Any, fields: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the code generation pipeline for one item.
+
+    Args:
+        item_id: Identifier of the item
+        fields: Code generation request fields
+
+    Returns:
+        Dictionary with the item id, final status, result, error and elapsed time
+    """
+    start = time.perf_counter()
+    task_id = create_task(f"bulk-{uuid.uuid4()}")
+    try:
+        await process_code_generation(task_id, CodeGenerationRequest(**fields))
+        task = tasks_storage[task_id]
+        return {
+            "id": item_id,
+            "task_id": task_id,
+            "status": task["status"],
+            "result": task["result"],
+            "error": task["error"],
+            "elapsed_s": round(time.perf_counter() - start, 3)
+        }
+    except Exception as e:
+        return {
+            "id": item_id,
+            "task_id": task_id,
+            "status": "failed",
+            "result": None,
+            "error": f"Error running pipeline: {str(e)}",
+            "elapsed_s": round(time.perf_counter() - start, 3)
+        }
+    finally:
+        tasks_storage.pop(task_id, None)
+
+
+async def run_bulk(input_path: str, output_path: str, checkpoint_path: Optional[str] = None,
+                   concurrency: int = DEFAULT_CONCURRENCY, defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Run the pipeline over the items of a JSONL file, resuming from a checkpoint.
+    The input is consumed lazily with at most `concurrency` items in flight.
+    Results are appended to the output file in completion order.
+
+    Args:
+        input_path: JSONL file with the requests
+        output_path: JSONL file the results are appended to
+        checkpoint_path: File recording the completed items (defaults to output_path + ".checkpoint")
+        concurrency: Number of items run at a time
+        defaults: Request fields applied to items that do not set them
+
+    Returns:
+        Dictionary with item counts, elapsed time, throughput, tokens and cost
+    """
+    checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+    done = load_checkpoint(checkpoint_path)
+    stats = {"items": 0, "completed": 0, "failed": 0, "skipped": 0, "total_tokens": 0, "cost_usd": 0.0}
+    semaphore = asyncio.Semaphore(concurrency)
+    pending = set()
+
+    with open(output_path, "a", encoding="utf-8") as output_file, \
+            open(checkpoint_path, "a", encoding="utf-8") as checkpoint_file:
+
+        async def run_and_write(item_id: Any, fields: Dict[str, Any]) -> None:
+            try:
+                result = await run_item(item_id, fields)
+            finally:
+                semaphore.release()
+            output_file.write(json.dumps(result, default=str) + "\n")
+            output_file.flush()
+
+            usage = (result["result"] or {}).get("usage") or {}
+            stats["total_tokens"] += usage.get("total", {}).get("total_tokens", 0)
+            stats["cost_usd"] += usage.get("total", {}).get("cost_usd", 0.0)
+            if result["status"] == "completed":
+                stats["completed"] += 1
+                # Checkpoint only once the result is safely in the output file
+                checkpoint_file.write(_checkpoint_key(item_id) + "\n")
+                checkpoint_file.flush()
+            else:
+                stats["failed"] += 1
+
+        start = time.perf_counter()
+        for item_id, fields in read_items(input_path):
+            stats["items"] += 1
+            if _checkpoint_key(item_id) in done:
+                stats["skipped"] += 1
+                continue
+            await semaphore.acquire()
+            task = asyncio.create_task(run_and_write(item_id, {**(defaults or {}), **fields}))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+        elapsed = time.perf_counter() - start
+
+    processed = stats["completed"] + stats["failed"]
+    stats["cost_usd"] = round(stats["cost_usd"], 6)
+    stats["elapsed_s"] = round(elapsed, 3)
+    stats["items_per_second"] = round(processed / elapsed, 3) if elapsed > 0 else 0.0
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the bulk pipeline from the command line."""
+    parser = argparse.ArgumentParser(description="Run the code generation pipeline over a JSONL file of requirements")
+    parser.add_argument("input", help="JSONL file with 'requirements' (or 'title' and 'body') fields")
+    parser.add_argument("output", help="JSONL file to append the results to")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (defaults to OUTPUT.checkpoint)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Items run at a time")
+    parser.add_argument("--refine", action="store_true", help="Fix the generated code until local checks pass")
+    args = parser.parse_args(argv)
+
+    defaults = {"refine": True} if args.refine else {}
+    stats = asyncio.run(run_bulk(args.input, args.output, checkpoint_path=args.checkpoint,
+                                 concurrency=args.concurrency, defaults=defaults))
+    print(
+        f"Ran {stats['completed'] + stats['failed']} of {stats['items']} items "
+        f"({stats['completed']} completed, {stats['failed']} failed, {stats['skipped']} already done) "
+        f"in {stats['elapsed_s']}s ({stats['items_per_second']} items/s, "
+        f"{stats['total_tokens']} tokens, ${stats['cost_usd']})",
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
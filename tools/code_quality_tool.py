@@ -2,12 +2,63 @@
 Code Quality Tool for the AutoGen multi-agent system.
 This tool checks code quality and PEP8 compliance.
 """
+import asyncio
 import subprocess
-import tempfile
-import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+from utils.code_validator import run_tool_on_code, run_tool_on_code_async
+from utils.result_cache import cached_result
 
+
+def _quality_result(output: str = "", error: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the quality check result from pycodestyle output, or from an error.
+    
+    Args:
+        output: Standard output of pycodestyle
+        error: Error message if the check could not run
+        
+    Returns:
+        Dictionary with quality check results
+    """
+    issues = output.strip().split('\n') if output else []
+    return {
+        "success": error is None,
+        "issues": issues,
+        "pep8_compliance": error is None and len(issues) == 0,
+        "error": error
+    }
+
+
+def _complexity_result(output: str = "", error: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the complexity check result from radon output, or from an error.
+    
+    Args:
+        output: Standard output of radon cc
+        error: Error message if the check could not run
+        
+    Returns:
+        Dictionary with complexity analysis results
+    """
+    return {
+        "success": error is None,
+        "complexity_info": output.strip().split('\n') if output else [],
+        "error": error
+    }
+
+
+def _combine_feedback(quality_result: Dict[str, Any], complexity_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine the quality and complexity results into detailed feedback."""
+    return {
+        "pep8_compliance": quality_result["pep8_compliance"],
+        "issues": quality_result["issues"],
+        "complexity_info": complexity_result["complexity_info"],
+        "overall_quality": "Good" if quality_result["pep8_compliance"] and quality_result["success"] else "Needs improvement"
+    }
+
+
+@cached_result("pycodestyle", versions=("pycodestyle",))
 def check_code_quality(code: str) -> Dict[str, Any]:
     """
     Check code quality using pycodestyle (PEP8 compliance).
@@ -19,50 +70,14 @@ def check_code_quality(code: str) -> Dict[str, Any]:
         Dictionary with quality check results
     """
     try:
-        # Create a temporary file to store the code
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-            temp_file.write(code)
-            temp_file_path = temp_file.name
-        
-        # Run pycodestyle on the temporary file
-        result = subprocess.run(
-            ['pycodestyle', temp_file_path],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        # Clean up the temporary file
-        os.unlink(temp_file_path)
-        
-        # Parse the results
-        issues = []
-        if result.stdout:
-            issues = result.stdout.strip().split('\n')
-        
-        return {
-            "success": True,
-            "issues": issues,
-            "pep8_compliance": len(issues) == 0,
-            "error": None
-        }
-        
+        return _quality_result(run_tool_on_code(['pycodestyle'], code))
     except subprocess.TimeoutExpired:
-        return {
-            "success": False,
-            "issues": [],
-            "pep8_compliance": False,
-            "error": "Code quality check timed out"
-        }
+        return _quality_result(error="Code quality check timed out")
     except Exception as e:
-        return {
-            "success": False,
-            "issues": [],
-            "pep8_compliance": False,
-            "error": f"Error checking code quality: {str(e)}"
-        }
+        return _quality_result(error=f"Error checking code quality: {str(e)}")
 
 
+@cached_result("radon_cc", versions=("radon",))
 def check_code_complexity(code: str) -> Dict[str, Any]:
     """
     Check code complexity using radon.
@@ -74,45 +89,11 @@ def check_code_complexity(code: str) -> Dict[str, Any]:
         Dictionary with complexity analysis results
     """
     try:
-        # Create a temporary file to store the code
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-            temp_file.write(code)
-            temp_file_path = temp_file.name
-        
-        # Run radon cc (cyclomatic complexity) on the temporary file
-        result = subprocess.run(
-            ['radon', 'cc', temp_file_path],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        # Clean up the temporary file
-        os.unlink(temp_file_path)
-        
-        # Parse the results
-        complexity_info = []
-        if result.stdout:
-            complexity_info = result.stdout.strip().split('\n')
-        
-        return {
-            "success": True,
-            "complexity_info": complexity_info,
-            "error": None
-        }
-        
+        return _complexity_result(run_tool_on_code(['radon', 'cc'], code))
     except subprocess.TimeoutExpired:
-        return {
-            "success": False,
-            "complexity_info": [],
-            "error": "Complexity check timed out"
-        }
+        return _complexity_result(error="Complexity check timed out")
     except Exception as e:
-        return {
-            "success": False,
-            "complexity_info": [],
-            "error": f"Error checking code complexity: {str(e)}"
-        }
+        return _complexity_result(error=f"Error checking code complexity: {str(e)}")
 
 
 def get_detailed_feedback(code: str) -> Dict[str, Any]:
@@ -131,15 +112,63 @@ def get_detailed_feedback(code: str) -> Dict[str, Any]:
     # Check code complexity
     complexity_result = check_code_complexity(code)
     
-    # Combine results
-    feedback = {
-        "pep8_compliance": quality_result["pep8_compliance"],
-        "issues": quality_result["issues"],
-        "complexity_info": complexity_result["complexity_info"],
-        "overall_quality": "Good" if quality_result["pep8_compliance"] and quality_result["success"] else "Needs improvement"
-    }
+    return _combine_feedback(quality_result, complexity_result)
+
+
+@cached_result("pycodestyle", versions=("pycodestyle",))
+async def check_code_quality_async(code: str) -> Dict[str, Any]:
+    """
+    Check code quality using pycodestyle without blocking the event loop.
+    
+    Args:
+        code: Python code to check
+        
+    Returns:
+        Dictionary with quality check results
+    """
+    try:
+        return _quality_result(await run_tool_on_code_async(['pycodestyle'], code))
+    except asyncio.TimeoutError:
+        return _quality_result(error="Code quality check timed out")
+    except Exception as e:
+        return _quality_result(error=f"Error checking code quality: {str(e)}")
+
+
+@cached_result("radon_cc", versions=("radon",))
+async def check_code_complexity_async(code: str) -> Dict[str, Any]:
+    """
+    Check code complexity using radon without blocking the event loop.
+    
+    Args:
+        code: Python code to check
+        
+    Returns:
+        Dictionary with complexity analysis results
+    """
+    try:
+        return _complexity_result(await run_tool_on_code_async(['radon', 'cc'], code))
+    except asyncio.TimeoutError:
+        return _complexity_result(error="Complexity check timed out")
+    except Exception as e:
+        return _complexity_result(error=f"Error checking code complexity: {str(e)}")
+
+
+async def get_detailed_feedback_async(code: str) -> Dict[str, Any]:
+    """
+    Get detailed feedback on code quality with both checks running concurrently.
+    
+    Args:
+        code: Python code to analyze
+        
+    Returns:
+        Dictionary with detailed feedback
+    """
+    quality_result, complexity_result = await asyncio.gather(
+        check_code_quality_async(code),
+        check_code_complexity_async(code)
+    )
     
-    return feedback
+    return _combine_feedback(quality_result, complexity_result)
 
 
 # Example usage
@@ -0,0 +1,393 @@
+"""
+Load Testing Tool for the AutoGen multi-agent system.
+This tool starts the web application against the mock LLM server, drives
+/api/v1/generate-code with a concurrent load generator and reports
+throughput, end-to-end and per-stage latency percentiles and server memory
+over time. Reports can be saved as baselines and later runs compared
+against them to catch regressions.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from tools.mock_llm_server import add_server_arguments, server_from_arguments
+
+# Default load parameters
+DEFAULT_REQUESTS = 50
+DEFAULT_CONCURRENCY = 8
+DEFAULT_POLL_INTERVAL = 0.1
+DEFAULT_TASK_TIMEOUT = 300.0
+DEFAULT_MEMORY_INTERVAL = 0.5
+DEFAULT_TOLERANCE = 0.2
+SERVER_START_TIMEOUT = 30.0
+
+DEFAULT_REQUIREMENTS = "Write a function that returns the n-th Fibonacci number."
+
+# Span names reported per stage, besides the pipeline stages themselves
+STAGE_SPANS = ("queue", "serialize_result", "llm.chat_completion", "tool.run", "tool.benchmark", "tool.coverage")
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """
+    Compute a percentile with linear interpolation between closest ranks.
+
+    Args:
+        values: Sample values
+        fraction: Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        The percentile, or None for an empty sample
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize_latencies(values: List[float]) -> Dict[str, Any]:
+    """Summarize latencies in milliseconds as count, mean and p50/p95/p99."""
+    summary = {"count": len(values), "mean": round(sum(values) / len(values), 3) if values else None}
+    for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        value = percentile(values, fraction)
+        summary[name] = round(value, 3) if value is not None else None
+    return summary
+
+
+def summarize_stages(trace_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Summarize span durations per stage from a JSONL trace file.
+
+    Args:
+        trace_path: File written by the JSONL span exporter
+
+    Returns:
+        Latency summary per stage or span name
+    """
+    durations: Dict[str, List[float]] = {}
+    if not os.path.exists(trace_path):
+        return {}
+    with open(trace_path, encoding="utf-8") as trace_file:
+        for line in trace_file:
+            if not line.strip():
+                continue
+            span = json.loads(line)
+            name = span["name"]
+            if name.startswith("stage."):
+                name = name[len("stage."):]
+            elif name not in STAGE_SPANS:
+                continue
+            if span.get("duration_ms") is not None:
+                durations.setdefault(name, []).append(span["duration_ms"])
+    return {name: summarize_latencies(values) for name, values in sorted(durations.items())}
+
+
+def read_rss_mb(pid: int) -> Optional[float]:
+    """Read the resident set size of a process in megabytes (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+class MemorySampler:
+    """Samples the memory of a process at a fixed interval in a background thread."""
+
+    def __init__(self, pid: int, interval: float = DEFAULT_MEMORY_INTERVAL):
+        """
+        Create the sampler.
+
+        Args:
+            pid: Process to sample
+            interval: Seconds between samples
+        """
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[Dict[str, float]] = []
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        while not self._stopped.is_set():
+            rss_mb = read_rss_mb(self.pid)
+            if rss_mb is not None:
+                self.samples.append({"t": round(time.perf_counter() - start, 3), "rss_mb": round(rss_mb, 2)})
+            self._stopped.wait(self.interval)
+
+    def start(self) -> "MemorySampler":
+        """Start sampling."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> List[Dict[str, float]]:
+        """Stop sampling and return the samples."""
+        self._stopped.set()
+        self._thread.join()
+        return self.samples
+
+
+async def run_task(client: httpx.AsyncClient, requirements: str, poll_interval: float,
+                   task_timeout: float) -> Dict[str, Any]:
+    """
+    Submit one code generation task and poll until it finishes.
+
+    Args:
+        client: HTTP client for the API
+        requirements: Requirements of the task
+        poll_interval: Seconds between status polls
+        task_timeout: Seconds after which the task counts as timed out
+
+    Returns:
+        Dictionary with the final status and the submit and end-to-end latencies
+    """
+    start = time.perf_counter()
+    try:
+        response = await client.post("/api/v1/generate-code", json={"requirements": requirements})
+        response.raise_for_status()
+        task_id = response.json()["task_id"]
+        submit_ms = (time.perf_counter() - start) * 1000
+
+        while time.perf_counter() - start < task_timeout:
+            await asyncio.sleep(poll_interval)
+            status = (await client.get(f"/api/v1/code-status/{task_id}")).json()["status"]
+            if status in ("completed", "failed"):
+                return {"status": status, "submit_ms": submit_ms, "latency_ms": (time.perf_counter() - start) * 1000}
+        return {"status": "timeout", "submit_ms": submit_ms, "latency_ms": None}
+    except httpx.HTTPError as e:
+        return {"status": "error", "error": str(e), "submit_ms": None, "latency_ms": None}
+
+
+async def generate_load(base_url: str, requests: int, concurrency: int, requirements: str = DEFAULT_REQUIREMENTS,
+                        poll_interval: float = DEFAULT_POLL_INTERVAL,
+                        task_timeout: float = DEFAULT_TASK_TIMEOUT) -> Dict[str, Any]:
+    """
+    Run code generation tasks against the API with a fixed number of concurrent clients.
+
+    Args:
+        base_url: Base URL of the web application
+        requests: Total number of tasks
+        concurrency: Number of tasks in flight at a time
+        requirements: Requirements of every task
+        poll_interval: Seconds between status polls
+        task_timeout: Seconds after which a task counts as timed out
+
+    Returns:
+        Dictionary with task counts, throughput and latency summaries
+    """
+    results: List[Dict[str, Any]] = []
+    remaining = iter(range(requests))
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        for _ in remaining:
+            results.append(await run_task(client, requirements, poll_interval, task_timeout))
+
+    limits = httpx.Limits(max_connections=concurrency * 2)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=task_timeout) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    statuses: Dict[str, int] = {}
+    for result in results:
+        statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+    completed = statuses.get("completed", 0)
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "statuses": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_second": round(completed / elapsed, 3) if elapsed > 0 else 0.0,
+        "submit_ms": summarize_latencies([r["submit_ms"] for r in results if r["submit_ms"] is not None]),
+        "latency_ms": summarize_latencies([r["latency_ms"] for r in results if r["status"] == "completed"])
+    }
+
+
+def _free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_app(llm_base_url: str, trace_path: str, port: int, env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    """
+    Start the web application in a subprocess and wait until it is healthy.
+
+    Args:
+        llm_base_url: Value of LLM_BASE_URL for the application
+        trace_path: JSONL file the application's spans are written to
+        port: Port the application listens on
+        env: Extra environment variables
+
+    Returns:
+        The application process
+    """
+    app_env = dict(os.environ)
+    app_env.update({
+        "LLM_PROVIDER": "openai",
+        "LLM_BASE_URL": llm_base_url,
+        "LLM_API_KEY": "mock",
+        "TRACING_ENABLED": "true",
+        "TRACING_SAMPLE_RATE": "1.0",
+        "TRACING_JSONL_PATH": trace_path
+    })
+    app_env.update(env or {})
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "web.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        env=app_env
+    )
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Application exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Application did not become healthy in time")
+
+
+def stop_app(process: subprocess.Popen, timeout: float = 15.0) -> None:
+    """Stop the application gracefully, so that it exports its remaining spans."""
+    process.send_signal(signal.SIGINT)
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                        tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Compare a report against a baseline report.
+
+    Args:
+        report: Report of the current run
+        baseline: Report of the baseline run
+        tolerance: Allowed relative throughput drop or latency increase
+
+    Returns:
+        Descriptions of the regressions found, empty if there are none
+    """
+    regressions = []
+    baseline_rps = baseline.get("requests_per_second") or 0.0
+    if baseline_rps and report["requests_per_second"] < baseline_rps * (1 - tolerance):
+        regressions.append(f"requests_per_second {report['requests_per_second']} < baseline {baseline_rps}")
+
+    def check(name: str, current: Dict[str, Any], previous: Dict[str, Any]) -> None:
+        for key in ("p95", "p99"):
+            if current.get(key) is None or not previous.get(key):
+                continue
+            if current[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{name} {key} {current[key]}ms > baseline {previous[key]}ms")
+
+    check("latency", report["latency_ms"], baseline.get("latency_ms", {}))
+    for stage, summary in report.get("stages", {}).items():
+        check(f"stage {stage}", summary, baseline.get("stages", {}).get(stage, {}))
+
+    peak, baseline_peak = report.get("peak_rss_mb"), baseline.get("peak_rss_mb")
+    if peak and baseline_peak and peak > baseline_peak * (1 + tolerance):
+        regressions.append(f"peak_rss_mb {peak} > baseline {baseline_peak}")
+    return regressions
+
+
+def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    """Start the mock server and the application, generate load and build the report."""
+    with server_from_arguments(args) as mock_server, tempfile.TemporaryDirectory() as temp_dir:
+        trace_path = os.path.join(temp_dir, "spans.jsonl")
+        port = _free_port()
+        process = start_app(mock_server.base_url, trace_path, port)
+        sampler = MemorySampler(process.pid, args.memory_interval).start()
+        try:
+            report = asyncio.run(generate_load(
+                f"http://127.0.0.1:{port}",
+                args.requests,
+                args.concurrency,
+                requirements=args.requirements,
+                poll_interval=args.poll_interval,
+                task_timeout=args.task_timeout
+            ))
+        finally:
+            memory = sampler.stop()
+            stop_app(process)
+
+        report["stages"] = summarize_stages(trace_path)
+        report["memory"] = memory
+        report["peak_rss_mb"] = max((sample["rss_mb"] for sample in memory), default=None)
+        report["mock_server"] = dict(mock_server.stats)
+        return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description="Load test the code generation API against a mock LLM server")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="Total number of tasks")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Tasks in flight at a time")
+    parser.add_argument("--requirements", default=DEFAULT_REQUIREMENTS, help="Requirements of every task")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL, help="Seconds between polls")
+    parser.add_argument("--task-timeout", type=float, default=DEFAULT_TASK_TIMEOUT, help="Seconds per task")
+    parser.add_argument("--memory-interval", type=float, default=DEFAULT_MEMORY_INTERVAL,
+                        help="Seconds between memory samples")
+    parser.add_argument("--output", default=None, help="File to write the JSON report to")
+    parser.add_argument("--baseline", default=None, help="Baseline report to compare against")
+    parser.add_argument("--save-baseline", default=None, help="File to save this report to as a baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative regression against the baseline")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    report = run_load_test(args)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            report["regressions"] = compare_to_baseline(report, json.load(baseline_file), args.tolerance)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump({key: value for key, value in report.items() if key != "regressions"}, baseline_file, indent=2)
+
+    latency = report["latency_ms"]
+    print(
+        f"{report['statuses'].get('completed', 0)}/{report['requests']} tasks completed in {report['elapsed_s']}s "
+        f"({report['requests_per_second']} req/s, p50 {latency['p50']}ms, p95 {latency['p95']}ms, "
+        f"p99 {latency['p99']}ms, peak RSS {report['peak_rss_mb']}MB)",
+        file=sys.stderr
+    )
+    for regression in report.get("regressions", []):
+        print(f"Regression: {regression}", file=sys.stderr)
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Mock LLM Server for the AutoGen multi-agent system.
+This tool serves an OpenAI-compatible chat completions endpoint with
+configurable latency, error rates and streaming, so the pipeline can be
+load tested without paying for real model calls. Point LLM_BASE_URL at
+http://HOST:PORT/v1 to use it.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+# Default response content: valid Python, so the local checks have real work to do
+DEFAULT_CONTENT = '''def fibonacci(n):
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+'''
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+DEFAULT_STREAM_CHUNKS = 16
+
+
+class LatencyModel:
+    """Draws response latencies from a configurable distribution."""
+
+    def __init__(self, distribution: str = "constant", mean_ms: float = 0.0, spread: float = 0.5,
+                 seed: Optional[int] = None):
+        """
+        Create the latency model.
+
+        Args:
+            distribution: One of constant, uniform, exponential or lognormal
+            mean_ms: Mean latency in milliseconds
+            spread: Relative spread; the half-width for uniform, sigma for lognormal
+            seed: Random seed for reproducible runs
+        """
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.distribution = distribution
+        self.mean_ms = mean_ms
+        self.spread = spread
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        """Draw a latency in seconds."""
+        if self.mean_ms <= 0:
+            return 0.0
+        with self._lock:
+            if self.distribution == "constant":
+                latency_ms = self.mean_ms
+            elif self.distribution == "uniform":
+                latency_ms = self._random.uniform(self.mean_ms * (1 - self.spread), self.mean_ms * (1 + self.spread))
+            elif self.distribution == "exponential":
+                latency_ms = self._random.expovariate(1 / self.mean_ms)
+            else:
+                # Parameterized so that the mean, not the median, is mean_ms
+                mu = math.log(self.mean_ms) - self.spread ** 2 / 2
+                latency_ms = self._random.lognormvariate(mu, self.spread)
+        return max(latency_ms, 0.0) / 1000
+
+
+def _count_tokens(text: str) -> int:
+    """Approximate the token count of a text."""
+    return max(1, len(text) // 4)
+
+
+def _prompt_text(messages: List[Dict[str, Any]]) -> str:
+    """Concatenate the text content of the request messages."""
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(part.get("text", "") for part in content if isinstance(part, dict))
+    return "\n".join(parts)
+
+
+class MockLLMServer:
+    """OpenAI-compatible chat completions server running in a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: Optional[LatencyModel] = None,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, content: str = DEFAULT_CONTENT,
+                 stream_chunks: int = DEFAULT_STREAM_CHUNKS, seed: Optional[int] = None):
+        """
+        Create the server.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            latency: Latency model for complete responses
+            error_rate: Fraction of requests answered with HTTP 500
+            rate_limit_rate: Fraction of requests answered with HTTP 429
+            content: Assistant message content of every response
+            stream_chunks: Number of content chunks of streamed responses
+            seed: Random seed for the error decisions
+        """
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.content = content
+        self.stream_chunks = max(1, stream_chunks)
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "streamed": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to use as LLM_BASE_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockLLMServer":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-llm-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _outcome(self) -> str:
+        """Decide whether a request succeeds, fails or is rate limited."""
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._random.random()
+            if roll < self.error_rate:
+                self.stats["errors"] += 1
+                return "error"
+            if roll < self.error_rate + self.rate_limit_rate:
+                self.stats["rate_limited"] += 1
+                return "rate_limited"
+            return "ok"
+
+    def _completion(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a chat completion response."""
+        prompt_tokens = _count_tokens(_prompt_text(request.get("messages", [])))
+        completion_tokens = _count_tokens(self.content)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": self.content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    def _stream_chunks(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build the chunks of a streamed chat completion."""
+        completion = self._completion(request)
+        base = {key: completion[key] for key in ("id", "created", "model")}
+        base["object"] = "chat.completion.chunk"
+
+        size = math.ceil(len(self.content) / self.stream_chunks) or 1
+        pieces = [self.content[i:i + size] for i in range(0, len(self.content), size)] or [""]
+        chunks = [dict(base, choices=[{"index": 0, "delta": {"role": "assistant", "content": ""},
+                                       "finish_reason": None}])]
+        chunks.extend(dict(base, choices=[{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+                      for piece in pieces)
+        chunks.append(dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+        if (request.get("stream_options") or {}).get("include_usage"):
+            chunks.append(dict(base, choices=[], usage=completion["usage"]))
+        return chunks
+
+    def _handler_class(self):
+        """Build the request handler bound to this server."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+                else:
+                    self._send_json(404, {"error": {"message": "Not found"}})
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "Not found"}})
+                    return
+                request = json.loads(body or b"{}")
+
+                latency = server.latency.sample()
+                outcome = server._outcome()
+                if outcome == "error":
+                    time.sleep(latency)
+                    self._send_json(500, {"error": {"message": "Mock server error", "type": "server_error"}})
+                elif outcome == "rate_limited":
+                    self._send_json(429, {"error": {"message": "Mock rate limit", "type": "rate_limit_error"}})
+                elif request.get("stream"):
+                    self._stream(request, latency)
+                else:
+                    time.sleep(latency)
+                    self._send_json(200, server._completion(request))
+
+            def _stream(self, request: Dict[str, Any], latency: float) -> None:
+                with server._lock:
+                    server.stats["streamed"] += 1
+                chunks = server._stream_chunks(request)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                # The latency is spread over the chunks, like tokens arriving
+                delay = latency / len(chunks)
+                for chunk in chunks:
+                    time.sleep(delay)
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+                self.close_connection = True
+
+        return Handler
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the mock server options to a command line parser."""
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Mean model call latency")
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal",
+                        help="Model call latency distribution")
+    parser.add_argument("--latency-spread", type=float, default=0.5, help="Relative latency spread")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of HTTP 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of HTTP 429 responses")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+
+
+def server_from_arguments(args: argparse.Namespace, host: str = "127.0.0.1", port: int = 0) -> MockLLMServer:
+    """Create a mock server from parsed command line options."""
+    latency = LatencyModel(args.latency_distribution, args.latency_ms, args.latency_spread, seed=args.seed)
+    return MockLLMServer(host, port, latency=latency, error_rate=args.error_rate,
+                         rate_limit_rate=args.rate_limit_rate, seed=args.seed)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the mock server from the command line."""
+    parser = argparse.ArgumentParser(description="Serve a mock OpenAI-compatible chat completions endpoint")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8100, help="Port to listen on")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = server_from_arguments(args, args.host, args.port).start()
+    print(f"Mock LLM server listening; set LLM_BASE_URL={server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
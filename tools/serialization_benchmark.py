@@ -0,0 +1,114 @@
+"""
+Serialization Benchmark Tool for the AutoGen multi-agent system.
+This tool compares the ways a large code-status response can be serialized:
+validating a TaskStatusResponse model and encoding it through FastAPI's
+default JSON path, serializing the plain dictionary with the fast path, and
+serving cached bytes for an unchanged task version.
+"""
+import argparse
+import json
+import sys
+import timeit
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from web.api import TaskStatusResponse
+from web.payloads import normalize_result
+from web.serialization import SerializedCache, dumps, orjson
+
+DEFAULT_PAYLOAD_KB = 100
+DEFAULT_NUMBER = 200
+
+
+def make_status(payload_kb: int = DEFAULT_PAYLOAD_KB) -> Dict[str, Any]:
+    """
+    Build a code-status body whose result is about payload_kb kilobytes of JSON.
+
+    Args:
+        payload_kb: Approximate result size in kilobytes
+
+    Returns:
+        Status dictionary as stored for a completed task
+    """
+    function = "def function_{i}(values):\n    return [value * {i} for value in values if value % 2]\n\n\n"
+    code = ""
+    i = 0
+    while len(code) < payload_kb * 1024 // 2:
+        code += function.format(i=i)
+        i += 1
+    tests = code.replace("def function_", "def test_function_")
+    now = datetime.now()
+    result = normalize_result({
+        "specification": {"original_requirements": "Generate many functions", "language": "python"},
+        "generated_code": code,
+        "review_result": {"code": code, "issues": [f"Issue {n}" for n in range(50)], "suggestions": [],
+                          "pep8_compliance": True, "review_comments": []},
+        "optimization_result": {"original_code": code, "optimized_code": code, "improvements": [],
+                                "performance_gain": 0.0, "accepted": True, "benchmark": None},
+        "test_result": {"source_code": code, "test_code": tests, "test_cases": [], "coverage_percentage": 0.0},
+        "refinement_result": None,
+        "usage": {"total": {"total_tokens": 12345, "cost_usd": 0.1}},
+        "skipped_stages": []
+    })
+    return {"task_id": "benchmark-task", "status": "completed", "result": result, "error": None,
+            "created_at": now, "updated_at": now, "version": 3}
+
+
+def run_benchmark(payload_kb: int = DEFAULT_PAYLOAD_KB, number: int = DEFAULT_NUMBER) -> Dict[str, Any]:
+    """
+    Time each serialization path.
+
+    Args:
+        payload_kb: Approximate result size in kilobytes
+        number: Serializations timed per path
+
+    Returns:
+        Dictionary with the body size and microseconds per serialization for each path
+    """
+    status = make_status(payload_kb)
+    cache = SerializedCache()
+    cache_key = (status["task_id"], status["version"], None, True)
+    cache.put(cache_key, dumps(status))
+
+    paths = {
+        "pydantic_default": lambda: JSONResponse(jsonable_encoder(TaskStatusResponse(**status))).body,
+        "fast_dumps": lambda: dumps(status),
+        "cached": lambda: cache.get(cache_key)
+    }
+    timings = {}
+    for name, serialize in paths.items():
+        serialize()
+        timings[name] = round(timeit.timeit(serialize, number=number) / number * 1e6, 2)
+
+    return {
+        "body_bytes": len(dumps(status)),
+        "orjson": orjson is not None,
+        "microseconds_per_serialization": timings,
+        "speedup_fast_dumps": round(timings["pydantic_default"] / timings["fast_dumps"], 2),
+        "speedup_cached": round(timings["pydantic_default"] / max(timings["cached"], 0.01), 2)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the serialization benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark code-status response serialization")
+    parser.add_argument("--payload-kb", type=int, default=DEFAULT_PAYLOAD_KB, help="Approximate result size")
+    parser.add_argument("--number", type=int, default=DEFAULT_NUMBER, help="Serializations per path")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.payload_kb, args.number)
+    print(json.dumps(report, indent=2))
+    timings = report["microseconds_per_serialization"]
+    print(
+        f"{report['body_bytes']} byte body: default {timings['pydantic_default']}us, "
+        f"fast {timings['fast_dumps']}us ({report['speedup_fast_dumps']}x), "
+        f"cached {timings['cached']}us ({report['speedup_cached']}x)",
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""
+Micro-benchmark harness for the AutoGen multi-agent system.
+This module times original and optimized code in the execution sandbox and
+compares the measurements statistically.
+"""
+import ast
+import random
+import statistics
+from typing import Any, Dict, List, Optional
+
+from utils.code_validator import extract_code_block
+from utils.sandbox import SandboxPool, get_default_pool
+
+# Default benchmark parameters
+DEFAULT_REPEATS = 15
+DEFAULT_WARMUP = 3
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_MEMORY_LIMIT_MB = 512
+BOOTSTRAP_SAMPLES = 1000
+
+# Parameter names used to guess representative inputs
+_TEXT_NAMES = {"s", "text", "string", "word", "words", "sentence", "name", "pattern", "line"}
+_SEQUENCE_NAMES = {
+    "items", "arr", "array", "nums", "numbers", "data", "values", "lst",
+    "list", "seq", "sequence", "elements", "iterable"
+}
+
+# Input sizes used when synthesizing arguments (small and medium)
+_SIZE_PROFILES = ({"int": 5, "seq": 10}, {"int": 15, "seq": 200})
+
+# Job executed inside the sandbox for each code version.
+# It reads the `payload` global and reports through the `result` global.
+_BENCHMARK_RUNNER = r'''
+import copy
+import gc
+import time
+import tracemalloc
+import types
+
+
+def call(func, args):
+    value = func(*args)
+    if isinstance(value, types.GeneratorType):
+        value = list(value)
+    return value
+
+
+def describe(func, args):
+    try:
+        return repr(call(func, copy.deepcopy(args)))
+    except BaseException as exc:
+        return "!" + type(exc).__name__
+
+
+def time_batch(func, args, number):
+    batch = [copy.deepcopy(args) for _ in range(number)]
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for call_args in batch:
+            call(func, call_args)
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+namespace = {"__name__": "__benchmark__"}
+try:
+    exec(compile(payload["code"], "<benchmark>", "exec"), namespace)
+except BaseException as exc:
+    result = {"ok": False, "error": "%s: %s" % (type(exc).__name__, exc)}
+else:
+    result = {"ok": True, "entries": {}}
+    for entry in payload["entries"]:
+        func = namespace.get(entry["name"])
+        if not callable(func):
+            result["entries"][entry["name"]] = {"error": "not callable"}
+            continue
+        outputs = []
+        samples = [0.0] * payload["repeats"]
+        peak_memory = 0
+        for args in entry["inputs"]:
+            output = describe(func, args)
+            outputs.append(output)
+            if output.startswith("!"):
+                continue
+            for _ in range(payload["warmup"]):
+                call(func, copy.deepcopy(args))
+            number = 1
+            while number < 1000 and time_batch(func, args, number) < payload["min_sample_time"]:
+                number *= 10
+            for index in range(payload["repeats"]):
+                samples[index] += time_batch(func, args, number) / number
+            tracemalloc.start()
+            call(func, copy.deepcopy(args))
+            peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        result["entries"][entry["name"]] = {
+            "outputs": outputs,
+            "samples": samples,
+            "peak_memory": peak_memory
+        }
+'''
+
+
+def extract_entry_points(code: str) -> List[str]:
+    """
+    Extract the public top-level functions that can be benchmarked.
+
+    Args:
+        code: Python code to analyze
+
+    Returns:
+        List of function names in definition order
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return []
+
+    entry_points = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and not node.name.startswith("_") and node.name != "main":
+            if node.name not in entry_points:
+                entry_points.append(node.name)
+    return entry_points
+
+
+def _guess_value(arg: ast.arg, profile: Dict[str, int]) -> Any:
+    """
+    Guess a representative value for a function parameter.
+
+    Args:
+        arg: Parameter node
+        profile: Input size profile
+
+    Returns:
+        JSON-serializable argument value
+    """
+    annotation = ast.unparse(arg.annotation).lower() if arg.annotation else ""
+    name = arg.arg.lower()
+
+    if "str" in annotation or (not annotation and name in _TEXT_NAMES):
+        return "benchmark " * profile["seq"]
+    if "float" in annotation:
+        return profile["int"] + 0.5
+    if "bool" in annotation:
+        return True
+    if "dict" in annotation or "mapping" in annotation:
+        return {str(i): i for i in range(profile["seq"])}
+    if any(kind in annotation for kind in ("list", "sequence", "iterable", "tuple", "set")):
+        return list(range(profile["seq"], 0, -1))
+    if not annotation and name in _SEQUENCE_NAMES:
+        return list(range(profile["seq"], 0, -1))
+    return profile["int"]
+
+
+def synthesize_inputs(code: str, function_name: str) -> List[List[Any]]:
+    """
+    Synthesize representative argument lists for a function.
+    Values are guessed from parameter annotations and names; parameters with
+    defaults are left to their defaults.
+
+    Args:
+        code: Python code that defines the function
+        function_name: Name of the function
+
+    Returns:
+        List of positional argument lists, one per input size
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return []
+
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == function_name:
+            params = node.args.posonlyargs + node.args.args
+            required = params[:len(params) - len(node.args.defaults)]
+            return [[_guess_value(arg, profile) for arg in required] for profile in _SIZE_PROFILES]
+    return []
+
+
+def _run_isolated(code: str, entries: List[Dict[str, Any]], repeats: int, warmup: int,
+                  timeout: float, memory_limit_mb: int, pool: Optional[SandboxPool]) -> Dict[str, Any]:
+    """
+    Run the benchmark runner for one code version in the sandbox.
+
+    Args:
+        code: Python code to benchmark
+        entries: Entry points with their inputs
+        repeats: Number of timed samples
+        warmup: Number of warmup calls per input
+        timeout: Wall-clock timeout in seconds
+        memory_limit_mb: Memory limit in megabytes
+        pool: Sandbox pool to run in, or None for the default pool
+
+    Returns:
+        Dictionary with the runner output
+    """
+    payload = {
+        "code": code,
+        "entries": entries,
+        "repeats": repeats,
+        "warmup": warmup,
+        "min_sample_time": 0.002
+    }
+
+    job = (pool or get_default_pool()).run(
+        _BENCHMARK_RUNNER,
+        payload=payload,
+        timeout=timeout,
+        cpu_seconds=int(timeout) + 1,
+        memory_limit_mb=memory_limit_mb
+    )
+
+    if not job["success"]:
+        return {"ok": False, "error": job["error"]}
+    return job["result"]
+
+
+def _bootstrap_speedup_interval(original: List[float], optimized: List[float],
+                                confidence: float = 0.95) -> List[float]:
+    """
+    Compute a bootstrap confidence interval for the ratio of medians.
+
+    Args:
+        original: Timing samples of the original code
+        optimized: Timing samples of the optimized code
+        confidence: Confidence level
+
+    Returns:
+        Lower and upper bound of the speedup interval
+    """
+    rng = random.Random(0)
+    ratios = []
+    for _ in range(BOOTSTRAP_SAMPLES):
+        original_median = statistics.median(rng.choices(original, k=len(original)))
+        optimized_median = statistics.median(rng.choices(optimized, k=len(optimized)))
+        if optimized_median > 0:
+            ratios.append(original_median / optimized_median)
+
+    if not ratios:
+        return [0.0, 0.0]
+
+    ratios.sort()
+    tail = (1 - confidence) / 2
+    lower = ratios[int(tail * (len(ratios) - 1))]
+    upper = ratios[int((1 - tail) * (len(ratios) - 1))]
+    return [round(lower, 4), round(upper, 4)]
+
+
+def _skipped(reason: str, entry_points: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Build a result for a benchmark that could not be measured."""
+    return {
+        "status": "skipped",
+        "accepted": True,
+        "reason": reason,
+        "entry_points": entry_points or [],
+        "performance_gain": 0.0
+    }
+
+
+def _rejected(reason: str, entry_points: List[str]) -> Dict[str, Any]:
+    """Build a result for optimized code that must not be used."""
+    return {
+        "status": "rejected",
+        "accepted": False,
+        "reason": reason,
+        "entry_points": entry_points,
+        "performance_gain": 0.0
+    }
+
+
+def benchmark_code(original_code: str, optimized_code: str,
+                   inputs: Optional[Dict[str, List[List[Any]]]] = None,
+                   repeats: int = DEFAULT_REPEATS, warmup: int = DEFAULT_WARMUP,
+                   timeout: float = DEFAULT_TIMEOUT,
+                   memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB,
+                   pool: Optional[SandboxPool] = None) -> Dict[str, Any]:
+    """
+    Benchmark original code against its optimized version.
+    Both versions run in separate sandboxed processes with warmup and
+    repeated timing. The optimized version is rejected if it changes outputs
+    or is significantly slower (the whole speedup interval is below 1).
+
+    Args:
+        original_code: Original code
+        optimized_code: Optimized code, optionally wrapped in an agent response
+        inputs: Optional argument lists per entry point; synthesized if omitted
+        repeats: Number of timed samples per version
+        warmup: Number of warmup calls per input
+        timeout: Wall-clock timeout per version in seconds
+        memory_limit_mb: Memory limit per version in megabytes
+        pool: Sandbox pool to run in, or None for the default pool
+
+    Returns:
+        Dictionary with benchmark results
+    """
+    optimized_code = extract_code_block(optimized_code)
+
+    # Find entry points present in both versions
+    original_entries = extract_entry_points(original_code)
+    optimized_entries = set(extract_entry_points(optimized_code))
+    entry_points = [name for name in original_entries if name in optimized_entries]
+    if inputs is not None:
+        entry_points = [name for name in entry_points if name in inputs]
+
+    if not entry_points:
+        return _skipped("No common entry points to benchmark")
+
+    # Prepare inputs shared by both versions
+    entries = []
+    for name in entry_points:
+        entry_inputs = inputs[name] if inputs is not None else synthesize_inputs(original_code, name)
+        entries.append({"name": name, "inputs": entry_inputs})
+
+    original_run = _run_isolated(original_code, entries, repeats, warmup, timeout, memory_limit_mb, pool)
+    if not original_run.get("ok"):
+        return _skipped(f"Original code could not be benchmarked: {original_run.get('error')}", entry_points)
+
+    optimized_run = _run_isolated(optimized_code, entries, repeats, warmup, timeout, memory_limit_mb, pool)
+    if not optimized_run.get("ok"):
+        return _rejected(f"Optimized code failed to run: {optimized_run.get('error')}", entry_points)
+
+    # Compare outputs and aggregate samples
+    original_samples = [0.0] * repeats
+    optimized_samples = [0.0] * repeats
+    memory_delta = 0
+    for name in entry_points:
+        original_entry = original_run["entries"][name]
+        optimized_entry = optimized_run["entries"].get(name, {})
+        if "error" in original_entry:
+            continue
+        if optimized_entry.get("outputs") != original_entry["outputs"]:
+            return _rejected(f"Optimized code changes the output of {name}()", entry_points)
+        original_samples = [a + b for a, b in zip(original_samples, original_entry["samples"])]
+        optimized_samples = [a + b for a, b in zip(optimized_samples, optimized_entry["samples"])]
+        memory_delta += optimized_entry["peak_memory"] - original_entry["peak_memory"]
+
+    original_median = statistics.median(original_samples)
+    optimized_median = statistics.median(optimized_samples)
+    if original_median <= 0 or optimized_median <= 0:
+        return _skipped("Entry points could not be timed with the available inputs", entry_points)
+
+    speedup = original_median / optimized_median
+    speedup_ci = _bootstrap_speedup_interval(original_samples, optimized_samples)
+
+    result = {
+        "status": "measured",
+        "accepted": True,
+        "reason": None,
+        "entry_points": entry_points,
+        "repeats": repeats,
+        "original_median_s": original_median,
+        "optimized_median_s": optimized_median,
+        "speedup": round(speedup, 4),
+        "speedup_ci": speedup_ci,
+        "performance_gain": round((speedup - 1) * 100, 2),
+        "memory_delta_kb": round(memory_delta / 1024, 2)
+    }
+
+    if speedup_ci[1] < 1.0:
+        result["status"] = "rejected"
+        result["accepted"] = False
+        result["reason"] = f"Optimized code is slower (speedup {speedup:.2f}x)"
+
+    return result
+
+
+# Example usage
+if __name__ == "__main__":
+    original = """
+def fibonacci(n):
+    if n <= 1:
+        return n
+    return fibonacci(n - 1) + fibonacci(n - 2)
+"""
+    optimized = """
+def fibonacci(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+"""
+
+    benchmark_result = benchmark_code(original, optimized)
+    print(f"Benchmark result: {benchmark_result}")
\ No newline at end of file
@@ -3,10 +3,42 @@ Code Validator utilities for the AutoGen multi-agent system.
 This module provides tools for validating Python code syntax and structure.
 """
 import ast
+import asyncio
+import re
 import subprocess
 import tempfile
 import os
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from utils.lint_daemon import get_lint_client, lint_daemon_enabled
+from utils.result_cache import cached_result
+from utils.tracing import trace_span
+
+# Tool command lines served by the lint daemon
+DAEMON_TOOLS = {
+    "pycodestyle": "pycodestyle",
+    "pyflakes": "pyflakes",
+    "radon cc": "radon_cc"
+}
+
+
+def extract_code_block(text: str) -> str:
+    """
+    Extract Python code from an LLM response.
+    Agent responses often wrap the code in markdown fences and surround it with
+    explanations; the longest fenced block is taken as the code.
+    
+    Args:
+        text: Raw agent response
+        
+    Returns:
+        The extracted code, or the original text if it has no code fences
+    """
+    blocks = re.findall(r"```(?:python|py)?[ \t]*\n(.*?)```", text, re.DOTALL)
+    if not blocks:
+        return text
+    return max(blocks, key=len)
 
 
 def validate_python_syntax(code: str) -> Dict[str, Any]:
@@ -80,62 +112,137 @@ def check_imports(code: str) -> Dict[str, Any]:
         }
 
 
-def run_pyflakes_check(code: str) -> Dict[str, Any]:
+def _daemon_tool(command: List[str]) -> Optional[str]:
     """
-    Run pyflakes check on the code.
+    Map a tool command line to the lint daemon tool serving it.
     
     Args:
-        code: Python code to check
+        command: Tool command line without the file argument
         
     Returns:
-        Dictionary with pyflakes results
+        Daemon tool name, or None if the daemon is disabled or lacks the tool
     """
-    try:
-        # Create a temporary file to store the code
+    if not lint_daemon_enabled():
+        return None
+    return DAEMON_TOOLS.get(" ".join(command))
+
+
+def run_tool_on_code(command: List[str], code: str, timeout: float = 30) -> str:
+    """
+    Run an analysis tool on code.
+    When the lint daemon is enabled the already-warm daemon serves the request;
+    otherwise the code is written to a temporary file whose path is appended to
+    the command and the tool runs as a subprocess.
+    
+    Args:
+        command: Tool command line without the file argument
+        code: Python code to analyze
+        timeout: Timeout in seconds
+        
+    Returns:
+        Standard output of the tool
+        
+    Raises:
+        subprocess.TimeoutExpired: If the tool does not finish in time
+        FileNotFoundError: If the tool is not installed
+    """
+    tool = _daemon_tool(command)
+    with trace_span("tool.run", tool=" ".join(command), daemon=bool(tool), code_bytes=len(code)):
+        if tool:
+            try:
+                return get_lint_client().analyze(tool, code, timeout=timeout)
+            except TimeoutError:
+                raise subprocess.TimeoutExpired(command, timeout)
+        
         with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
             temp_file.write(code)
             temp_file_path = temp_file.name
         
-        # Run pyflakes on the temporary file
-        result = subprocess.run(
-            ['pyflakes', temp_file_path],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        # Clean up the temporary file
-        os.unlink(temp_file_path)
-        
-        # Parse the results
-        issues = []
-        if result.stdout:
-            issues = result.stdout.strip().split('\n')
+        try:
+            result = subprocess.run(
+                [*command, temp_file_path],
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+            return result.stdout
+        finally:
+            os.unlink(temp_file_path)
+
+
+def _pyflakes_result(output: str = "", error: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the pyflakes check result from the tool output, or from an error.
+    
+    Args:
+        output: Standard output of pyflakes
+        error: Error message if the check could not run
         
-        return {
-            "success": True,
-            "issues": issues,
-            "error": None
-        }
+    Returns:
+        Dictionary with pyflakes results
+    """
+    return {
+        "success": error is None,
+        "issues": output.strip().split('\n') if output else [],
+        "error": error
+    }
+
+
+@cached_result("pyflakes", versions=("pyflakes",))
+def run_pyflakes_check(code: str) -> Dict[str, Any]:
+    """
+    Run pyflakes check on the code.
+    
+    Args:
+        code: Python code to check
         
+    Returns:
+        Dictionary with pyflakes results
+    """
+    try:
+        return _pyflakes_result(run_tool_on_code(['pyflakes'], code))
     except subprocess.TimeoutExpired:
-        return {
-            "success": False,
-            "issues": [],
-            "error": "Pyflakes check timed out"
-        }
+        return _pyflakes_result(error="Pyflakes check timed out")
     except FileNotFoundError:
-        return {
-            "success": False,
-            "issues": [],
-            "error": "Pyflakes not installed"
-        }
+        return _pyflakes_result(error="Pyflakes not installed")
     except Exception as e:
-        return {
-            "success": False,
-            "issues": [],
-            "error": f"Error running pyflakes: {str(e)}"
-        }
+        return _pyflakes_result(error=f"Error running pyflakes: {str(e)}")
+
+
+def _validation_result(syntax_result: Dict[str, Any], imports_result: Dict[str, Any],
+                       pyflakes_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine the individual checks into the comprehensive validation result.
+    
+    Args:
+        syntax_result: Syntax validation result
+        imports_result: Import check result
+        pyflakes_result: Pyflakes check result
+        
+    Returns:
+        Dictionary with comprehensive validation results
+    """
+    return {
+        "syntax": syntax_result,
+        "imports": imports_result,
+        "pyflakes": pyflakes_result,
+        "overall_valid": syntax_result["valid"] and pyflakes_result["success"]
+    }
+
+
+def _with_timestamp(validation_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Stamp a (possibly cached) validation result with the current time."""
+    return dict(validation_result, timestamp=datetime.now().isoformat())
+
+
+@cached_result(
+    "comprehensive_validation",
+    versions=("pyflakes",),
+    should_cache=lambda result: result["pyflakes"]["success"]
+)
+def _validate_code(code: str) -> Dict[str, Any]:
+    """Run the validation checks one after another."""
+    return _validation_result(validate_python_syntax(code), check_imports(code), run_pyflakes_check(code))
 
 
 def comprehensive_code_validation(code: str) -> Dict[str, Any]:
@@ -148,25 +255,102 @@ def comprehensive_code_validation(code: str) -> Dict[str, Any]:
     Returns:
         Dictionary with comprehensive validation results
     """
-    # Validate syntax
-    syntax_result = validate_python_syntax(code)
-    
-    # Check imports
-    imports_result = check_imports(code)
+    return _with_timestamp(_validate_code(code))
+
+
+async def run_tool_on_code_async(command: List[str], code: str, timeout: float = 30) -> str:
+    """
+    Run an analysis tool on code without blocking the event loop.
+    When the lint daemon is enabled the request is multiplexed over its
+    connection; otherwise the code is written to a temporary file whose path
+    is appended to the command and the tool runs in an asyncio subprocess.
     
-    # Run pyflakes check
-    pyflakes_result = run_pyflakes_check(code)
+    Args:
+        command: Tool command line without the file argument
+        code: Python code to analyze
+        timeout: Timeout in seconds
+        
+    Returns:
+        Standard output of the tool
+        
+    Raises:
+        asyncio.TimeoutError: If the tool does not finish in time
+        FileNotFoundError: If the tool is not installed
+    """
+    tool = _daemon_tool(command)
+    with trace_span("tool.run", tool=" ".join(command), daemon=bool(tool), code_bytes=len(code)):
+        if tool:
+            return await get_lint_client().analyze_async(tool, code, timeout=timeout)
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
+            temp_file.write(code)
+            temp_file_path = temp_file.name
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command, temp_file_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, _ = await asyncio.wait_for(process.communicate(), timeout=timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise
+            return stdout.decode("utf-8", errors="replace")
+        finally:
+            os.unlink(temp_file_path)
+
+
+@cached_result("pyflakes", versions=("pyflakes",))
+async def run_pyflakes_check_async(code: str) -> Dict[str, Any]:
+    """
+    Run pyflakes check on the code without blocking the event loop.
     
-    # Combine results
-    validation_result = {
-        "syntax": syntax_result,
-        "imports": imports_result,
-        "pyflakes": pyflakes_result,
-        "overall_valid": syntax_result["valid"] and pyflakes_result["success"],
-        "timestamp": __import__('datetime').datetime.now().isoformat()
-    }
+    Args:
+        code: Python code to check
+        
+    Returns:
+        Dictionary with pyflakes results
+    """
+    try:
+        return _pyflakes_result(await run_tool_on_code_async(['pyflakes'], code))
+    except asyncio.TimeoutError:
+        return _pyflakes_result(error="Pyflakes check timed out")
+    except FileNotFoundError:
+        return _pyflakes_result(error="Pyflakes not installed")
+    except Exception as e:
+        return _pyflakes_result(error=f"Error running pyflakes: {str(e)}")
+
+
+@cached_result(
+    "comprehensive_validation",
+    versions=("pyflakes",),
+    should_cache=lambda result: result["pyflakes"]["success"]
+)
+async def _validate_code_async(code: str) -> Dict[str, Any]:
+    """Run the validation checks concurrently."""
+    syntax_result, imports_result, pyflakes_result = await asyncio.gather(
+        asyncio.to_thread(validate_python_syntax, code),
+        asyncio.to_thread(check_imports, code),
+        run_pyflakes_check_async(code)
+    )
+    return _validation_result(syntax_result, imports_result, pyflakes_result)
+
+
+async def comprehensive_code_validation_async(code: str) -> Dict[str, Any]:
+    """
+    Perform comprehensive code validation with all checks running concurrently.
+    Wall-clock time is bounded by the slowest check rather than their sum.
     
-    return validation_result
+    Args:
+        code: Python code to validate
+        
+    Returns:
+        Dictionary with comprehensive validation results
+    """
+    return _with_timestamp(await _validate_code_async(code))
 
 
 # Example usage
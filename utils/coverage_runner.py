@@ -0,0 +1,252 @@
+"""
+Coverage runner for the AutoGen multi-agent system.
+This module executes generated tests against generated source code in the
+execution sandbox and measures line and branch coverage with coverage.py.
+"""
+import ast
+import hashlib
+import sys
+import xml.etree.ElementTree as ElementTree
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.code_validator import extract_code_block
+from utils.sandbox import SandboxPool, get_default_pool
+
+# Default execution parameters
+DEFAULT_TIMEOUT = 120.0
+DEFAULT_MEMORY_LIMIT_MB = 1024
+MAX_OPEN_FILES = 256
+MAX_FAILURE_MESSAGE = 300
+
+# Name of the module the source code is written to
+SOURCE_MODULE = "solution"
+
+# Job executed inside the sandbox scratch directory, which holds the source
+# and the tests. Imports the sandbox cannot resolve are aliased to the source
+# module there. The raw reports are sent back for parsing.
+_COVERAGE_RUNNER = r'''
+import importlib.util
+import json
+import os
+import sys
+
+import coverage
+import pytest
+
+for name in payload["imports"]:
+    if importlib.util.find_spec(name) is None:
+        with open(f"{name}.py", "w") as alias_file:
+            alias_file.write(payload["alias"])
+
+sys.path.insert(0, os.getcwd())
+cov = coverage.Coverage(branch=True, include=[payload["source_file"]], data_file=None)
+cov.start()
+try:
+    pytest.main(["-q", "-p", "no:cacheprovider", "--junitxml=report.xml", payload["test_file"]])
+finally:
+    cov.stop()
+
+try:
+    cov.json_report(outfile="coverage.json")
+    with open("coverage.json") as report_file:
+        totals = json.load(report_file)["totals"]
+except coverage.exceptions.NoDataError:
+    totals = None
+
+junit = None
+if os.path.exists("report.xml"):
+    with open("report.xml") as report_file:
+        junit = report_file.read()
+
+result = {"totals": totals, "junit": junit}
+'''
+
+# Cache of coverage runs keyed by (source hash, test hash)
+_CACHE_SIZE = 128
+_coverage_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+
+
+def _hash(text: str) -> str:
+    """Return the SHA-256 hex digest of the text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _imported_modules(test_code: str) -> List[str]:
+    """
+    Find the top-level modules imported by the tests that may need an alias.
+    Generated tests import the code under a name of their own choosing; the
+    job aliases the names the sandbox cannot resolve to the source module.
+
+    Args:
+        test_code: Test code to analyze
+
+    Returns:
+        Sorted list of module names, without the source module and the standard library
+    """
+    try:
+        tree = ast.parse(test_code)
+    except SyntaxError:
+        return []
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module.split(".")[0])
+
+    return sorted(name for name in names if name != SOURCE_MODULE and name not in sys.stdlib_module_names)
+
+
+def _parse_junit_report(report: Optional[str]) -> Dict[str, Any]:
+    """
+    Parse pass/fail counts and failure messages from a pytest JUnit XML report.
+
+    Args:
+        report: Report contents, or None if pytest did not write one
+
+    Returns:
+        Dictionary with test counts and "test name: message" failure lines
+    """
+    counts = {"tests_total": 0, "tests_passed": 0, "tests_failed": 0, "tests_skipped": 0, "failures": []}
+    if not report:
+        return counts
+
+    root = ElementTree.fromstring(report)
+    for suite in root.iter("testsuite"):
+        total = int(suite.get("tests", 0))
+        failed = int(suite.get("failures", 0)) + int(suite.get("errors", 0))
+        skipped = int(suite.get("skipped", 0))
+        counts["tests_total"] += total
+        counts["tests_failed"] += failed
+        counts["tests_skipped"] += skipped
+        counts["tests_passed"] += total - failed - skipped
+        for case in suite.iter("testcase"):
+            for outcome in case.findall("failure") + case.findall("error"):
+                message = (outcome.get("message") or "").strip().split("\n")[0][:MAX_FAILURE_MESSAGE]
+                counts["failures"].append(f"{case.get('name')}: {message}")
+    return counts
+
+
+def _parse_coverage_totals(totals: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Compute line and branch coverage from coverage.py JSON report totals.
+
+    Args:
+        totals: Report totals, or None if the source module was never imported
+
+    Returns:
+        Dictionary with coverage percentages
+    """
+    if totals is None:
+        return {"coverage_percentage": 0.0, "line_coverage": 0.0, "branch_coverage": 0.0}
+
+    statements = totals.get("num_statements", 0)
+    branches = totals.get("num_branches", 0)
+    line_coverage = 100.0 * totals.get("covered_lines", 0) / statements if statements else 100.0
+    branch_coverage = 100.0 * totals.get("covered_branches", 0) / branches if branches else 100.0
+    return {
+        "coverage_percentage": round(totals.get("percent_covered", 0.0), 2),
+        "line_coverage": round(line_coverage, 2),
+        "branch_coverage": round(branch_coverage, 2)
+    }
+
+
+def _execute(source_code: str, test_code: str, timeout: float, memory_limit_mb: int,
+             pool: Optional[SandboxPool]) -> Dict[str, Any]:
+    """
+    Run pytest under coverage.py in the sandbox.
+
+    Args:
+        source_code: Source code under test
+        test_code: Test code
+        timeout: Wall-clock timeout in seconds
+        memory_limit_mb: Memory limit in megabytes
+        pool: Sandbox pool to run in, or None for the default pool
+
+    Returns:
+        Dictionary with coverage and test results
+    """
+    job = (pool or get_default_pool()).run(
+        _COVERAGE_RUNNER,
+        payload={
+            "source_file": f"{SOURCE_MODULE}.py",
+            "test_file": f"test_{SOURCE_MODULE}.py",
+            "imports": _imported_modules(test_code),
+            "alias": f"import sys\nimport {SOURCE_MODULE}\nsys.modules[__name__] = {SOURCE_MODULE}\n"
+        },
+        files={f"{SOURCE_MODULE}.py": source_code, f"test_{SOURCE_MODULE}.py": test_code},
+        timeout=timeout,
+        cpu_seconds=int(timeout) + 1,
+        memory_limit_mb=memory_limit_mb,
+        max_open_files=MAX_OPEN_FILES
+    )
+
+    if not job["success"]:
+        return {"success": False, "error": job["error"]}
+
+    result = {"success": True, "error": None}
+    result.update(_parse_coverage_totals(job["result"]["totals"]))
+    result.update(_parse_junit_report(job["result"]["junit"]))
+    return result
+
+
+def measure_coverage(source_code: str, test_code: str, timeout: float = DEFAULT_TIMEOUT,
+                     memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB,
+                     pool: Optional[SandboxPool] = None) -> Dict[str, Any]:
+    """
+    Measure the coverage achieved by generated tests on generated code.
+    Both inputs may be raw agent responses; their code blocks are extracted.
+    Results are cached by (source hash, test hash).
+
+    Args:
+        source_code: Source code under test
+        test_code: Test code
+        timeout: Wall-clock timeout in seconds
+        memory_limit_mb: Memory limit in megabytes
+        pool: Sandbox pool to run in, or None for the default pool
+
+    Returns:
+        Dictionary with line/branch coverage, pass/fail counts and failure messages
+    """
+    source_code = extract_code_block(source_code)
+    test_code = extract_code_block(test_code)
+    key = (_hash(source_code), _hash(test_code))
+
+    if key in _coverage_cache:
+        _coverage_cache.move_to_end(key)
+        return dict(_coverage_cache[key])
+
+    try:
+        result = _execute(source_code, test_code, timeout, memory_limit_mb, pool)
+    except Exception as e:
+        result = {"success": False, "error": f"Error measuring coverage: {str(e)}"}
+
+    if result["success"]:
+        _coverage_cache[key] = result
+        if len(_coverage_cache) > _CACHE_SIZE:
+            _coverage_cache.popitem(last=False)
+
+    return dict(result)
+
+
+# Example usage
+if __name__ == "__main__":
+    sample_code = """
+def divide(a, b):
+    if b == 0:
+        raise ValueError("Cannot divide by zero")
+    return a / b
+"""
+    sample_tests = """
+import pytest
+from calculator import divide
+
+
+def test_divide():
+    assert divide(6, 3) == 2
+"""
+
+    coverage_result = measure_coverage(sample_code, sample_tests)
+    print(f"Coverage result: {coverage_result}")
@@ -0,0 +1,469 @@
+"""
+Lint daemon for the AutoGen multi-agent system.
+A long-lived process imports pycodestyle, pyflakes and radon once and serves
+analysis requests over a local Unix socket, so individual checks do not pay
+interpreter startup and module import costs.
+
+Protocol: newline-delimited JSON. Each request carries an id, the tool name,
+the code and a display filename; responses carry the same id and may arrive
+out of order, so many requests can be multiplexed over one connection. The
+output mimics the tool's command-line output so existing parsers keep working.
+The daemon exits after a configurable number of jobs to bound its memory:
+it then stops accepting connections and requests, answers the requests it
+has already read and exits. Clients treat a closed connection as a recycle
+and retry on a restarted daemon.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import io
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Set
+
+# Default daemon parameters
+DEFAULT_MAX_JOBS = 1000
+DEFAULT_THREADS = 4
+DEFAULT_TIMEOUT = 30.0
+STARTUP_TIMEOUT = 10.0
+
+TOOLS = ("pycodestyle", "pyflakes", "radon_cc")
+
+_lint_client = None
+_lint_client_lock = threading.Lock()
+
+
+def default_socket_path() -> str:
+    """Return the per-user default socket path."""
+    return os.path.join(tempfile.gettempdir(), f"autogen-lint-{os.getuid()}.sock")
+
+
+def _run_pycodestyle(code: str, filename: str) -> str:
+    """Run pycodestyle in-process and format the output like the CLI."""
+    import pycodestyle
+
+    lines = []
+
+    class CollectingReport(pycodestyle.BaseReport):
+        """Report that collects messages instead of printing them."""
+
+        def error(self, line_number, offset, text, check):
+            code = super().error(line_number, offset, text, check)
+            if code:
+                lines.append(f"{self.filename}:{line_number}:{offset + 1}: {text}")
+            return code
+
+    style = pycodestyle.StyleGuide(reporter=CollectingReport)
+    checker = pycodestyle.Checker(filename, lines=code.splitlines(True), options=style.options)
+    checker.check_all()
+    return "\n".join(lines)
+
+
+def _run_pyflakes(code: str, filename: str) -> str:
+    """Run pyflakes in-process and return its report."""
+    from pyflakes.api import check
+    from pyflakes.reporter import Reporter
+
+    output = io.StringIO()
+    check(code, filename, Reporter(output, output))
+    return output.getvalue()
+
+
+def _run_radon_cc(code: str, filename: str) -> str:
+    """Run radon cyclomatic complexity in-process and format it like the CLI."""
+    from radon.complexity import cc_rank, cc_visit, sorted_results
+
+    lines = [filename]
+    for block in sorted_results(cc_visit(code)):
+        lines.append(f"    {block.letter} {block.lineno}:{block.col_offset} {block.fullname} - {cc_rank(block.complexity)}")
+    return "\n".join(lines) if len(lines) > 1 else ""
+
+
+_ANALYZERS = {
+    "pycodestyle": _run_pycodestyle,
+    "pyflakes": _run_pyflakes,
+    "radon_cc": _run_radon_cc
+}
+
+
+class LintDaemon:
+    """Server side of the lint daemon."""
+
+    def __init__(self, socket_path: str, max_jobs: int = DEFAULT_MAX_JOBS, threads: int = DEFAULT_THREADS):
+        """
+        Create the daemon.
+
+        Args:
+            socket_path: Unix socket to listen on
+            max_jobs: Number of jobs after which the daemon exits
+            threads: Number of analysis threads
+        """
+        self.socket_path = socket_path
+        self.max_jobs = max_jobs
+        self.jobs = 0
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=threads)
+        self._writers = set()
+        self._requests: Set[asyncio.Task] = set()
+        self._stopped: Optional[asyncio.Event] = None
+
+    def _claim_socket(self) -> bool:
+        """
+        Remove a stale socket file left by a crashed daemon.
+
+        Returns:
+            False if another daemon is already serving the socket
+        """
+        if not os.path.exists(self.socket_path):
+            return True
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+            return False
+        except OSError:
+            os.unlink(self.socket_path)
+            return True
+        finally:
+            probe.close()
+
+    async def serve(self) -> None:
+        """Serve requests until the job limit is reached, then drain and exit."""
+        if not self._claim_socket():
+            return
+
+        # Import the analyzers once, before accepting work
+        import pycodestyle  # noqa: F401
+        import pyflakes.api  # noqa: F401
+        import radon.complexity  # noqa: F401
+
+        self._stopped = asyncio.Event()
+        server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        try:
+            await self._stopped.wait()
+        finally:
+            # Stop accepting connections. The socket is unlinked while it is
+            # still ours, so a replacement daemon can bind it right away and
+            # is never removed by this one.
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            server.close()
+            if self._requests:
+                await asyncio.gather(*self._requests, return_exceptions=True)
+            for writer in list(self._writers):
+                writer.close()
+            await server.wait_closed()
+            self._executor.shutdown(wait=False)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read requests from a connection and answer them as they complete."""
+        self._writers.add(writer)
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                # Requests read after the job budget is spent are left unanswered;
+                # the client retries them when the connection closes
+                if not line or self._stopped.is_set():
+                    break
+                task = asyncio.create_task(self._serve_request(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                self._requests.add(task)
+                task.add_done_callback(self._requests.discard)
+                self.jobs += 1
+                if self.jobs >= self.max_jobs:
+                    self._stopped.set()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _serve_request(self, line: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock) -> None:
+        """Run one analysis request and write its response."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            analyzer = _ANALYZERS[request["tool"]]
+            loop = asyncio.get_running_loop()
+            output = await loop.run_in_executor(
+                self._executor, analyzer, request["code"], request.get("filename", "code.py")
+            )
+            response = {"id": request_id, "ok": True, "output": output}
+        except Exception as e:
+            response = {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+        try:
+            async with write_lock:
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, RuntimeError):
+            pass
+
+
+class LintDaemonError(Exception):
+    """Raised when the lint daemon reports an analysis error."""
+
+
+class LintDaemonClient:
+    """
+    Thread-safe client that multiplexes requests over one daemon connection.
+    The daemon is started on demand and restarted after a crash or recycle.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, max_jobs: int = DEFAULT_MAX_JOBS,
+                 timeout: float = DEFAULT_TIMEOUT):
+        """
+        Create the client.
+
+        Args:
+            socket_path: Unix socket of the daemon
+            max_jobs: Job limit passed to daemons started by this client
+            timeout: Default request timeout in seconds
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.max_jobs = max_jobs
+        self.timeout = timeout
+        self.restarts = 0
+        # _lock guards the connection and the pending requests and is only held briefly;
+        # _send_lock serializes connecting, which may wait for the daemon to start, and writing
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._pending: Dict[int, concurrent.futures.Future] = {}
+        self._ids = itertools.count(1)
+        self._process: Optional[subprocess.Popen] = None
+
+    def _spawn_daemon(self) -> None:
+        """Start a daemon process in the background."""
+        if self._process is not None:
+            self._process.poll()
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "utils.lint_daemon", "--socket", self.socket_path,
+             "--max-jobs", str(self.max_jobs)],
+            cwd=project_root,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        self.restarts += 1
+
+    def _connect(self) -> socket.socket:
+        """
+        Connect to the daemon, starting it if it is not running.
+        A daemon started by this client that is still running is either
+        starting up or finishing its last requests before a recycle, so it is
+        waited for rather than started a second time.
+        """
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        spawned = False
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.socket_path)
+                return sock
+            except OSError:
+                sock.close()
+                if not spawned and (self._process is None or self._process.poll() is not None):
+                    self._spawn_daemon()
+                    spawned = True
+                if time.monotonic() > deadline:
+                    raise ConnectionError("Lint daemon did not start")
+                time.sleep(0.05)
+
+    def _reader_loop(self, sock: socket.socket) -> None:
+        """Dispatch responses from the daemon to the waiting futures."""
+        stream = sock.makefile("rb")
+        try:
+            for line in stream:
+                response = json.loads(line)
+                with self._lock:
+                    future = self._pending.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if response["ok"]:
+                    future.set_result(response["output"])
+                else:
+                    future.set_exception(LintDaemonError(response["error"]))
+        except (OSError, ValueError):
+            pass
+        finally:
+            stream.close()
+            self._reset(sock)
+
+    def _reset(self, sock: Optional[socket.socket]) -> None:
+        """
+        Drop a connection that was closed, e.g. by a daemon recycle, and fail
+        the requests still waiting on it. Requests on a newer connection are kept.
+        """
+        with self._lock:
+            if sock is not None and self._sock is sock:
+                self._sock = None
+            pending = {request_id: future for request_id, future in self._pending.items() if future.sock is sock}
+            for request_id in pending:
+                del self._pending[request_id]
+        if sock is not None:
+            sock.close()
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Lint daemon connection closed"))
+
+    def _send(self, tool: str, code: str, filename: str) -> concurrent.futures.Future:
+        """Send a request and return the future of its response."""
+        future = concurrent.futures.Future()
+        with self._send_lock:
+            with self._lock:
+                sock = self._sock
+            if sock is None:
+                sock = self._connect()
+                with self._lock:
+                    self._sock = sock
+                threading.Thread(target=self._reader_loop, args=(sock,), daemon=True).start()
+
+            with self._lock:
+                # The reader may have dropped the connection since it was looked up
+                connected = self._sock is sock
+                if connected:
+                    request_id = next(self._ids)
+                    self._pending[request_id] = future
+                    future.request_id = request_id
+                    future.sock = sock
+            if connected:
+                message = json.dumps({"id": request_id, "tool": tool, "code": code, "filename": filename})
+                try:
+                    sock.sendall(message.encode("utf-8") + b"\n")
+                    return future
+                except OSError:
+                    pass
+        self._reset(sock)
+        if not future.done():
+            future.set_exception(ConnectionError("Lint daemon connection closed"))
+        return future
+
+    def _abandon(self, future: concurrent.futures.Future) -> None:
+        """Forget a request whose caller stopped waiting."""
+        with self._lock:
+            self._pending.pop(getattr(future, "request_id", None), None)
+
+    def analyze(self, tool: str, code: str, filename: str = "code.py", timeout: Optional[float] = None) -> str:
+        """
+        Analyze code with one of the daemon's tools.
+
+        Args:
+            tool: One of "pycodestyle", "pyflakes" or "radon_cc"
+            code: Python code to analyze
+            filename: Name used in the tool output
+            timeout: Timeout in seconds
+
+        Returns:
+            Tool output formatted like its command line
+
+        Raises:
+            TimeoutError: If the daemon does not answer in time
+            LintDaemonError: If the analysis fails
+        """
+        timeout = timeout or self.timeout
+        for attempt in range(2):
+            future = None
+            try:
+                future = self._send(tool, code, filename)
+                return future.result(timeout)
+            except concurrent.futures.TimeoutError:
+                self._abandon(future)
+                raise TimeoutError(f"Lint daemon did not answer within {timeout} seconds")
+            except ConnectionError:
+                # The daemon crashed or recycled before answering (the connection hit
+                # EOF); reconnect, restarting the daemon if needed, and retry once
+                self._reset(getattr(future, "sock", None))
+                if attempt:
+                    raise
+
+    async def analyze_async(self, tool: str, code: str, filename: str = "code.py",
+                            timeout: Optional[float] = None) -> str:
+        """
+        Analyze code without blocking the event loop.
+
+        Args:
+            tool: One of "pycodestyle", "pyflakes" or "radon_cc"
+            code: Python code to analyze
+            filename: Name used in the tool output
+            timeout: Timeout in seconds
+
+        Returns:
+            Tool output formatted like its command line
+        """
+        timeout = timeout or self.timeout
+        for attempt in range(2):
+            future = None
+            try:
+                future = await asyncio.to_thread(self._send, tool, code, filename)
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            except asyncio.TimeoutError:
+                self._abandon(future)
+                raise
+            except ConnectionError:
+                self._reset(getattr(future, "sock", None))
+                if attempt:
+                    raise
+
+    def close(self) -> None:
+        """Close the connection to the daemon."""
+        with self._lock:
+            sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+
+def get_lint_client() -> LintDaemonClient:
+    """
+    Get the process-wide lint daemon client, configured from the settings.
+
+    Returns:
+        Shared LintDaemonClient instance
+    """
+    global _lint_client
+    with _lint_client_lock:
+        if _lint_client is None:
+            from config.settings import settings
+            _lint_client = LintDaemonClient(
+                socket_path=settings.lint_daemon_socket,
+                max_jobs=settings.lint_daemon_max_jobs
+            )
+        return _lint_client
+
+
+def lint_daemon_enabled() -> bool:
+    """Check whether analysis should go through the lint daemon."""
+    from config.settings import settings
+    return settings.lint_daemon_enabled
+
+
+def main(argv: Optional[Any] = None) -> None:
+    """Run the lint daemon from the command line."""
+    parser = argparse.ArgumentParser(description="Warm analyzer daemon for pycodestyle, pyflakes and radon")
+    parser.add_argument("--socket", default=default_socket_path(), help="Unix socket path")
+    parser.add_argument("--max-jobs", type=int, default=DEFAULT_MAX_JOBS, help="Jobs served before recycling")
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS, help="Analysis threads")
+    args = parser.parse_args(argv)
+
+    daemon = LintDaemon(args.socket, max_jobs=args.max_jobs, threads=args.threads)
+    asyncio.run(daemon.serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Result cache for the AutoGen multi-agent system.
+Static analysis results are pure functions of (code, tool version, config),
+so they are memoized under a content hash of those inputs. The cache has a
+size-bounded in-memory LRU tier and an optional size-bounded on-disk tier.
+"""
+import functools
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Default cache limits
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_MAX_BYTES = 512 * 1024 * 1024
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def tool_version(distribution: str) -> str:
+    """
+    Get the installed version of an analysis tool.
+
+    Args:
+        distribution: Distribution name (e.g. "pycodestyle")
+
+    Returns:
+        Version string, or "unknown" if the tool is not installed
+    """
+    try:
+        return importlib.metadata.version(distribution)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def make_key(tool: str, code: str, versions: Iterable[str] = (), config: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build the content-hash cache key for an analysis result.
+
+    Args:
+        tool: Name of the check
+        code: Code being analyzed
+        versions: Distributions whose versions affect the result
+        config: Check configuration
+
+    Returns:
+        Hex digest identifying the result
+    """
+    identity = {
+        "tool": tool,
+        "python": sys.version,
+        "versions": {name: tool_version(name) for name in versions},
+        "config": config or {}
+    }
+    digest = hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(code.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier memoization store for JSON-serializable results.
+    Values are stored serialized, so every lookup returns an independent copy.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 disk_dir: Optional[str] = None, disk_max_bytes: int = DEFAULT_DISK_MAX_BYTES):
+        """
+        Create the cache.
+
+        Args:
+            max_entries: Maximum number of entries in memory
+            max_bytes: Maximum total size of the entries in memory
+            disk_dir: Directory of the on-disk tier, or None to disable it
+            disk_max_bytes: Maximum total size of the on-disk tier
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_evictions": 0}
+        self._disk_size = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_size = sum(size for _, size, _ in self._scan_disk())
+
+    def _disk_path(self, key: str) -> str:
+        """Return the on-disk location of an entry."""
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _store_in_memory(self, key: str, data: bytes) -> None:
+        """Insert an entry in the memory tier and evict down to the limits."""
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        if len(data) > self.max_bytes:
+            return
+        self._entries[key] = data
+        self._size += len(data)
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self._counters["evictions"] += 1
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        """Read an entry from the disk tier."""
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as entry_file:
+                data = entry_file.read()
+            # Touch the entry so disk eviction is least-recently-used
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        """Write an entry to the disk tier atomically."""
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as entry_file:
+                entry_file.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error writing result cache entry: {e}")
+            return
+
+        with self._lock:
+            self._disk_size += len(data) - previous_size
+            over_limit = self._disk_size > self.disk_max_bytes
+        if over_limit:
+            self._evict_disk()
+
+    def _scan_disk(self) -> List[Tuple[float, int, str]]:
+        """List the disk entries as (mtime, size, path)."""
+        entries = []
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict_disk(self) -> None:
+        """
+        Remove the least recently used disk entries above the size limit.
+        Eviction goes down to 90% of the limit so that it runs rarely.
+        """
+        entries = self._scan_disk()
+        total = sum(size for _, size, _ in entries)
+        target = self.disk_max_bytes * 0.9
+
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+                evicted += 1
+            except OSError:
+                pass
+
+        with self._lock:
+            self._disk_size = total
+            self._counters["disk_evictions"] += evicted
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a result.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                self._counters["memory_hits"] += 1
+                return json.loads(data)
+
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            self._counters["disk_hits"] += 1
+            self._store_in_memory(key, data)
+        return json.loads(data)
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a result.
+
+        Args:
+            key: Cache key from make_key
+            value: JSON-serializable result
+        """
+        data = json.dumps(value, default=str).encode("utf-8")
+        with self._lock:
+            self._store_in_memory(key, data)
+        self._write_disk(key, data)
+
+    def clear(self) -> None:
+        """Remove all entries from the memory tier and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counters, hit ratio and sizes
+        """
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            stats = dict(self._counters)
+            stats.update({
+                "hit_ratio": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "disk_enabled": bool(self.disk_dir),
+                "disk_bytes": self._disk_size
+            })
+            return stats
+
+
+def get_result_cache() -> ResultCache:
+    """
+    Get the process-wide result cache, configured from the settings.
+
+    Returns:
+        Shared ResultCache instance
+    """
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            from config.settings import settings
+            _result_cache = ResultCache(
+                max_entries=settings.result_cache_max_entries,
+                max_bytes=settings.result_cache_max_bytes,
+                disk_dir=settings.result_cache_dir,
+                disk_max_bytes=settings.result_cache_disk_max_bytes
+            )
+        return _result_cache
+
+
+def _cache_enabled() -> bool:
+    """Check whether result caching is enabled in the settings."""
+    from config.settings import settings
+    return settings.result_cache_enabled
+
+
+def cached_result(tool: str, versions: Iterable[str] = (),
+                  should_cache: Callable[[Dict[str, Any]], bool] = lambda result: result.get("success", True)):
+    """
+    Memoize an analysis function whose first argument is the code.
+    Any further arguments are treated as the check configuration. Both plain
+    functions and coroutine functions are supported.
+
+    Args:
+        tool: Name of the check used in the cache key
+        versions: Distributions whose versions affect the result
+        should_cache: Predicate deciding whether a result may be cached
+            (transient failures such as timeouts must not be)
+
+    Returns:
+        Decorator
+    """
+    versions = tuple(versions)
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def cache_key(code: str, *args, **kwargs) -> str:
+            bound = signature.bind(code, *args, **kwargs)
+            bound.apply_defaults()
+            config = {name: value for name, value in bound.arguments.items() if name != "code"}
+            return make_key(tool, code, versions, config)
+
+        if inspect.iscoroutinefunction(func):
+            # Async variants share keys with their sync counterparts
+            @functools.wraps(func)
+            async def async_wrapper(code: str, *args, **kwargs):
+                if not _cache_enabled():
+                    return await func(code, *args, **kwargs)
+
+                key = cache_key(code, *args, **kwargs)
+                cache = get_result_cache()
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
+
+                result = await func(code, *args, **kwargs)
+                if should_cache(result):
+                    cache.put(key, result)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(code: str, *args, **kwargs):
+            if not _cache_enabled():
+                return func(code, *args, **kwargs)
+
+            key = cache_key(code, *args, **kwargs)
+            cache = get_result_cache()
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+            result = func(code, *args, **kwargs)
+            if should_cache(result):
+                cache.put(key, result)
+            return result
+
+        return wrapper
+
+    return decorator
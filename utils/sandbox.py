@@ -0,0 +1,243 @@
+"""
+Sandboxed execution service for the AutoGen multi-agent system.
+This module runs LLM-generated code in a pool of worker processes. The
+workers run utils/sandbox_worker.py in a clean, isolated interpreter
+started with an empty environment, so they share no memory with the
+application. Each job runs in a fresh child forked from a warm worker, with
+CPU time, memory and open-file limits, a wall-clock timeout, no network
+access, a read-only view of the filesystem except its private scratch
+directory, and no capabilities. Jobs are refused where the kernel does not
+allow this isolation.
+"""
+import asyncio
+import atexit
+import os
+import queue
+import select
+import subprocess
+import sys
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from utils.sandbox_worker import failure_result, read_message, write_message
+
+# Default per-job limits
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_CPU_SECONDS = 30
+DEFAULT_MEMORY_LIMIT_MB = 512
+DEFAULT_MAX_OPEN_FILES = 64
+
+# Extra time a worker gets to report a job before it is considered hung
+_WORKER_GRACE_SECONDS = 5.0
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox_worker.py")
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+class _Worker:
+    """Handle to a worker process."""
+
+    __slots__ = ("process",)
+
+    def __init__(self, process: subprocess.Popen):
+        self.process = process
+
+    def send(self, job: Dict[str, Any]) -> None:
+        """Send a job to the worker."""
+        write_message(self.process.stdin, job)
+
+    def poll(self, timeout: float) -> bool:
+        """Wait until the worker has a result to read."""
+        ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+        return bool(ready)
+
+    def recv(self) -> Dict[str, Any]:
+        """Read a job result."""
+        return read_message(self.process.stdout)
+
+    def alive(self) -> bool:
+        """Check whether the worker process is still running."""
+        return self.process.poll() is None
+
+    def stop(self) -> None:
+        """Stop the worker process."""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process.stdout.close()
+
+
+class SandboxPool:
+    """
+    Pool of pre-forked worker processes that execute untrusted code.
+    Jobs are Python source executed with the JSON-serializable `payload`
+    global available; the job reports its output by assigning `result`.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, preload: Iterable[str] = (),
+                 timeout: float = DEFAULT_TIMEOUT, cpu_seconds: int = DEFAULT_CPU_SECONDS,
+                 memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB,
+                 max_open_files: int = DEFAULT_MAX_OPEN_FILES):
+        """
+        Start the worker processes.
+
+        Args:
+            workers: Number of worker processes
+            preload: Modules imported by each worker before accepting jobs
+            timeout: Default wall-clock timeout per job in seconds
+            cpu_seconds: Default CPU time limit per job in seconds
+            memory_limit_mb: Default memory limit per job in megabytes
+            max_open_files: Default open-file limit per job
+        """
+        if not sys.platform.startswith("linux"):
+            raise RuntimeError("The sandbox requires Linux namespaces")
+
+        self._preload = list(preload)
+        self._defaults = {
+            "timeout": timeout,
+            "cpu_seconds": cpu_seconds,
+            "memory_limit_mb": memory_limit_mb,
+            "max_open_files": max_open_files
+        }
+        # Idle workers; None marks a slot whose worker died and could not be replaced yet
+        self._idle: "queue.Queue[Optional[_Worker]]" = queue.Queue()
+        self._closed = False
+        self.size = workers
+        for _ in range(workers):
+            self._idle.put(self._start_worker())
+
+    def _start_worker(self) -> _Worker:
+        """Start a new worker process in a clean interpreter that never imports the application."""
+        process = subprocess.Popen(
+            [sys.executable, "-I", WORKER_SCRIPT, *self._preload],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env={"PATH": os.defpath},
+            cwd="/",
+            bufsize=0,
+            close_fds=True
+        )
+        return _Worker(process)
+
+    def run(self, code: str, payload: Any = None, files: Optional[Dict[str, str]] = None,
+            **limits: Any) -> Dict[str, Any]:
+        """
+        Run a job and wait for its result.
+
+        Args:
+            code: Python source to execute
+            payload: JSON-serializable input exposed to the job as `payload`
+            files: Files written into the job's scratch directory
+            **limits: Overrides for timeout, cpu_seconds, memory_limit_mb and max_open_files
+
+        Returns:
+            Dictionary with the job result, captured output, peak RSS and CPU time
+        """
+        if self._closed:
+            raise RuntimeError("Sandbox pool is closed")
+
+        job = dict(self._defaults)
+        job.update({key: value for key, value in limits.items() if value is not None})
+        job.update({"code": code, "payload": payload, "files": files or {}})
+
+        worker = self._idle.get()
+        try:
+            if worker is None:
+                worker = self._start_worker()
+            try:
+                worker.send(job)
+                if worker.poll(job["timeout"] + _WORKER_GRACE_SECONDS):
+                    return worker.recv()
+                # The worker did not report back in time
+                worker.process.kill()
+                result = failure_result("Sandbox worker stopped responding", timed_out=True)
+            except (EOFError, OSError):
+                result = failure_result("Sandbox worker crashed")
+
+            # Replace the worker; if that fails, the next job tries again
+            worker.stop()
+            try:
+                worker = self._start_worker()
+            except OSError:
+                worker = None
+            return result
+        finally:
+            # Only a live worker goes back to the pool
+            self._idle.put(worker if worker is not None and worker.alive() else None)
+
+    async def submit(self, code: str, payload: Any = None, files: Optional[Dict[str, str]] = None,
+                     **limits: Any) -> Dict[str, Any]:
+        """
+        Submit a job from async code.
+
+        Args:
+            code: Python source to execute
+            payload: JSON-serializable input exposed to the job as `payload`
+            files: Files written into the job's scratch directory
+            **limits: Overrides for timeout, cpu_seconds, memory_limit_mb and max_open_files
+
+        Returns:
+            Dictionary with the job result, captured output, peak RSS and CPU time
+        """
+        return await asyncio.to_thread(self.run, code, payload, files, **limits)
+
+    def close(self) -> None:
+        """Stop all worker processes."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in range(self.size):
+            worker = self._idle.get()
+            if worker is not None:
+                worker.stop()
+
+    def __enter__(self) -> "SandboxPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def get_default_pool(workers: Optional[int] = None) -> SandboxPool:
+    """
+    Get the process-wide sandbox pool, starting it on first use.
+
+    Args:
+        workers: Number of workers if the pool has not been started yet
+
+    Returns:
+        Shared SandboxPool instance
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = SandboxPool(workers=workers or DEFAULT_WORKERS, preload=("pytest", "coverage"))
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+
+# Example usage
+if __name__ == "__main__":
+    sample_job = """
+def fibonacci(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+result = [fibonacci(n) for n in payload]
+"""
+
+    with SandboxPool(workers=2) as pool:
+        job_result = pool.run(sample_job, payload=list(range(10)))
+        print(f"Job result: {job_result}")
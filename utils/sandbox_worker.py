@@ -0,0 +1,488 @@
+"""
+Sandbox worker process for the AutoGen multi-agent system.
+The sandbox pool (utils/sandbox.py) starts this file as a script in an
+isolated interpreter (python -I) with an empty environment, so the worker
+holds nothing of the application: no settings, no API keys, no project
+modules on sys.path. It only imports the standard library.
+
+The worker reads jobs from stdin and writes results to stdout as
+length-prefixed JSON messages. Each job runs in a child forked from the
+worker, in new mount, network and PID namespaces: every mount is read-only
+except the job's scratch directory, /proc is hidden, there is no network
+interface and the job holds no capabilities. When the kernel does not allow
+the namespaces, jobs are refused instead of running unisolated.
+"""
+import ctypes
+import json
+import os
+import resource
+import select
+import shutil
+import signal
+import struct
+import sys
+import tempfile
+import time
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional
+
+MAX_FILE_SIZE_MB = 64
+MAX_OUTPUT_CHARS = 65536
+
+# Linux namespace flags
+_CLONE_NEWNS = 0x00020000
+_CLONE_NEWUSER = 0x10000000
+_CLONE_NEWPID = 0x20000000
+_CLONE_NEWNET = 0x40000000
+
+# Mount flags, and the statvfs flags they correspond to
+_MS_RDONLY = 1
+_MS_NOSUID = 2
+_MS_NODEV = 4
+_MS_NOEXEC = 8
+_MS_REMOUNT = 32
+_MS_NOATIME = 1024
+_MS_NODIRATIME = 2048
+_MS_BIND = 4096
+_MS_REC = 16384
+_MS_PRIVATE = 1 << 18
+_MS_RELATIME = 1 << 21
+_MS_STRICTATIME = 1 << 24
+_STATVFS_MOUNT_FLAGS = ((1, _MS_RDONLY), (2, _MS_NOSUID), (4, _MS_NODEV), (8, _MS_NOEXEC),
+                        (1024, _MS_NOATIME), (2048, _MS_NODIRATIME), (4096, _MS_RELATIME))
+
+# Pseudo filesystems whose writable files need privileges the job does not have
+_PRIVILEGED_MOUNTS = ("/proc", "/sys")
+
+_PR_SET_NO_NEW_PRIVS = 38
+_PR_CAPBSET_DROP = 24
+_LINUX_CAPABILITY_VERSION_3 = 0x20080522
+_CAP_LAST = 63
+
+_HEADER = struct.Struct("!I")
+
+
+class SandboxIsolationError(RuntimeError):
+    """Raised when a job cannot be isolated from the host."""
+
+
+class _CapHeader(ctypes.Structure):
+    _fields_ = [("version", ctypes.c_uint32), ("pid", ctypes.c_int)]
+
+
+class _CapData(ctypes.Structure):
+    _fields_ = [("effective", ctypes.c_uint32), ("permitted", ctypes.c_uint32),
+                ("inheritable", ctypes.c_uint32)]
+
+
+def failure_result(error: str, **fields: Any) -> Dict[str, Any]:
+    """Build a job result for a job that did not complete."""
+    result = {
+        "success": False,
+        "result": None,
+        "error": error,
+        "stdout": "",
+        "stderr": "",
+        "exit_code": None,
+        "timed_out": False,
+        "peak_rss_kb": 0,
+        "cpu_time_s": 0.0,
+        "wall_time_s": 0.0
+    }
+    result.update(fields)
+    return result
+
+
+def write_message(stream: BinaryIO, message: Any) -> None:
+    """Write a length-prefixed JSON message."""
+    data = json.dumps(message).encode("utf-8")
+    stream.write(_HEADER.pack(len(data)) + data)
+    stream.flush()
+
+
+def _read_exact(stream: BinaryIO, size: int) -> Optional[bytes]:
+    """Read exactly `size` bytes, or None at end of stream."""
+    chunks = []
+    while size:
+        chunk = stream.read(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_message(stream: BinaryIO) -> Any:
+    """
+    Read a length-prefixed JSON message.
+
+    Raises:
+        EOFError: If the stream ends
+    """
+    header = _read_exact(stream, _HEADER.size)
+    data = _read_exact(stream, _HEADER.unpack(header)[0]) if header else None
+    if data is None:
+        raise EOFError("Sandbox channel closed")
+    return json.loads(data)
+
+
+def _libc() -> ctypes.CDLL:
+    return ctypes.CDLL(None, use_errno=True)
+
+
+def _mount(libc: ctypes.CDLL, source: Optional[str], target: str, fstype: Optional[str], flags: int) -> None:
+    """Call mount(2), raising OSError on failure."""
+    encode = lambda value: value.encode() if value is not None else None
+    if libc.mount(encode(source), encode(target), encode(fstype), ctypes.c_ulong(flags), None) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, f"mount {target}: {os.strerror(errno)}")
+
+
+def _mount_points() -> List[str]:
+    """List the mount points of the current mount namespace."""
+    points = []
+    with open("/proc/self/mountinfo") as mountinfo:
+        for line in mountinfo:
+            # Paths escape spaces and other special characters as octal
+            point = line.split()[4]
+            points.append(point.encode().decode("unicode_escape").encode("latin-1").decode())
+    return points
+
+
+def _remount_read_only(libc: ctypes.CDLL, point: str) -> None:
+    """Remount a mount point read-only, keeping its other flags, which may be locked."""
+    current = os.statvfs(point).f_flag
+    flags = _MS_REMOUNT | _MS_BIND | _MS_RDONLY
+    for statvfs_flag, mount_flag in _STATVFS_MOUNT_FLAGS:
+        if current & statvfs_flag:
+            flags |= mount_flag
+    if not current & (1024 | 4096):
+        flags |= _MS_STRICTATIME
+    _mount(libc, None, point, None, flags)
+
+
+def _isolate(scratch_dir: str) -> None:
+    """
+    Move the current process into new mount, network and PID namespaces and
+    make every mount but the scratch directory read-only.
+    Children forked afterwards are the first process of the new PID namespace.
+
+    Args:
+        scratch_dir: Directory left writable
+
+    Raises:
+        SandboxIsolationError: If the kernel does not allow the namespaces
+    """
+    libc = _libc()
+    uid, gid = os.getuid(), os.getgid()
+    namespaces = _CLONE_NEWNS | _CLONE_NEWNET | _CLONE_NEWPID
+    if libc.unshare(namespaces) != 0:
+        # Unprivileged users get the namespaces through a user namespace of their own
+        if libc.unshare(_CLONE_NEWUSER | namespaces) != 0:
+            errno = ctypes.get_errno()
+            raise SandboxIsolationError(f"Sandbox isolation is unavailable: unshare failed ({os.strerror(errno)})")
+        for name, content in (("setgroups", "deny"), ("uid_map", f"{uid} {uid} 1"), ("gid_map", f"{gid} {gid} 1")):
+            with open(f"/proc/self/{name}", "w") as map_file:
+                map_file.write(content)
+
+    try:
+        _mount(libc, None, "/", None, _MS_REC | _MS_PRIVATE)
+        scratch_dir = os.path.realpath(scratch_dir)
+        _mount(libc, scratch_dir, scratch_dir, None, _MS_BIND)
+        for point in _mount_points():
+            if point == scratch_dir:
+                continue
+            try:
+                _remount_read_only(libc, point)
+            except OSError:
+                if not point.startswith(_PRIVILEGED_MOUNTS):
+                    raise
+        # Hide the host's processes, including their environment and command lines
+        _mount(libc, "tmpfs", "/proc", "tmpfs", _MS_RDONLY | _MS_NOSUID | _MS_NODEV | _MS_NOEXEC)
+    except OSError as e:
+        raise SandboxIsolationError(f"Sandbox isolation is unavailable: {e}")
+
+
+def _drop_privileges() -> None:
+    """Drop every capability, so the job cannot undo the isolation."""
+    libc = _libc()
+    libc.prctl(_PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0)
+    for capability in range(_CAP_LAST + 1):
+        libc.prctl(_PR_CAPBSET_DROP, capability, 0, 0, 0)
+    header = _CapHeader(_LINUX_CAPABILITY_VERSION_3, 0)
+    data = (_CapData * 2)()
+    if libc.capset(ctypes.byref(header), data) != 0:
+        raise SandboxIsolationError(f"Could not drop capabilities: {os.strerror(ctypes.get_errno())}")
+
+
+def _address_space_limit(memory_limit_mb: int) -> int:
+    """
+    Compute the address space limit for a job.
+    Jobs are forked from the worker, so the limit is applied on top of the
+    address space the child already inherits.
+
+    Args:
+        memory_limit_mb: Memory the job may allocate in megabytes
+
+    Returns:
+        Address space limit in bytes
+    """
+    inherited = 0
+    try:
+        with open("/proc/self/statm") as statm:
+            inherited = int(statm.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        pass
+    return inherited + memory_limit_mb * 1024 * 1024
+
+
+def _report(result_fd: int, message: Dict[str, Any]) -> bool:
+    """Write a job's message to the result pipe; False if it is not JSON serializable."""
+    serializable = True
+    try:
+        data = json.dumps(message).encode("utf-8")
+    except (TypeError, ValueError):
+        serializable = False
+        data = json.dumps({"result": None, "error": "Job result is not JSON serializable"}).encode("utf-8")
+    view = memoryview(data)
+    while view:
+        written = os.write(result_fd, view)
+        view = view[written:]
+    return serializable
+
+
+def _run_job_process(job: Dict[str, Any], scratch_dir: str, result_fd: int, memory_bytes: int) -> None:
+    """
+    Execute a job as the first process of its PID namespace. Never returns.
+
+    Args:
+        job: Job description
+        scratch_dir: Private scratch directory
+        result_fd: Pipe used to report the result
+        memory_bytes: Address space limit
+    """
+    exit_code = 0
+    try:
+        _drop_privileges()
+        os.chdir(scratch_dir)
+        os.environ.clear()
+        os.environ.update({"PATH": os.defpath, "HOME": scratch_dir, "TMPDIR": scratch_dir})
+        tempfile.tempdir = None
+
+        for name, content in job["files"].items():
+            with open(os.path.join(scratch_dir, name), "w", encoding="utf-8") as job_file:
+                job_file.write(content)
+
+        # Redirect standard streams to files in the scratch directory
+        stdin_fd = os.open(os.devnull, os.O_RDONLY)
+        stdout_fd = os.open("stdout.txt", os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+        stderr_fd = os.open("stderr.txt", os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+        for source_fd, target_fd in ((stdin_fd, 0), (stdout_fd, 1), (stderr_fd, 2)):
+            os.dup2(source_fd, target_fd)
+            os.close(source_fd)
+        sys.stdin = open(0, encoding="utf-8", closefd=False)
+        sys.stdout = open(1, "w", encoding="utf-8", closefd=False)
+        sys.stderr = open(2, "w", encoding="utf-8", closefd=False)
+
+        # Drop every inherited descriptor except the result pipe
+        max_fd = os.sysconf("SC_OPEN_MAX")
+        os.closerange(3, result_fd)
+        os.closerange(result_fd + 1, max_fd)
+
+        # The soft CPU limit delivers SIGXCPU, the hard limit one second later kills
+        resource.setrlimit(resource.RLIMIT_CPU, (job["cpu_seconds"], job["cpu_seconds"] + 1))
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        resource.setrlimit(resource.RLIMIT_NOFILE, (job["max_open_files"], job["max_open_files"]))
+        file_size = MAX_FILE_SIZE_MB * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_FSIZE, (file_size, file_size))
+
+        namespace = {"__name__": "__sandbox__", "payload": job["payload"], "result": None}
+        try:
+            exec(compile(job["code"], "<sandbox>", "exec"), namespace)
+        except SystemExit as exc:
+            if exc.code not in (None, 0):
+                raise
+        message = {"result": namespace["result"], "error": None}
+    except BaseException as exc:
+        exit_code = 1
+        message = {"result": None, "error": f"{type(exc).__name__}: {exc}"}
+
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+    try:
+        if not _report(result_fd, message):
+            exit_code = 1
+    finally:
+        os._exit(exit_code)
+
+
+def _run_child(job: Dict[str, Any], scratch_dir: str, result_fd: int) -> None:
+    """
+    Isolate the forked child and run the job in a process of its own. Never returns.
+
+    Args:
+        job: Job description
+        scratch_dir: Private scratch directory
+        result_fd: Pipe used to report the result
+    """
+    exit_code = 1
+    try:
+        os.setpgid(0, 0)
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+        memory_bytes = _address_space_limit(job["memory_limit_mb"])
+        _isolate(scratch_dir)
+        pid = os.fork()
+        if pid == 0:
+            _run_job_process(job, scratch_dir, result_fd, memory_bytes)
+        # Only the job holds the result pipe, so its end is seen as soon as the job exits
+        os.close(result_fd)
+        _, status, usage = os.wait4(pid, 0)
+        if os.WIFSIGNALED(status):
+            # Die from the same signal, so the worker sees how the job ended. As the
+            # first process of its PID namespace the job ignores SIGXCPU, so the
+            # hard CPU limit kills it instead.
+            terminating_signal = os.WTERMSIG(status)
+            if usage.ru_utime + usage.ru_stime >= job["cpu_seconds"]:
+                terminating_signal = signal.SIGXCPU
+            if terminating_signal != signal.SIGKILL:
+                signal.signal(terminating_signal, signal.SIG_DFL)
+            os.kill(os.getpid(), terminating_signal)
+        exit_code = os.waitstatus_to_exitcode(status)
+    except SandboxIsolationError as e:
+        _report(result_fd, {"result": None, "error": str(e), "isolation_error": True})
+    except BaseException as e:
+        try:
+            _report(result_fd, {"result": None, "error": f"Sandbox error: {type(e).__name__}: {e}"})
+        except OSError:
+            pass
+    finally:
+        os._exit(exit_code)
+
+
+def _read_until(fd: int, deadline: float) -> Optional[bytes]:
+    """
+    Read a pipe until EOF or until the deadline passes.
+
+    Args:
+        fd: Pipe read end
+        deadline: Absolute deadline on the perf_counter clock
+
+    Returns:
+        Data read, or None if the deadline passed first
+    """
+    chunks = []
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return None
+        ready, _, _ = select.select([fd], [], [], remaining)
+        if not ready:
+            return None
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def _read_output(scratch_dir: str, name: str) -> str:
+    """Read a captured output stream, truncated to a bounded size."""
+    try:
+        with open(os.path.join(scratch_dir, name), encoding="utf-8", errors="replace") as stream:
+            return stream.read(MAX_OUTPUT_CHARS)
+    except OSError:
+        return ""
+
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fork a child for the job, enforce the timeout and collect its usage.
+
+    Args:
+        job: Job description
+
+    Returns:
+        Dictionary with the job result and resource usage
+    """
+    scratch_dir = tempfile.mkdtemp(prefix="sandbox-")
+    read_fd, write_fd = os.pipe()
+    start = time.perf_counter()
+    try:
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            _run_child(job, scratch_dir, write_fd)
+        os.close(write_fd)
+
+        data = _read_until(read_fd, start + job["timeout"])
+        timed_out = data is None
+        if timed_out:
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except OSError:
+                os.kill(pid, signal.SIGKILL)
+
+        _, status, usage = os.wait4(pid, 0)
+        wall_time = time.perf_counter() - start
+
+        fields = {
+            "stdout": _read_output(scratch_dir, "stdout.txt"),
+            "stderr": _read_output(scratch_dir, "stderr.txt"),
+            "exit_code": os.waitstatus_to_exitcode(status),
+            "timed_out": timed_out,
+            "peak_rss_kb": usage.ru_maxrss,
+            "cpu_time_s": round(usage.ru_utime + usage.ru_stime, 6),
+            "wall_time_s": round(wall_time, 6)
+        }
+
+        if timed_out:
+            return failure_result("Job timed out", **fields)
+        if not data:
+            if fields["exit_code"] == -signal.SIGXCPU:
+                return failure_result("CPU time limit exceeded", **fields)
+            return failure_result(f"Job terminated with exit code {fields['exit_code']}", **fields)
+
+        message = json.loads(data)
+        if message.get("isolation_error"):
+            return failure_result(message["error"], **fields)
+        result = {"success": message["error"] is None, "result": message["result"], "error": message["error"]}
+        result.update(fields)
+        return result
+    finally:
+        os.close(read_fd)
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def main(preload: Iterable[str]) -> None:
+    """
+    Serve jobs from stdin until it closes.
+
+    Args:
+        preload: Modules to import once so that jobs start warm
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for module in preload:
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+    channel_in, channel_out = sys.stdin.buffer, sys.stdout.buffer
+    while True:
+        try:
+            job = read_message(channel_in)
+        except EOFError:
+            break
+        if job is None:
+            break
+        try:
+            result = run_job(job)
+        except Exception as e:
+            result = failure_result(f"Sandbox worker error: {str(e)}")
+        write_message(channel_out, result)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,400 @@
+"""
+Tracing for the AutoGen multi-agent system.
+Pipeline runs are recorded as span trees: one trace per task, with child
+spans for pipeline stages, model calls and analysis tool invocations. The
+current span is tracked with a context variable, so spans nest correctly
+across asyncio tasks and asyncio.to_thread calls.
+
+Finished spans are exported in batches from a background thread to a JSONL
+file and/or an OpenTelemetry collector (OTLP/HTTP with JSON encoding).
+Sampling is decided once per trace; unsampled traces and code running
+outside any trace create no spans at all.
+"""
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+# Default exporter parameters
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_FLUSH_INTERVAL = 5.0
+DEFAULT_EXPORT_TIMEOUT = 5.0
+MAX_QUEUED_SPANS = 10000
+
+SERVICE_NAME = "autogen-multi-agent-system"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes",
+                 "status", "error")
+
+    def __init__(self, trace_id: str, name: str, parent_id: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None, start_ns: Optional[int] = None):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = dict(attributes or {})
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute on the span."""
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        """Mark the span as failed."""
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """Duration of the finished span in milliseconds."""
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the span for the JSONL exporter."""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error
+        }
+
+
+class JsonlSpanExporter:
+    """Appends finished spans to a JSONL file, one span per line."""
+
+    def __init__(self, path: str):
+        """
+        Create the exporter.
+
+        Args:
+            path: File the spans are appended to
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: List[Span]) -> None:
+        """Write a batch of spans."""
+        with open(self.path, "a", encoding="utf-8") as trace_file:
+            for span in spans:
+                trace_file.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """Encode an attribute value as an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpHttpSpanExporter:
+    """
+    Sends finished spans to an OpenTelemetry collector over OTLP/HTTP.
+    Uses the JSON encoding, so no OpenTelemetry SDK is needed.
+    """
+
+    def __init__(self, endpoint: str, timeout: float = DEFAULT_EXPORT_TIMEOUT,
+                 service_name: str = SERVICE_NAME):
+        """
+        Create the exporter.
+
+        Args:
+            endpoint: Collector traces URL, e.g. http://localhost:4318/v1/traces
+            timeout: Request timeout in seconds
+            service_name: Value of the service.name resource attribute
+        """
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.service_name = service_name
+
+    def encode(self, spans: List[Span]) -> Dict[str, Any]:
+        """Build the OTLP ExportTraceServiceRequest for a batch of spans."""
+        otlp_spans = []
+        for span in spans:
+            otlp_span = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.status == "error" else {"code": 1}
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            otlp_spans.append(otlp_span)
+
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": SERVICE_NAME}, "spans": otlp_spans}]
+            }]
+        }
+
+    def export(self, spans: List[Span]) -> None:
+        """Send a batch of spans."""
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(self.encode(spans)).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class Tracer:
+    """Creates spans and exports them in batches from a background thread."""
+
+    def __init__(self, exporters: List[Any], sample_rate: float = 1.0, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        Create the tracer.
+
+        Args:
+            exporters: Span exporters with an export(spans) method
+            sample_rate: Fraction of traces recorded, between 0 and 1
+            batch_size: Number of queued spans that triggers an export
+            flush_interval: Maximum seconds a span waits before export
+        """
+        self.exporters = exporters
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped_spans = 0
+        self._queue: List[Span] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._export_lock = threading.Lock()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._export_loop, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def is_sampled(self, trace_id: str) -> bool:
+        """Decide deterministically whether a trace is recorded, from the low 64 bits of its ID as OTel does."""
+        if self.sample_rate >= 1.0:
+            return True
+        if self.sample_rate <= 0.0:
+            return False
+        return int(trace_id[-16:], 16) < self.sample_rate * 2 ** 64
+
+    @contextmanager
+    def trace(self, name: str, trace_key: Optional[str] = None, **attributes) -> Iterator[Optional[Span]]:
+        """
+        Start a new trace with a root span.
+
+        Args:
+            name: Root span name
+            trace_key: Value the trace ID is derived from, e.g. the task ID
+            **attributes: Root span attributes
+
+        Yields:
+            The root span, or None if the trace is not sampled
+        """
+        if trace_key is None:
+            trace_id = os.urandom(16).hex()
+        else:
+            trace_id = hashlib.sha256(trace_key.encode("utf-8")).hexdigest()[:32]
+
+        if not self.is_sampled(trace_id):
+            # Shadow any enclosing trace so no child spans are recorded
+            token = _current_span.set(None)
+            try:
+                yield None
+            finally:
+                _current_span.reset(token)
+            return
+
+        with self._run(Span(trace_id, name, attributes=attributes)) as span:
+            yield span
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """
+        Start a child span of the current span.
+
+        Args:
+            name: Span name
+            **attributes: Span attributes
+
+        Yields:
+            The span, or None outside a sampled trace
+        """
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+
+        with self._run(Span(parent.trace_id, name, parent.span_id, attributes)) as span:
+            yield span
+
+    def record_span(self, name: str, start_ns: int, end_ns: int, **attributes) -> None:
+        """
+        Record an already finished child span of the current span, e.g. queueing time.
+
+        Args:
+            name: Span name
+            start_ns: Start time in nanoseconds since the epoch
+            end_ns: End time in nanoseconds since the epoch
+            **attributes: Span attributes
+        """
+        parent = _current_span.get()
+        if parent is None:
+            return
+        span = Span(parent.trace_id, name, parent.span_id, attributes, start_ns=start_ns)
+        span.end_ns = end_ns
+        self._enqueue(span)
+
+    @contextmanager
+    def _run(self, span: Span) -> Iterator[Span]:
+        """Make a span current for the duration of the context."""
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self._enqueue(span)
+
+    def _enqueue(self, span: Span) -> None:
+        """Queue a finished span for export."""
+        with self._lock:
+            if len(self._queue) >= MAX_QUEUED_SPANS:
+                self.dropped_spans += 1
+                return
+            self._queue.append(span)
+            full = len(self._queue) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def _export_loop(self) -> None:
+        """Export queued spans periodically until the tracer is shut down."""
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Export all queued spans now."""
+        with self._export_lock:
+            with self._lock:
+                spans, self._queue = self._queue, []
+            if not spans:
+                return
+            for exporter in self.exporters:
+                try:
+                    exporter.export(spans)
+                except Exception as e:
+                    print(f"Error exporting spans with {type(exporter).__name__}: {e}")
+
+    def shutdown(self) -> None:
+        """Stop the export thread and export the remaining spans."""
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join(timeout=self.flush_interval)
+        self.flush()
+
+
+class _NoopTracer:
+    """Tracer used when tracing is disabled."""
+
+    @contextmanager
+    def trace(self, name: str, trace_key: Optional[str] = None, **attributes) -> Iterator[None]:
+        yield None
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[None]:
+        yield None
+
+    def record_span(self, name: str, start_ns: int, end_ns: int, **attributes) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+
+def get_tracer():
+    """
+    Get the process-wide tracer, configured from the settings.
+
+    Returns:
+        Shared Tracer, or a no-op tracer if tracing is disabled
+    """
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            from config.settings import settings
+            exporters = []
+            if settings.tracing_jsonl_path:
+                exporters.append(JsonlSpanExporter(settings.tracing_jsonl_path))
+            if settings.tracing_otlp_endpoint:
+                exporters.append(OtlpHttpSpanExporter(settings.tracing_otlp_endpoint))
+
+            if settings.tracing_enabled and exporters:
+                _tracer = Tracer(exporters, sample_rate=settings.tracing_sample_rate)
+                atexit.register(_tracer.shutdown)
+            else:
+                _tracer = _NoopTracer()
+        return _tracer
+
+
+def trace_span(name: str, **attributes):
+    """
+    Start a child span of the current span with the process-wide tracer.
+
+    Args:
+        name: Span name
+        **attributes: Span attributes
+
+    Returns:
+        Context manager yielding the span, or None outside a sampled trace
+    """
+    return get_tracer().span(name, **attributes)
+
+
+# Example usage
+if __name__ == "__main__":
+    example_tracer = Tracer([JsonlSpanExporter("traces.jsonl")])
+    with example_tracer.trace("code_generation", trace_key="example-task", task_id="example-task"):
+        with example_tracer.span("stage.codegen", stage="codegen"):
+            time.sleep(0.01)
+    example_tracer.shutdown()
+    print("Spans written to traces.jsonl")
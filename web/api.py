@@ -1,15 +1,27 @@
 """
 API routes for the AutoGen multi-agent code generation web application.
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 import asyncio
+import copy
+import time
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
 
 from config.settings import settings
-from agents.models import CodeGenerationRequest
+from agents.models import ChatMessage, CodeGenerationRequest
+from agents.session_memory import SessionManager, get_session_store
+from agents.usage import track_task_usage, usage_stage, usage_tracker
+from utils.result_cache import get_result_cache
+from utils.tracing import get_tracer, trace_span
+from web.job_queue import get_job_queue
+from web.payloads import normalize_result, resolve_result, select_fields
+from web.scheduler import ANONYMOUS_CLIENT, FairScheduler, class_weight, client_identity, configured_weights
+from web.serialization import SerializedCache, dumps
+from web.task_store import get_task_store
 
 # Create API router
 api_router = APIRouter(prefix="/api/v1")
@@ -26,11 +38,14 @@ class CodeGenerationResponse(BaseModel):
 class TaskStatusResponse(BaseModel):
     """Response model for task status."""
     task_id: str
-    status: str  # pending, processing, completed, failed
+    status: str  # pending, processing, interrupted, completed, failed
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    version: int = 0
+    stages: Optional[Dict[str, Any]] = None  # stage -> status, started_at, finished_at
+    queue: Optional[Dict[str, Any]] = None  # position and estimated_start while pending
 
 
 class AgentResponse(BaseModel):
@@ -40,55 +55,432 @@ class AgentResponse(BaseModel):
     status: str
 
 
-# In-memory storage for tasks (in production, use a database)
-tasks_storage = {}
+# Task storage, in memory or shared by all worker processes
+tasks_storage = get_task_store(settings.task_backend, settings.task_db_path, settings.task_poll_interval)
 
+# Conversation sessions the code generation requests are recorded in
+session_manager = SessionManager(get_session_store(settings.session_backend, settings.session_db_path))
 
-async def process_code_generation(task_id: str, request: CodeGenerationRequest):
-    """Process code generation in the background."""
-    try:
-        # Update task status
-        tasks_storage[task_id]["status"] = "processing"
-        tasks_storage[task_id]["updated_at"] = datetime.now()
-        
-        # Import agents here to avoid circular imports
-        from agents.requirements_agent import analyze_requirements
-        from agents.codegen_agent import generate_code
-        from agents.review_agent import review_code
-        from agents.optimization_agent import optimize_code
-        from agents.testing_agent import generate_tests
-        
-        # Step 1: Analyze requirements
-        specification = await analyze_requirements(request.requirements)
-        
-        # Step 2: Generate code
-        generated_code = await generate_code(specification)
+# Upper bound of the code-status long-poll wait in seconds
+MAX_STATUS_WAIT = 60.0
+
+# Serialized code-status bodies per task version and field selection
+status_cache = SerializedCache(settings.status_cache_entries)
+
+# Schedules the pipelines run in this process (inline mode), and whether new ones may start
+scheduler = FairScheduler(settings.pipeline_concurrency, configured_weights())
+accepting_work = True
+
+INTERRUPTED_ERROR = "Interrupted by server shutdown"
+
+
+def lease_expiry() -> float:
+    """Get the expiry time of a task lease taken or renewed now."""
+    return time.time() + settings.task_lease_seconds
+
+
+def create_task(task_id: Optional[str] = None, request: Optional[CodeGenerationRequest] = None,
+                client: str = ANONYMOUS_CLIENT) -> str:
+    """
+    Store the initial status of a new code generation task.
+    
+    Args:
+        task_id: Task ID to use, a random one by default
+        request: Code generation request, stored so the task can be resumed
+        client: Identity of the client the task is scheduled for
         
-        # Step 3: Review code
-        review_result = await review_code(generated_code)
+    Returns:
+        The task ID
+    """
+    task_id = task_id or str(uuid.uuid4())
+    tasks_storage[task_id] = {
+        "status": "pending",
+        "result": None,
+        "error": None,
+        "created_at": datetime.now(),
+        "updated_at": datetime.now(),
+        "queued_at": datetime.now(),
+        "version": 0,
+        "request": request.model_dump() if request is not None else None,
+        "client": client
+    }
+    tasks_storage.set_lease(task_id, lease_expiry())
+    return task_id
+
+
+def update_task(task_id: str, **changes) -> None:
+    """
+    Update a task, bump its version and wake the clients long-polling it.
+    
+    Args:
+        task_id: Task ID
+        **changes: Task fields to set
+    """
+    tasks_storage.update(task_id, **changes)
+
+
+async def wait_for_task_change(task_id: str, version: int, timeout: float) -> None:
+    """
+    Wait until a task's version differs from the given one, or the timeout elapses.
+    
+    Args:
+        task_id: Task ID
+        version: Version the client already has
+        timeout: Maximum wait in seconds
+    """
+    await tasks_storage.wait_for_change(task_id, version, timeout)
+
+
+def task_etag(task: Dict[str, Any], queue: Optional[Dict[str, Any]] = None) -> str:
+    """Build the ETag of a task from its version, and its queue position while it waits."""
+    if queue is not None:
+        return f'W/"{task.get("version", 0)}.{queue["position"]}"'
+    return f'W/"{task.get("version", 0)}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check whether an If-None-Match header matches an ETag."""
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    # Weak comparison: W/"1" matches "1"
+    return etag in candidates or etag[2:] in candidates
+
+
+@contextmanager
+def pipeline_stage(stage: str):
+    """Attribute token usage and a trace span to a pipeline stage."""
+    with usage_stage(stage), trace_span(f"stage.{stage}", stage=stage):
+        yield
+
+
+# Pipeline stages in execution order
+PIPELINE_STAGES = ("requirements", "codegen", "refinement", "review", "optimization", "testing")
+
+
+class StageProgress:
+    """
+    Per-stage status and partial result of a task, published as each stage lands.
+    The partial result doubles as the task's checkpoint: a task that stopped
+    before completing resumes with the output of its completed stages.
+    """
+    
+    def __init__(self, task_id: str, refine: bool = False, checkpoint: Optional[Dict[str, Any]] = None):
+        """
+        Create the progress record of a task.
         
-        # Step 4: Optimize code
-        optimization_result = await optimize_code(generated_code)
+        Args:
+            task_id: Task ID
+            refine: Whether the refinement stage runs
+            checkpoint: Stored task to resume from, if any
+        """
+        self.task_id = task_id
+        self.stages = {stage: {"status": "pending"} for stage in PIPELINE_STAGES}
+        if not refine:
+            self.stages["refinement"]["status"] = "skipped"
+        self.outputs: Dict[str, Any] = {}
         
-        # Step 5: Generate tests
-        test_result = await generate_tests(generated_code)
+        if checkpoint and checkpoint.get("stages") and checkpoint.get("result"):
+            self.outputs = resolve_result(checkpoint["result"])
+            for key in ("usage", "skipped_stages"):
+                self.outputs.pop(key, None)
+            for stage, record in checkpoint["stages"].items():
+                if stage in self.stages and record.get("status") == "completed":
+                    self.stages[stage] = record
+    
+    def completed(self, stage: str) -> bool:
+        """Check whether a stage's output is already available, e.g. from a checkpoint."""
+        return self.stages[stage]["status"] == "completed"
+    
+    def publish(self, **changes) -> None:
+        """Store the stage statuses and the partial result in the task."""
+        result = normalize_result(self.outputs) if self.outputs else None
+        update_task(self.task_id, stages=copy.deepcopy(self.stages), result=result, **changes)
+    
+    def interrupt(self) -> None:
+        """Store the task as interrupted, so the running stage is rerun when it resumes."""
+        for stage, record in self.stages.items():
+            if record["status"] == "running":
+                self.stages[stage] = {"status": "pending"}
+        self.publish(status="interrupted", error=INTERRUPTED_ERROR)
+    
+    def skip(self, stage: str) -> None:
+        """Mark a stage as skipped."""
+        self.stages[stage] = {"status": "skipped"}
+    
+    @contextmanager
+    def stage(self, stage: str):
+        """Run a pipeline stage, publishing when it starts and when its output lands."""
+        record = {"status": "running", "started_at": datetime.now().isoformat()}
+        self.stages[stage] = record
+        self.publish()
+        try:
+            with pipeline_stage(stage):
+                yield
+        except Exception:
+            record.update(status="failed", finished_at=datetime.now().isoformat())
+            raise
+        record.update(status="completed", finished_at=datetime.now().isoformat())
+        self.publish()
+
+
+async def process_code_generation(task_id: str, request: CodeGenerationRequest):
+    """
+    Process code generation in the background.
+    
+    Stage statuses and the partial result are stored in the task as each
+    stage completes, so clients can show the output of a stage as soon as
+    it lands. Stages already completed by an earlier run of the task are
+    not run again.
+    """
+    tracer = get_tracer()
+    progress = StageProgress(task_id, refine=request.refine, checkpoint=tasks_storage.get(task_id))
+    with tracer.trace("code_generation", trace_key=task_id, task_id=task_id, refine=request.refine) as root:
+        try:
+            # Record the time the task waited since it was last queued, not earlier runs of a resumed task
+            task = tasks_storage[task_id]
+            queued_ns = int(task.get("queued_at", task["created_at"]).timestamp() * 1e9)
+            tracer.record_span("queue", queued_ns, time.time_ns())
+            
+            # Update task status
+            tasks_storage.set_lease(task_id, lease_expiry())
+            progress.publish(status="processing", error=None)
+            
+            # Import agents here to avoid circular imports
+            from agents.requirements_agent import analyze_requirements
+            from agents.codegen_agent import generate_code
+            from agents.review_agent import review_code
+            from agents.optimization_agent import optimize_code
+            from agents.testing_agent import generate_tests
+            from agents.refinement import refine_code
+            
+            # Optional stages are skipped once the task's token budget is used up
+            skipped_stages = []
+            
+            def within_budget(stage: str) -> bool:
+                if task_usage.budget_exceeded:
+                    skipped_stages.append(stage)
+                    progress.skip(stage)
+                    return False
+                return True
+            
+            outputs = progress.outputs
+            with track_task_usage(settings.task_token_budget) as task_usage:
+                # Step 1: Analyze requirements
+                if not progress.completed("requirements"):
+                    with progress.stage("requirements"):
+                        outputs["specification"] = await analyze_requirements(request.requirements)
+                specification = outputs["specification"]
+                
+                # Step 2: Generate code
+                if not progress.completed("codegen"):
+                    with progress.stage("codegen"):
+                        outputs["generated_code"] = await generate_code(specification)
+                
+                # Optionally fix the code until the local checks pass
+                if request.refine and not progress.completed("refinement") and within_budget("refinement"):
+                    with progress.stage("refinement"):
+                        refinement_result = await refine_code(specification, outputs["generated_code"])
+                        outputs["generated_code"] = refinement_result.code
+                        outputs["refinement_result"] = refinement_result.model_dump(mode="json")
+                generated_code = outputs["generated_code"]
+                
+                # Step 3: Review code
+                if not progress.completed("review") and within_budget("review"):
+                    with progress.stage("review"):
+                        review_result = await review_code(generated_code)
+                        outputs["review_result"] = review_result.model_dump(mode="json")
+                
+                # Step 4: Optimize code
+                if not progress.completed("optimization") and within_budget("optimization"):
+                    with progress.stage("optimization"):
+                        optimization_result = await optimize_code(generated_code)
+                        outputs["optimization_result"] = optimization_result.model_dump(mode="json")
+                
+                # Step 5: Generate tests
+                if not progress.completed("testing") and within_budget("testing"):
+                    with progress.stage("testing"):
+                        refinement_result = outputs.get("refinement_result")
+                        test_result = await generate_tests(
+                            generated_code,
+                            test_code=refinement_result["test_code"] if refinement_result else None
+                        )
+                        outputs["test_result"] = test_result.model_dump(mode="json")
+            
+            # Record the request and its code in the client's conversation session
+            if request.session_id:
+                record_session_turn(request.session_id, request.requirements, generated_code,
+                                    user_id=tasks_storage[task_id].get("client"))
+            
+            # Store final result
+            with trace_span("serialize_result"):
+                for key in ("review_result", "optimization_result", "test_result", "refinement_result"):
+                    outputs.setdefault(key, None)
+                outputs["usage"] = task_usage.to_dict()
+                outputs["skipped_stages"] = skipped_stages
+                progress.publish(status="completed")
+            
+        except asyncio.CancelledError:
+            # Cancelled at shutdown: the completed stages stay as the checkpoint
+            progress.interrupt()
+            raise
+        except Exception as e:
+            if root is not None:
+                root.record_error(e)
+            # Store error, keeping the output of the stages that completed as the checkpoint
+            progress.publish(status="failed", error=str(e))
+
+
+def record_session_turn(session_id: str, requirements: str, generated_code: str,
+                        user_id: Optional[str] = None) -> None:
+    """
+    Record a completed request and its generated code in a conversation session.
+    
+    Args:
+        session_id: Session ID
+        requirements: Requirements of the request
+        generated_code: Final generated code
+        user_id: User the session is created for, if it is new
+    """
+    memory = session_manager.get(session_id, user_id=user_id)
+    memory.add_message(ChatMessage(role="user", content=requirements))
+    memory.add_message(ChatMessage(role="assistant", content=generated_code))
+    session_manager.save(session_id)
+
+
+def start_pipeline(task_id: str, request: CodeGenerationRequest, client: str = ANONYMOUS_CLIENT) -> None:
+    """
+    Queue a task's pipeline by priority class and client, in this process or for the pipeline workers.
+    
+    Args:
+        task_id: Task ID
+        request: Code generation request
+        client: Identity of the client the task is scheduled for
+    """
+    if settings.pipeline_mode == "worker":
+        get_job_queue().enqueue(task_id, request.model_dump(), priority=request.priority, client=client)
+    else:
+        scheduler.submit(task_id, lambda: process_code_generation(task_id, request),
+                         priority=request.priority, client=client)
+
+
+def queue_status(task_id: str) -> Optional[Dict[str, Any]]:
+    """Get the queue position and estimated start time of a pending task, if it is queued."""
+    if settings.pipeline_mode == "worker":
+        return get_job_queue().queue_status(task_id)
+    return scheduler.queue_status(task_id)
+
+
+def stop_accepting_work() -> None:
+    """Refuse new code generation and resume requests, e.g. while shutting down."""
+    global accepting_work
+    accepting_work = False
+
+
+async def renew_task_leases() -> None:
+    """
+    Renew the leases of the tasks queued and running in this process until cancelled.
+    
+    A pending or processing task whose lease expired was left behind by a
+    server process that died; the next server process to start resumes it.
+    Leases are per task, so sibling uvicorn workers never resume each
+    other's live tasks. They are stored apart from the task record, so
+    renewing them does not bump the task version or wake long-polling clients.
+    """
+    while True:
+        await asyncio.sleep(settings.task_lease_seconds / 3)
+        expires = lease_expiry()
+        for task_id in scheduler.task_ids():
+            if task_id in tasks_storage:
+                tasks_storage.set_lease(task_id, expires)
+
+
+async def drain_pipelines(timeout: float) -> int:
+    """
+    Wait for the running pipelines to finish, and interrupt the ones still running at the deadline.
+    
+    Queued pipelines are not started. Interrupted tasks keep their completed
+    stages as the checkpoint and are resumed by the next server run.
+    
+    Args:
+        timeout: Seconds to wait for the pipelines
         
-        # Store final result
-        tasks_storage[task_id]["status"] = "completed"
-        tasks_storage[task_id]["result"] = {
-            "specification": specification,
-            "generated_code": generated_code,
-            "review_result": review_result.dict(),
-            "optimization_result": optimization_result.dict(),
-            "test_result": test_result.dict()
-        }
-        tasks_storage[task_id]["updated_at"] = datetime.now()
+    Returns:
+        Number of interrupted pipelines, queued ones included
+    """
+    queued = scheduler.cancel_queued()
+    for task_id in queued:
+        update_task(task_id, status="interrupted", error=INTERRUPTED_ERROR)
+    
+    pending = set(scheduler.running)
+    if pending:
+        _, pending = await asyncio.wait(pending, timeout=timeout)
+    for pipeline in pending:
+        pipeline.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    return len(queued) + len(pending)
+
+
+def resume_task(task_id: str, stale_before: Optional[float] = None) -> bool:
+    """
+    Rerun a task's failed and missing stages from its last checkpoint.
+    
+    Args:
+        task_id: Task ID
+        stale_before: Only resume the task if its lease expired before this time
         
-    except Exception as e:
-        # Store error
-        tasks_storage[task_id]["status"] = "failed"
-        tasks_storage[task_id]["error"] = str(e)
-        tasks_storage[task_id]["updated_at"] = datetime.now()
+    Returns:
+        True if the task was resumed, False if its request was not stored,
+        its lease is still live or another server claimed it first
+    """
+    task = tasks_storage[task_id]
+    if not task.get("request"):
+        return False
+    # Taking the lease only while it is stale keeps a task renewed by its own server from being resumed
+    if not tasks_storage.set_lease(task_id, lease_expiry(), expired_by=stale_before):
+        return False
+    # Claiming the task at the version just read keeps concurrent servers from resuming it twice
+    if tasks_storage.update(task_id, expected_version=task.get("version", 0),
+                            status="pending", error=None, queued_at=datetime.now()) is None:
+        return False
+    start_pipeline(task_id, CodeGenerationRequest(**task["request"]), client=task.get("client", ANONYMOUS_CLIENT))
+    return True
+
+
+def reconcile_interrupted_tasks() -> Dict[str, List[str]]:
+    """
+    Resume or fail the tasks a previous server run left unfinished.
+    
+    Tasks interrupted at shutdown, and pending or processing tasks whose lease
+    expired because their server process crashed, are resumed from their
+    checkpoint; the ones whose request was not stored are marked failed
+    instead of staying processing forever.
+    In worker mode the job queue hands interrupted jobs to another worker
+    once their lease expires, so nothing is reconciled here.
+    
+    Returns:
+        Dictionary with the IDs of the resumed and the failed tasks
+    """
+    reconciled = {"resumed": [], "failed": []}
+    if settings.pipeline_mode == "worker":
+        return reconciled
+    for task_id in tasks_storage:
+        task = tasks_storage.get(task_id)
+        # Skip records that are not tasks
+        if not isinstance(task, dict) or "status" not in task:
+            continue
+        # Pending and processing tasks with a live lease are still running in another server process
+        now = time.time()
+        stuck = task["status"] in ("pending", "processing") and (tasks_storage.lease_expires(task_id) or 0) < now
+        if task["status"] != "interrupted" and not stuck:
+            continue
+        if resume_task(task_id, stale_before=now if stuck else None):
+            reconciled["resumed"].append(task_id)
+        elif not task.get("request"):
+            tasks_storage.update(task_id, expected_version=task.get("version", 0),
+                                 status="failed", error="Interrupted by a server restart")
+            reconciled["failed"].append(task_id)
+    return reconciled
 
 
 # API routes
@@ -105,22 +497,27 @@ async def get_api_info():
 
 
 @api_router.post("/generate-code", response_model=CodeGenerationResponse)
-async def generate_code(request: CodeGenerationRequest):
-    """Generate code based on requirements."""
-    # Create a task ID
-    task_id = str(uuid.uuid4())
+async def generate_code(request: CodeGenerationRequest, http_request: Request):
+    """
+    Generate code based on requirements.
     
-    # Store initial task status
-    tasks_storage[task_id] = {
-        "status": "pending",
-        "result": None,
-        "error": None,
-        "created_at": datetime.now(),
-        "updated_at": datetime.now()
-    }
+    Tasks are scheduled fairly across clients, identified by the API key
+    header, and by priority class: "interactive" tasks get a larger share
+    of the pipeline capacity than "batch" tasks.
+    """
+    if not accepting_work:
+        raise HTTPException(status_code=503, detail="Server is shutting down")
+    try:
+        class_weight(request.priority, scheduler.weights)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Start processing in background
-    asyncio.create_task(process_code_generation(task_id, request))
+    # Create the task with its initial status
+    client = client_identity(http_request.headers.get(settings.scheduler_client_header))
+    task_id = create_task(request=request, client=client)
+    
+    # Queue it to run in the background, here or in the pipeline workers
+    start_pipeline(task_id, request, client=client)
     
     return CodeGenerationResponse(
         task_id=task_id,
@@ -128,23 +525,92 @@ async def generate_code(request: CodeGenerationRequest):
     )
 
 
-@api_router.get("/code-status/{task_id}", response_model=TaskStatusResponse)
-async def get_code_status(task_id: str):
-    """Get the status of a code generation task."""
+@api_router.post("/tasks/{task_id}/resume", response_model=CodeGenerationResponse)
+async def resume_code_generation(task_id: str):
+    """
+    Resume a failed task.
+    
+    Only the stages that failed or did not run are run again; the output of
+    the completed stages is reused from the task's checkpoint.
+    """
+    if not accepting_work:
+        raise HTTPException(status_code=503, detail="Server is shutting down")
     if task_id not in tasks_storage:
         raise HTTPException(status_code=404, detail="Task not found")
     
     task = tasks_storage[task_id]
-    return TaskStatusResponse(
+    if task["status"] != "failed":
+        raise HTTPException(status_code=409, detail=f"Only failed tasks can be resumed, task is {task['status']}")
+    if not resume_task(task_id):
+        raise HTTPException(status_code=409, detail="Task cannot be resumed")
+    
+    return CodeGenerationResponse(
         task_id=task_id,
-        status=task["status"],
-        result=task["result"],
-        error=task["error"],
-        created_at=task["created_at"],
-        updated_at=task["updated_at"]
+        message="Code generation task resumed"
     )
 
 
+@api_router.get("/code-status/{task_id}", response_model=TaskStatusResponse)
+async def get_code_status(task_id: str, fields: Optional[str] = None,
+                          include_code: bool = True, wait: float = Query(0.0, ge=0.0),
+                          if_none_match: Optional[str] = Header(None)):
+    """
+    Get the status of a code generation task.
+    
+    The result holds each piece of code once, in "artifacts", keyed by the
+    ids found in the code fields. `fields` selects result fields as a
+    comma-separated list (dotted for nested fields); `include_code=false`
+    leaves out the artifacts.
+    
+    A pending task reports its queue position and estimated start time in
+    "queue".
+    
+    The ETag is the task version, plus the queue position while the task
+    waits. A request whose If-None-Match matches it gets 304 Not Modified;
+    with `wait=N` it is first held for up to N seconds until the task
+    changes.
+    
+    The serialized body is cached per task version, so polling an
+    unchanged task does not serialize its result again.
+    """
+    if task_id not in tasks_storage:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    task = tasks_storage[task_id]
+    queue = queue_status(task_id) if task["status"] == "pending" else None
+    if etag_matches(if_none_match, task_etag(task, queue)):
+        if wait > 0 and task["status"] not in ("completed", "failed"):
+            await wait_for_task_change(task_id, task.get("version", 0), min(wait, MAX_STATUS_WAIT))
+        task = tasks_storage[task_id]
+        queue = queue_status(task_id) if task["status"] == "pending" else None
+        if etag_matches(if_none_match, task_etag(task, queue)):
+            return Response(status_code=304, headers={"ETag": task_etag(task, queue)})
+    
+    headers = {"ETag": task_etag(task, queue)}
+    cache_key = (task_id, task.get("version", 0), fields, include_code)
+    # Queued tasks have no result yet, and their estimated start time changes
+    body = status_cache.get(cache_key) if queue is None else None
+    if body is None:
+        result = task["result"]
+        if result is not None:
+            selected = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+            result = select_fields(result, selected, include_code=include_code)
+        body = dumps({
+            "task_id": task_id,
+            "status": task["status"],
+            "result": result,
+            "error": task["error"],
+            "created_at": task["created_at"],
+            "updated_at": task["updated_at"],
+            "version": task.get("version", 0),
+            "stages": task.get("stages"),
+            "queue": queue
+        })
+        if queue is None:
+            status_cache.put(cache_key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @api_router.get("/agents", response_model=List[AgentResponse])
 async def list_agents():
     """List all available agents."""
@@ -185,6 +651,26 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now()}
 
 
+@api_router.get("/cache/stats")
+async def get_cache_stats():
+    """Get static analysis result cache statistics."""
+    return get_result_cache().stats()
+
+
+@api_router.get("/queue/stats")
+async def get_queue_stats():
+    """Get pipeline job counts per status in worker mode."""
+    if settings.pipeline_mode != "worker":
+        return {"pipeline_mode": settings.pipeline_mode}
+    return {"pipeline_mode": settings.pipeline_mode, "jobs": get_job_queue().stats()}
+
+
+@api_router.get("/usage")
+async def get_usage():
+    """Get aggregate LLM token usage and cost per model and per stage."""
+    return usage_tracker.stats()
+
+
 @api_router.get("/config")
 async def get_config():
     """Get application configuration."""
@@ -60,7 +60,7 @@ async function handleFormSubmit(e) {
         
         // Show status card
         showStatusCard();
-        updateStatus('Processing...', 'processing', 30);
+        updateStatus('Queued...', 'processing', 0);
         
         // Poll for task status
         await pollTaskStatus(taskId);
@@ -72,58 +72,142 @@ async function handleFormSubmit(e) {
     }
 }
 
+// Long-poll wait, and backoff after failed polls, in seconds and milliseconds
+const STATUS_WAIT_SECONDS = 20;
+const MIN_POLL_DELAY_MS = 500;
+const MAX_POLL_DELAY_MS = 15000;
+const MAX_POLL_FAILURES = 5;
+
 /**
  * Poll for task status
+ *
+ * Each request long-polls with the last seen ETag, so the server answers as
+ * soon as the task changes and 304 once the wait elapses without a change.
+ * Either way the next poll starts right away, since the server does the
+ * waiting. Only network errors and 5xx answers back off exponentially; other
+ * errors stop polling.
  */
 async function pollTaskStatus(taskId) {
-    try {
-        const response = await fetch(`/api/v1/code-status/${taskId}`);
-        
-        if (!response.ok) {
-            throw new Error(`Failed to get task status: ${response.status} ${response.statusText}`);
+    let etag = null;
+    let delay = 0;
+    let failures = 0;
+    
+    while (true) {
+        let data = null;
+        try {
+            const headers = etag ? { 'If-None-Match': etag } : {};
+            const response = await fetch(`/api/v1/code-status/${taskId}?wait=${STATUS_WAIT_SECONDS}`, { headers });
+            
+            if (response.status >= 500) {
+                throw new Error(`Failed to get task status: ${response.status} ${response.statusText}`);
+            }
+            if (!response.ok && response.status !== 304) {
+                updateStatus(`Error: ${response.status} ${response.statusText}`, 'failed', 0);
+                resetForm();
+                return;
+            }
+            if (response.status !== 304) {
+                etag = response.headers.get('ETag');
+                data = await response.json();
+            }
+            delay = 0;
+            failures = 0;
+        } catch (error) {
+            console.error('Error polling task status:', error);
+            if (++failures >= MAX_POLL_FAILURES) {
+                updateStatus('Error: ' + error.message, 'failed', 0);
+                resetForm();
+                return;
+            }
+            delay = Math.min(Math.max(delay * 2, MIN_POLL_DELAY_MS), MAX_POLL_DELAY_MS);
         }
         
-        const data = await response.json();
+        if (data) {
+            const progress = stageProgress(data.stages);
+            if (data.result) {
+                showResults(data.result, data.status !== 'completed');
+            }
+            if (data.status === 'completed') {
+                updateStatus('Completed!', 'completed', 100);
+                resetForm();
+                return;
+            }
+            if (data.status === 'failed') {
+                updateStatus('Failed: ' + data.error, 'failed', progress.percent);
+                resetForm();
+                return;
+            }
+            if (data.status === 'interrupted') {
+                // The server restarted; the task resumes from its completed stages
+                updateStatus('Interrupted, waiting to resume...', 'processing', progress.percent);
+            } else {
+                updateStatus(progress.running ? `Running ${progress.running}...` : queueText(data.queue), 'processing', progress.percent);
+            }
+        }
         
-        if (data.status === 'completed') {
-            // Task completed, show results
-            showResults(data.result);
-            updateStatus('Completed!', 'completed', 100);
-            resetForm();
-        } else if (data.status === 'failed') {
-            // Task failed
-            updateStatus('Failed: ' + data.error, 'failed', 0);
-            resetForm();
-        } else {
-            // Still processing, continue polling
-            updateStatus('Processing...', 'processing', 60);
-            setTimeout(() => pollTaskStatus(taskId), 2000);
+        if (delay) {
+            await new Promise(resolve => setTimeout(resolve, delay));
         }
-    } catch (error) {
-        console.error('Error polling task status:', error);
-        updateStatus('Error: ' + error.message, 'failed', 0);
-        resetForm();
     }
 }
 
+/**
+ * Describe the queue position and estimated start time of a pending task
+ */
+function queueText(queue) {
+    if (!queue) {
+        return 'Queued...';
+    }
+    const start = new Date(queue.estimated_start).toLocaleTimeString();
+    return queue.position > 0
+        ? `Queued: ${queue.position} ahead, starting around ${start}`
+        : `Queued: next, starting around ${start}`;
+}
+
+/**
+ * Summarize per-stage statuses as a progress percentage and the running stage
+ */
+function stageProgress(stages) {
+    const entries = Object.entries(stages || {});
+    if (!entries.length) {
+        return { percent: 0, running: null };
+    }
+    const done = entries.filter(([, stage]) => ['completed', 'skipped'].includes(stage.status)).length;
+    const running = entries.find(([, stage]) => stage.status === 'running');
+    return {
+        percent: Math.round(done / entries.length * 100),
+        running: running ? running[0] : null
+    };
+}
+
 /**
  * Show results in the UI with formatted code
  */
-function showResults(result) {
+function showResults(result, partial) {
     // Show result card
-    document.getElementById('resultCard').style.display = 'block';
+    const resultCard = document.getElementById('resultCard');
+    const firstShown = resultCard.style.display !== 'block';
+    resultCard.style.display = 'block';
+    
+    // Code fields hold artifact ids; the code itself is stored once in result.artifacts
+    const artifacts = result.artifacts || {};
+    const code = (id) => (id && artifacts[id]) || id;
+    // Stages that have not finished yet are shown as pending while the task runs
+    const missing = (text) => partial ? 'Pending...' : text;
     
     // Populate results with formatted code
-    document.getElementById('generatedCode').innerHTML = formatCodeOutput(result.generated_code || 'No code generated');
-    document.getElementById('codeReview').innerHTML = formatCodeOutput(JSON.stringify(result.review_result, null, 2));
-    document.getElementById('optimizedCode').innerHTML = formatCodeOutput(result.optimization_result?.optimized_code || 'No optimized code');
-    document.getElementById('testCode').innerHTML = formatCodeOutput(result.test_result?.test_code || 'No tests generated');
+    document.getElementById('generatedCode').innerHTML = formatCodeOutput(code(result.generated_code) || missing('No code generated'));
+    document.getElementById('codeReview').innerHTML = formatCodeOutput(result.review_result ? JSON.stringify(result.review_result, null, 2) : missing('No review'));
+    document.getElementById('optimizedCode').innerHTML = formatCodeOutput(code(result.optimization_result?.optimized_code) || missing('No optimized code'));
+    document.getElementById('testCode').innerHTML = formatCodeOutput(code(result.test_result?.test_code) || missing('No tests generated'));
     
     // Apply syntax highlighting
     applySyntaxHighlighting();
     
-    // Scroll to results
-    document.getElementById('resultCard').scrollIntoView({ behavior: 'smooth' });
+    // Scroll to results the first time they appear
+    if (firstShown) {
+        resultCard.scrollIntoView({ behavior: 'smooth' });
+    }
 }
 
 /**
@@ -0,0 +1,262 @@
+"""
+Durable job queue for the AutoGen multi-agent code generation web application.
+In worker mode the API enqueues pipeline jobs here and separately launched
+worker processes (python -m web.worker) claim and run them. The queue is a
+SQLite table in WAL mode, so jobs survive restarts of both sides.
+
+Claimed jobs hold a lease that the worker renews while it runs them. A job
+whose lease expires, because its worker died, is claimed again by another
+worker, up to a maximum number of attempts.
+
+Jobs are claimed in weighted fair order across priority classes and
+clients (see web/scheduler.py) rather than first in, first out.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from web.scheduler import (ANONYMOUS_CLIENT, DEFAULT_PIPELINE_SECONDS, class_weight, configured_weights,
+                           estimate_start, finish_tag)
+
+DEFAULT_LEASE_SECONDS = 60.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+_queues: Dict[str, "JobQueue"] = {}
+_queues_lock = threading.Lock()
+
+# Columns added after the first release of the jobs table
+_SCHEDULING_COLUMNS = (
+    ("priority", "TEXT NOT NULL DEFAULT 'interactive'"),
+    ("client", "TEXT NOT NULL DEFAULT ''"),
+    ("finish_tag", "REAL NOT NULL DEFAULT 0"),
+    ("started_at", "REAL"),
+    ("finished_at", "REAL")
+)
+
+# Completed jobs the average pipeline duration is computed from
+DURATION_SAMPLE = 50
+
+
+class JobQueue:
+    """A durable, weighted fair queue of pipeline jobs in a SQLite database."""
+
+    def __init__(self, path: str, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, weights: Optional[Dict[str, float]] = None):
+        """
+        Open the queue.
+
+        Args:
+            path: Database file
+            lease_seconds: Seconds a claimed job stays reserved without a heartbeat
+            max_attempts: Number of claims after which an abandoned job is given up
+            weights: Scheduling weight per priority class
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.weights = weights
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, task_id TEXT NOT NULL, payload TEXT NOT NULL, "
+            "status TEXT NOT NULL, worker TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+            "enqueued_at REAL NOT NULL, lease_expires REAL, error TEXT)"
+        )
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+        for name, definition in _SCHEDULING_COLUMNS:
+            if name not in columns:
+                connection.execute(f"ALTER TABLE jobs ADD COLUMN {name} {definition}")
+        connection.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+        connection.execute("CREATE INDEX IF NOT EXISTS jobs_order ON jobs (status, finish_tag, id)")
+        connection.execute("CREATE INDEX IF NOT EXISTS jobs_flow ON jobs (priority, client, finish_tag)")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS scheduler (id INTEGER PRIMARY KEY CHECK (id = 0), virtual_time REAL NOT NULL)"
+        )
+        connection.execute("INSERT OR IGNORE INTO scheduler (id, virtual_time) VALUES (0, 0)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection to the database."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def enqueue(self, task_id: str, payload: Dict[str, Any], priority: str = "interactive",
+                client: str = ANONYMOUS_CLIENT) -> int:
+        """
+        Add a job to the queue.
+
+        Args:
+            task_id: Task the job runs the pipeline for
+            payload: Code generation request fields
+            priority: Priority class
+            client: Client identity
+
+        Returns:
+            Job ID
+
+        Raises:
+            ValueError: If the priority class is unknown
+        """
+        weight = class_weight(priority, self.weights)
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            virtual_time = connection.execute("SELECT virtual_time FROM scheduler WHERE id = 0").fetchone()[0]
+            last_finish = connection.execute(
+                "SELECT MAX(finish_tag) FROM jobs WHERE priority = ? AND client = ?", (priority, client)
+            ).fetchone()[0]
+            cursor = connection.execute(
+                "INSERT INTO jobs (task_id, payload, status, enqueued_at, priority, client, finish_tag) "
+                "VALUES (?, ?, 'queued', ?, ?, ?, ?)",
+                (task_id, json.dumps(payload), time.time(), priority, client,
+                 finish_tag(virtual_time, last_finish or 0.0, weight))
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return cursor.lastrowid
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """
+        Reserve the queued job with the lowest finish tag, or a running job whose lease expired.
+
+        Args:
+            worker: Identifier of the claiming worker
+
+        Returns:
+            Job with id, task_id, payload and attempts, or None if there is none
+        """
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT id, task_id, payload, attempts, finish_tag FROM jobs "
+                "WHERE status = 'queued' OR (status = 'running' AND lease_expires < ?) "
+                "ORDER BY finish_tag, id LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, lease_expires = ?, "
+                    "started_at = ? WHERE id = ?",
+                    (worker, now + self.lease_seconds, now, row[0])
+                )
+                connection.execute("UPDATE scheduler SET virtual_time = MAX(virtual_time, ?) WHERE id = 0", (row[4],))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        return {"id": row[0], "task_id": row[1], "payload": json.loads(row[2]), "attempts": row[3] + 1}
+
+    def heartbeat(self, job_id: int) -> None:
+        """
+        Renew the lease of a running job.
+
+        Args:
+            job_id: Job ID
+        """
+        self._connection().execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = 'running'",
+            (time.time() + self.lease_seconds, job_id)
+        )
+
+    def complete(self, job_id: int) -> None:
+        """Mark a job as done."""
+        self._connection().execute(
+            "UPDATE jobs SET status = 'done', lease_expires = NULL, finished_at = ? WHERE id = ?",
+            (time.time(), job_id)
+        )
+
+    def fail(self, job_id: int, error: str) -> None:
+        """Mark a job as failed for good."""
+        self._connection().execute(
+            "UPDATE jobs SET status = 'failed', lease_expires = NULL, error = ? WHERE id = ?",
+            (error, job_id)
+        )
+
+    def queue_status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the queue position and estimated start time of a task's queued job.
+
+        The estimate assumes the workers keep running as many jobs as they do
+        now, each taking the average duration of the recently completed jobs.
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            Dictionary with position and estimated_start, or None if the task has no queued job
+        """
+        connection = self._connection()
+        job = connection.execute(
+            "SELECT id, finish_tag FROM jobs WHERE task_id = ? AND status = 'queued' ORDER BY id DESC LIMIT 1",
+            (task_id,)
+        ).fetchone()
+        if job is None:
+            return None
+        position = connection.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND (finish_tag < ? OR (finish_tag = ? AND id < ?))",
+            (job[1], job[1], job[0])
+        ).fetchone()[0]
+        running = connection.execute("SELECT COUNT(*) FROM jobs WHERE status = 'running'").fetchone()[0]
+        average = connection.execute(
+            "SELECT AVG(finished_at - started_at) FROM (SELECT finished_at, started_at FROM jobs "
+            "WHERE status = 'done' AND finished_at IS NOT NULL ORDER BY id DESC LIMIT ?)",
+            (DURATION_SAMPLE,)
+        ).fetchone()[0]
+        # Without registered workers, the jobs running now are the best guess of the capacity
+        start = estimate_start(position, running, max(running, 1), average or DEFAULT_PIPELINE_SECONDS,
+                               now=datetime.now())
+        return {"position": position, "estimated_start": start.isoformat()}
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Count the jobs per status.
+
+        Returns:
+            Dictionary of job counts
+        """
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows))
+        return counts
+
+
+def get_job_queue(path: Optional[str] = None) -> JobQueue:
+    """
+    Get the job queue of a database file, shared within the process.
+
+    Args:
+        path: Database file (defaults to the configured job queue path)
+
+    Returns:
+        Shared JobQueue
+    """
+    if path is None:
+        from config.settings import settings
+        path = settings.job_queue_path or settings.task_db_path
+    with _queues_lock:
+        queue = _queues.get(path)
+        if queue is None:
+            from config.settings import settings
+            queue = JobQueue(path, lease_seconds=settings.job_lease_seconds, max_attempts=settings.job_max_attempts,
+                             weights=configured_weights())
+            _queues[path] = queue
+        return queue
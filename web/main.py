@@ -1,20 +1,50 @@
 """
 Main entry point for the AutoGen multi-agent code generation web application.
 """
+import asyncio
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 
 from config.settings import settings
-from web.api import api_router
+from web.api import api_router, drain_pipelines, reconcile_interrupted_tasks, renew_task_leases, stop_accepting_work
+from web.serialization import FastJSONResponse
+from web.static_assets import PrecompressedStaticFiles
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Reconcile the tasks a previous server run left unfinished at startup,
+    renew the leases of this process's tasks while it runs, and drain the
+    running pipelines at shutdown.
+    """
+    reconciled = reconcile_interrupted_tasks()
+    if reconciled["resumed"]:
+        print(f"Resumed {len(reconciled['resumed'])} interrupted task(s) from their last checkpoint")
+    if reconciled["failed"]:
+        print(f"Marked {len(reconciled['failed'])} interrupted task(s) that cannot be resumed as failed")
+    leases = asyncio.create_task(renew_task_leases())
+    
+    yield
+    
+    stop_accepting_work()
+    interrupted = await drain_pipelines(settings.shutdown_drain_timeout)
+    leases.cancel()
+    if interrupted:
+        print(f"Interrupted {interrupted} running pipeline(s); they resume from their checkpoint on restart")
+
 
 # Create the FastAPI app
 app = FastAPI(
     title="AutoGen Multi-Agent Code Generation System",
     description="A web API for generating, reviewing, and optimizing Python code using AutoGen agents",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -26,18 +56,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses, with brotli when the optional brotli-asgi package is installed
+try:
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(BrotliMiddleware, minimum_size=settings.response_compression_min_size)
+except ImportError:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.response_compression_min_size)
+
 # Include API routes
 app.include_router(api_router)
 
-# Serve static files
+# Serve static files, from the hashed and precompressed build when it exists
 static_dir = os.path.join(os.path.dirname(__file__), "frontend")
-if os.path.exists(static_dir):
+build_dir = os.path.join(static_dir, "dist")
+if os.path.exists(os.path.join(build_dir, "index.html")):
+    app.mount("/static", PrecompressedStaticFiles(directory=build_dir), name="static")
+elif os.path.exists(static_dir):
     app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
-# In-memory storage for tasks (in production, use a database)
-tasks_storage = {}
-
-
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -56,11 +92,18 @@ async def health_check():
 
 
 if __name__ == "__main__":
+    # Workers only share tasks through a shared task backend
+    if settings.workers > 1 and settings.task_backend == "memory":
+        raise SystemExit("WORKERS > 1 requires a shared task backend, e.g. TASK_BACKEND=sqlite")
+    if settings.pipeline_mode == "worker" and settings.task_backend == "memory":
+        raise SystemExit("PIPELINE_MODE=worker requires a shared task backend, e.g. TASK_BACKEND=sqlite")
+    
     # Run the application
     uvicorn.run(
         "web.main:app",
         host=settings.host,
         port=settings.port,
-        reload=settings.app_env == "development",
+        workers=settings.workers,
+        reload=settings.app_env == "development" and settings.workers == 1,
         log_level=settings.log_level.lower()
     )
\ No newline at end of file
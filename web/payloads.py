@@ -0,0 +1,126 @@
+"""
+Task result payloads for the AutoGen multi-agent code generation web application.
+The stages of the pipeline all carry the code they worked on, so a raw
+result repeats the same code several times. Results are stored normalized:
+each distinct piece of code is kept once in an "artifacts" map keyed by
+content hash, and the code fields hold the artifact id instead.
+"""
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# Code-bearing fields of a task result, as (section, field); None is the top level
+CODE_FIELDS = (
+    (None, "generated_code"),
+    ("review_result", "code"),
+    ("optimization_result", "original_code"),
+    ("optimization_result", "optimized_code"),
+    ("test_result", "source_code"),
+    ("test_result", "test_code"),
+    ("refinement_result", "code"),
+    ("refinement_result", "test_code")
+)
+
+ARTIFACTS_KEY = "artifacts"
+
+
+def artifact_id(code: str) -> str:
+    """
+    Compute the id of a code artifact.
+
+    Args:
+        code: Code text
+
+    Returns:
+        Short content hash
+    """
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()[:16]
+
+
+def _code_slots(result: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    """Yield (container, field) pairs of the code fields present in a result."""
+    for section, field in CODE_FIELDS:
+        container = result if section is None else result.get(section)
+        if isinstance(container, dict) and isinstance(container.get(field), str):
+            yield container, field
+
+
+def normalize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Store each code artifact of a task result once and reference it by id.
+
+    Args:
+        result: Task result with inline code
+
+    Returns:
+        Copy of the result with artifact ids in the code fields and an "artifacts" map
+    """
+    normalized = {key: dict(value) if isinstance(value, dict) else value for key, value in result.items()}
+    artifacts = {}
+    for container, field in _code_slots(normalized):
+        code = container[field]
+        code_id = artifact_id(code)
+        artifacts[code_id] = code
+        container[field] = code_id
+    normalized[ARTIFACTS_KEY] = artifacts
+    return normalized
+
+
+def resolve_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Inline the code artifacts of a normalized task result.
+
+    Args:
+        result: Normalized task result
+
+    Returns:
+        Copy of the result with the code in the code fields and no "artifacts" map
+    """
+    artifacts = result.get(ARTIFACTS_KEY, {})
+    resolved = {key: dict(value) if isinstance(value, dict) else value
+                for key, value in result.items() if key != ARTIFACTS_KEY}
+    for container, field in _code_slots(resolved):
+        container[field] = artifacts.get(container[field], container[field])
+    return resolved
+
+
+def _select(value: Any, path: List[str]) -> Any:
+    """Pick a nested value by path; missing paths yield None."""
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def select_fields(result: Dict[str, Any], fields: Optional[List[str]] = None,
+                  include_code: bool = True) -> Dict[str, Any]:
+    """
+    Build the result payload of a status response.
+
+    Args:
+        result: Normalized task result
+        fields: Result fields to return, dotted for nested fields
+            (e.g. "optimization_result.performance_gain"); all by default
+        include_code: Whether to include the artifacts referenced by the returned fields
+
+    Returns:
+        Result payload
+    """
+    if fields:
+        payload: Dict[str, Any] = {}
+        for field in fields:
+            path = field.split(".")
+            if path[0] == ARTIFACTS_KEY:
+                continue
+            target = payload
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = _select(result, path)
+    else:
+        payload = {key: value for key, value in result.items() if key != ARTIFACTS_KEY}
+
+    if include_code:
+        artifacts = result.get(ARTIFACTS_KEY, {})
+        referenced: Set[str] = {container[field] for container, field in _code_slots(payload)}
+        payload[ARTIFACTS_KEY] = {code_id: artifacts[code_id] for code_id in referenced if code_id in artifacts}
+    return payload
@@ -0,0 +1,193 @@
+"""
+Pipeline scheduling for the AutoGen multi-agent code generation web application.
+Pipelines are scheduled by weighted fair queuing: every (priority class,
+client) pair is a flow, and each queued run gets a virtual finish tag of
+
+    max(virtual time, finish tag of the flow's previous run) + 1 / class weight
+
+Runs start in tag order. A client submitting many runs only pushes its own
+tags further out, so other clients keep being served, and interactive runs
+get a larger share of the capacity than batch runs. Clients are identified
+by their API key.
+
+FairScheduler runs pipelines in the API process (inline mode); the job queue
+applies the same tags to the jobs claimed by the pipeline workers.
+"""
+import asyncio
+import hashlib
+import heapq
+import itertools
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+PRIORITY_CLASSES = ("interactive", "batch")
+DEFAULT_WEIGHTS = {"interactive": 4.0, "batch": 1.0}
+ANONYMOUS_CLIENT = "anonymous"
+
+# Pipeline duration assumed until runs have been measured
+DEFAULT_PIPELINE_SECONDS = 60.0
+# Weight of the latest run in the average pipeline duration
+DURATION_SMOOTHING = 0.2
+
+
+def client_identity(api_key: Optional[str]) -> str:
+    """
+    Derive a client identity from an API key, without keeping the key itself.
+
+    Args:
+        api_key: Value of the API key header, if any
+
+    Returns:
+        Short hash of the key, or "anonymous"
+    """
+    if not api_key:
+        return ANONYMOUS_CLIENT
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def configured_weights() -> Dict[str, float]:
+    """Get the weight per priority class from the settings."""
+    from config.settings import settings
+    return {"interactive": settings.scheduler_interactive_weight, "batch": settings.scheduler_batch_weight}
+
+
+def class_weight(priority: str, weights: Optional[Dict[str, float]] = None) -> float:
+    """
+    Get the scheduling weight of a priority class.
+
+    Args:
+        priority: Priority class, e.g. "interactive" or "batch"
+        weights: Weight per class (defaults to DEFAULT_WEIGHTS)
+
+    Returns:
+        Weight of the class
+
+    Raises:
+        ValueError: If the priority class is unknown
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    if priority not in weights:
+        raise ValueError(f"Unknown priority class: {priority} (expected one of {', '.join(weights)})")
+    return weights[priority]
+
+
+def finish_tag(virtual_time: float, last_finish: float, weight: float) -> float:
+    """Compute the virtual finish tag of a run of a flow."""
+    return max(virtual_time, last_finish) + 1.0 / weight
+
+
+def estimate_start(position: int, running: int, capacity: int, average_seconds: float,
+                   now: Optional[datetime] = None) -> datetime:
+    """
+    Estimate when a queued run starts.
+
+    Args:
+        position: Number of runs queued ahead of it
+        running: Number of runs in progress
+        capacity: Number of runs that can be in progress at a time
+        average_seconds: Average pipeline duration
+        now: Current time (defaults to now)
+
+    Returns:
+        Estimated start time
+    """
+    now = now or datetime.now()
+    capacity = max(capacity, 1)
+    free = max(capacity - running, 0)
+    if position < free:
+        return now
+    rounds = (position - free) // capacity + 1
+    return now + timedelta(seconds=rounds * average_seconds)
+
+
+class FairScheduler:
+    """Weighted fair queue of pipeline runs in the current process, with a concurrency limit."""
+
+    def __init__(self, concurrency: int, weights: Optional[Dict[str, float]] = None):
+        """
+        Create the scheduler.
+
+        Args:
+            concurrency: Number of pipelines run at a time
+            weights: Weight per priority class (defaults to DEFAULT_WEIGHTS)
+        """
+        self.concurrency = concurrency
+        self.weights = weights or DEFAULT_WEIGHTS
+        self.running: Dict[asyncio.Task, str] = {}
+        self.average_seconds = DEFAULT_PIPELINE_SECONDS
+        self._queue: List[tuple] = []
+        self._sequence = itertools.count()
+        self._flows: Dict[tuple, float] = {}
+        self._virtual_time = 0.0
+
+    def submit(self, task_id: str, run: Callable[[], Awaitable[Any]], priority: str = "interactive",
+               client: str = ANONYMOUS_CLIENT) -> None:
+        """
+        Queue a pipeline run and start it when its turn comes.
+
+        Args:
+            task_id: Task the run belongs to
+            run: Function creating the pipeline coroutine
+            priority: Priority class
+            client: Client identity
+
+        Raises:
+            ValueError: If the priority class is unknown
+        """
+        flow = (priority, client)
+        tag = finish_tag(self._virtual_time, self._flows.get(flow, 0.0), class_weight(priority, self.weights))
+        self._flows[flow] = tag
+        heapq.heappush(self._queue, (tag, next(self._sequence), task_id, run))
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Start queued runs while there is capacity."""
+        while self._queue and len(self.running) < self.concurrency:
+            tag, _, task_id, run = heapq.heappop(self._queue)
+            self._virtual_time = max(self._virtual_time, tag)
+            started = asyncio.get_running_loop().time()
+            pipeline = asyncio.ensure_future(run())
+            self.running[pipeline] = task_id
+            pipeline.add_done_callback(lambda done, started=started: self._finished(done, started))
+
+    def _finished(self, pipeline: asyncio.Task, started: float) -> None:
+        """Record a finished run's duration and start the next runs."""
+        self.running.pop(pipeline, None)
+        # Flows whose tags the virtual time has passed no longer affect new tags
+        self._flows = {flow: tag for flow, tag in self._flows.items() if tag > self._virtual_time}
+        if not pipeline.cancelled():
+            duration = asyncio.get_running_loop().time() - started
+            self.average_seconds += DURATION_SMOOTHING * (duration - self.average_seconds)
+        self._dispatch()
+
+    def queue_status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the queue position and estimated start time of a queued run.
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            Dictionary with position and estimated_start, or None if the task is not queued
+        """
+        ordered = sorted(self._queue)
+        for position, entry in enumerate(ordered):
+            if entry[2] == task_id:
+                start = estimate_start(position, len(self.running), self.concurrency, self.average_seconds)
+                return {"position": position, "estimated_start": start.isoformat()}
+        return None
+
+    def task_ids(self) -> List[str]:
+        """Get the task IDs of the queued and the running runs."""
+        return [entry[2] for entry in self._queue] + list(self.running.values())
+
+    def cancel_queued(self) -> List[str]:
+        """
+        Drop the runs that have not started.
+
+        Returns:
+            Task IDs of the dropped runs
+        """
+        task_ids = [entry[2] for entry in sorted(self._queue)]
+        self._queue.clear()
+        return task_ids
@@ -0,0 +1,95 @@
+"""
+Fast JSON serialization for the AutoGen multi-agent code generation web application.
+Task status responses can carry large results and are requested on every
+poll, so they are serialized with orjson when it is installed and the
+serialized bytes are cached per task version: an unchanged task is
+serialized once, however often it is polled.
+"""
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Hashable, Optional
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DEFAULT_CACHE_ENTRIES = 256
+
+
+def _default(value: Any) -> Any:
+    """Serialize values the JSON encoder does not handle natively."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes, with orjson when available.
+
+    Args:
+        content: JSON-compatible content; datetimes and Pydantic models are converted
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response serialized with orjson when it is installed."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class SerializedCache:
+    """Bounded LRU cache of serialized response bodies."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES):
+        """
+        Create the cache.
+
+        Args:
+            max_entries: Maximum number of cached bodies
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Get a cached body, or None."""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        """Cache a body, evicting the least recently used ones beyond the limit."""
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached bodies."""
+        with self._lock:
+            self._entries.clear()
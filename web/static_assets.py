@@ -0,0 +1,71 @@
+"""
+Static asset serving for the AutoGen multi-agent code generation web application.
+Serves the frontend build written by tools/build_assets.py: the
+precompressed .br or .gz variant of a file is sent when the client accepts
+it, and content-hashed files are marked immutable so browsers never
+download them twice. Other files, such as index.html, are revalidated on
+every visit so they always point at the current hashed assets.
+"""
+import mimetypes
+import os
+import re
+import stat
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Precompressed variants in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Names written by the build, e.g. script.0123456789.js
+HASHED_NAME = re.compile(r"\.[0-9a-f]{10}\.[A-Za-z0-9]+$")
+
+
+def _accepted_encodings(scope: Scope) -> set:
+    """Parse the content codings a client accepts."""
+    accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+    encodings = set()
+    for part in accept_encoding.split(","):
+        coding, _, parameters = part.strip().partition(";")
+        if parameters.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        encodings.add(coding.strip().lower())
+    return encodings
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves precompressed variants with long-lived cache headers."""
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        cache_control = IMMUTABLE_CACHE_CONTROL if HASHED_NAME.search(path) else REVALIDATE_CACHE_CONTROL
+        accepted = _accepted_encodings(scope)
+
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+                continue
+            media_type = mimetypes.guess_type(os.path.basename(path))[0] or "application/octet-stream"
+            return FileResponse(
+                full_path,
+                stat_result=stat_result,
+                media_type=media_type,
+                headers={
+                    "Content-Encoding": encoding,
+                    "Vary": "Accept-Encoding",
+                    "Cache-Control": cache_control
+                }
+            )
+
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = cache_control
+            response.headers["Vary"] = "Accept-Encoding"
+        return response
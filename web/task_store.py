@@ -0,0 +1,394 @@
+"""
+Task storage backends for the AutoGen multi-agent code generation web application.
+The memory backend keeps tasks in the process, which is enough for a single
+server process. The SQLite backend keeps them in a WAL-mode database on
+local disk, so several uvicorn workers share their tasks: any worker can
+answer a status poll, and long-polling clients on one worker are woken by
+updates made in another.
+
+Both backends behave like a dictionary of task records keyed by task ID.
+Changes go through update(), which bumps the task version and wakes the
+clients waiting for it. Task leases are kept next to the records, so
+renewing them leaves the task version alone.
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+TASK_BACKENDS = ("memory", "sqlite")
+
+# Task fields stored as datetimes
+DATETIME_FIELDS = ("created_at", "updated_at", "queued_at")
+
+DEFAULT_POLL_INTERVAL = 0.1
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    """Resolve a waiter on its own event loop."""
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class _Waiters:
+    """Futures of clients waiting for task changes, possibly on several event loops."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+
+    def add(self, task_id: str) -> asyncio.Future:
+        waiter = asyncio.get_running_loop().create_future()
+        with self._lock:
+            self._waiters.setdefault(task_id, []).append(waiter)
+        return waiter
+
+    def remove(self, task_id: str, waiter: asyncio.Future) -> None:
+        with self._lock:
+            waiters = self._waiters.get(task_id)
+            if waiters and waiter in waiters:
+                waiters.remove(waiter)
+                if not waiters:
+                    del self._waiters[task_id]
+
+    def task_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._waiters)
+
+    def notify(self, task_id: str) -> None:
+        with self._lock:
+            waiters = self._waiters.pop(task_id, [])
+        for waiter in waiters:
+            loop = waiter.get_loop()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_wake, waiter)
+
+
+class _TaskStore:
+    """Long-poll support shared by the task stores."""
+
+    def __init__(self):
+        self._waiters = _Waiters()
+
+    def _version(self, task_id: str) -> Optional[int]:
+        """Get the current version of a task."""
+        raise NotImplementedError
+
+    def lease_expires(self, task_id: str) -> Optional[float]:
+        """Get the expiry time of a task's lease, or None if it has none."""
+        raise NotImplementedError
+
+    def set_lease(self, task_id: str, expires: float, expired_by: Optional[float] = None) -> bool:
+        """
+        Take or renew a task's lease without bumping its version.
+
+        Args:
+            task_id: Task ID
+            expires: New expiry time of the lease
+            expired_by: Only take the lease if it expired before this time
+
+        Returns:
+            True if the lease was set, False if it was still live at expired_by
+        """
+        raise NotImplementedError
+
+    def _watch_updates(self) -> None:
+        """Make sure updates made outside this process wake the waiters."""
+
+    async def wait_for_change(self, task_id: str, version: int, timeout: float) -> None:
+        """
+        Wait until a task's version differs from the given one, or the timeout elapses.
+
+        Args:
+            task_id: Task ID
+            version: Version the client already has
+            timeout: Maximum wait in seconds
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            waiter = self._waiters.add(task_id)
+            try:
+                remaining = deadline - loop.time()
+                if self._version(task_id) != version or remaining <= 0:
+                    return
+                self._watch_updates()
+                await asyncio.wait_for(asyncio.shield(waiter), remaining)
+            except asyncio.TimeoutError:
+                return
+            finally:
+                self._waiters.remove(task_id, waiter)
+
+
+class MemoryTaskStore(_TaskStore):
+    """Tasks kept in process memory."""
+
+    def __init__(self):
+        super().__init__()
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._leases: Dict[str, float] = {}
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._tasks
+
+    def __getitem__(self, task_id: str) -> Dict[str, Any]:
+        return self._tasks[task_id]
+
+    def __setitem__(self, task_id: str, task: Dict[str, Any]) -> None:
+        self._tasks[task_id] = task
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._tasks))
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def get(self, task_id: str, default: Any = None) -> Any:
+        return self._tasks.get(task_id, default)
+
+    def pop(self, task_id: str, *default: Any) -> Any:
+        self._leases.pop(task_id, None)
+        return self._tasks.pop(task_id, *default)
+
+    def update(self, task_id: str, expected_version: Optional[int] = None, **changes) -> Optional[Dict[str, Any]]:
+        """
+        Update a task, bump its version and wake the clients waiting for it.
+
+        Args:
+            task_id: Task ID
+            expected_version: Only update the task if it is still at this version
+            **changes: Task fields to set
+
+        Returns:
+            The updated task, or None if its version differs from expected_version
+        """
+        task = self._tasks[task_id]
+        if expected_version is not None and task.get("version", 0) != expected_version:
+            return None
+        task.update(changes)
+        task["updated_at"] = datetime.now()
+        task["version"] = task.get("version", 0) + 1
+        self._waiters.notify(task_id)
+        return task
+
+    def _version(self, task_id: str) -> Optional[int]:
+        task = self._tasks.get(task_id)
+        return task.get("version", 0) if task is not None else None
+
+    def lease_expires(self, task_id: str) -> Optional[float]:
+        return self._leases.get(task_id)
+
+    def set_lease(self, task_id: str, expires: float, expired_by: Optional[float] = None) -> bool:
+        if expired_by is not None and self._leases.get(task_id, 0) >= expired_by:
+            return False
+        self._leases[task_id] = expires
+        return True
+
+
+def _encode_task(task: Dict[str, Any]) -> str:
+    """Serialize a task record for the database."""
+    data = dict(task)
+    for field in DATETIME_FIELDS:
+        if isinstance(data.get(field), datetime):
+            data[field] = data[field].isoformat()
+    return json.dumps(data, default=str)
+
+
+def _decode_task(data: str) -> Dict[str, Any]:
+    """Deserialize a task record from the database."""
+    task = json.loads(data)
+    for field in DATETIME_FIELDS:
+        if isinstance(task.get(field), str):
+            task[field] = datetime.fromisoformat(task[field])
+    return task
+
+
+class SqliteTaskStore(_TaskStore):
+    """
+    Tasks kept in a SQLite database in WAL mode, shared by all processes using the same file.
+    Updates made by other processes are detected by a watcher per event loop
+    that polls the database's data_version, a cheap check that changes
+    whenever another connection commits, and then wakes the waiters to
+    re-check their task.
+    """
+
+    def __init__(self, path: str, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Open the store.
+
+        Args:
+            path: Database file
+            poll_interval: Seconds between checks for updates made by other processes
+        """
+        super().__init__()
+        self.path = path
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        self._watchers: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS tasks (task_id TEXT PRIMARY KEY, version INTEGER NOT NULL, data TEXT NOT NULL)"
+        )
+        connection.execute("CREATE TABLE IF NOT EXISTS task_leases (task_id TEXT PRIMARY KEY, expires REAL NOT NULL)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection to the database."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def __contains__(self, task_id: str) -> bool:
+        row = self._connection().execute("SELECT 1 FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return row is not None
+
+    def __getitem__(self, task_id: str) -> Dict[str, Any]:
+        row = self._connection().execute("SELECT data FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        if row is None:
+            raise KeyError(task_id)
+        return _decode_task(row[0])
+
+    def __setitem__(self, task_id: str, task: Dict[str, Any]) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO tasks (task_id, version, data) VALUES (?, ?, ?)",
+            (task_id, task.get("version", 0), _encode_task(task))
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([row[0] for row in self._connection().execute("SELECT task_id FROM tasks")])
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def get(self, task_id: str, default: Any = None) -> Any:
+        try:
+            return self[task_id]
+        except KeyError:
+            return default
+
+    def pop(self, task_id: str, *default: Any) -> Any:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT data FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+            connection.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+            connection.execute("DELETE FROM task_leases WHERE task_id = ?", (task_id,))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        if row is None:
+            if default:
+                return default[0]
+            raise KeyError(task_id)
+        return _decode_task(row[0])
+
+    def update(self, task_id: str, expected_version: Optional[int] = None, **changes) -> Optional[Dict[str, Any]]:
+        """
+        Update a task atomically, bump its version and wake the clients waiting for it.
+
+        Args:
+            task_id: Task ID
+            expected_version: Only update the task if it is still at this version
+            **changes: Task fields to set
+
+        Returns:
+            The updated task, or None if its version differs from expected_version
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT data FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+            if row is None:
+                raise KeyError(task_id)
+            task = _decode_task(row[0])
+            if expected_version is not None and task.get("version", 0) != expected_version:
+                connection.execute("ROLLBACK")
+                return None
+            task.update(changes)
+            task["updated_at"] = datetime.now()
+            task["version"] = task.get("version", 0) + 1
+            connection.execute("UPDATE tasks SET version = ?, data = ? WHERE task_id = ?",
+                               (task["version"], _encode_task(task), task_id))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        self._waiters.notify(task_id)
+        return task
+
+    def _version(self, task_id: str) -> Optional[int]:
+        row = self._connection().execute("SELECT version FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return row[0] if row else None
+
+    def lease_expires(self, task_id: str) -> Optional[float]:
+        row = self._connection().execute("SELECT expires FROM task_leases WHERE task_id = ?", (task_id,)).fetchone()
+        return row[0] if row else None
+
+    def set_lease(self, task_id: str, expires: float, expired_by: Optional[float] = None) -> bool:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if expired_by is not None:
+                row = connection.execute("SELECT expires FROM task_leases WHERE task_id = ?", (task_id,)).fetchone()
+                if row is not None and row[0] >= expired_by:
+                    connection.execute("ROLLBACK")
+                    return False
+            connection.execute("INSERT OR REPLACE INTO task_leases (task_id, expires) VALUES (?, ?)",
+                               (task_id, expires))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return True
+
+    async def _watch(self) -> None:
+        """Wake the waiters after commits by other connections, until no one waits."""
+        connection = self._connection()
+        data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            task_ids = self._waiters.task_ids()
+            if not task_ids:
+                return
+            current = connection.execute("PRAGMA data_version").fetchone()[0]
+            if current != data_version:
+                data_version = current
+                for task_id in task_ids:
+                    self._waiters.notify(task_id)
+
+    def _watch_updates(self) -> None:
+        loop = asyncio.get_running_loop()
+        watcher = self._watchers.get(loop)
+        if watcher is None or watcher.done():
+            self._watchers[loop] = loop.create_task(self._watch())
+
+
+def get_task_store(backend: str = "memory", path: Optional[str] = None,
+                   poll_interval: float = DEFAULT_POLL_INTERVAL):
+    """
+    Create a task store.
+
+    Args:
+        backend: "memory" or "sqlite"
+        path: Database file of the SQLite backend
+        poll_interval: Seconds between cross-process update checks of the SQLite backend
+
+    Returns:
+        MemoryTaskStore or SqliteTaskStore
+    """
+    if backend == "memory":
+        return MemoryTaskStore()
+    if backend == "sqlite":
+        return SqliteTaskStore(path or "tasks.db", poll_interval=poll_interval)
+    raise ValueError(f"Unsupported task backend: {backend}")
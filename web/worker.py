@@ -0,0 +1,130 @@
+"""
+Pipeline worker for the AutoGen multi-agent code generation web application.
+In worker mode (PIPELINE_MODE=worker) the API only enqueues jobs; worker
+processes started with
+
+    python -m web.worker --concurrency N [--processes P]
+
+claim them from the durable job queue, run the pipeline and write the
+results to the shared task store, where the API serves them from.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+from typing import Any, Dict, List, Optional
+
+from agents.models import CodeGenerationRequest
+from config.settings import settings
+from web.api import process_code_generation, tasks_storage, update_task
+from web.job_queue import JobQueue, get_job_queue
+
+# Default worker parameters
+DEFAULT_CONCURRENCY = 4
+
+
+async def _heartbeat(queue: JobQueue, job_id: int) -> None:
+    """Renew a job's lease until cancelled."""
+    while True:
+        await asyncio.sleep(queue.lease_seconds / 3)
+        await asyncio.to_thread(queue.heartbeat, job_id)
+
+
+async def run_job(queue: JobQueue, job: Dict[str, Any]) -> None:
+    """
+    Run the pipeline for one claimed job.
+
+    Args:
+        queue: Queue the job was claimed from
+        job: Claimed job
+    """
+    task_id = job["task_id"]
+    if task_id not in tasks_storage:
+        await asyncio.to_thread(queue.fail, job["id"], "Task not found")
+        return
+    if job["attempts"] > queue.max_attempts:
+        error = f"Job abandoned after {queue.max_attempts} attempts"
+        await asyncio.to_thread(queue.fail, job["id"], error)
+        update_task(task_id, status="failed", error=error)
+        return
+
+    heartbeat = asyncio.create_task(_heartbeat(queue, job["id"]))
+    try:
+        await process_code_generation(task_id, CodeGenerationRequest(**job["payload"]))
+    finally:
+        heartbeat.cancel()
+    await asyncio.to_thread(queue.complete, job["id"])
+
+
+async def run_worker(concurrency: int = DEFAULT_CONCURRENCY, poll_interval: Optional[float] = None,
+                     queue: Optional[JobQueue] = None, max_jobs: Optional[int] = None) -> int:
+    """
+    Claim and run jobs with up to `concurrency` pipelines at a time.
+
+    Args:
+        concurrency: Number of pipelines run at a time
+        poll_interval: Seconds between checks of an empty queue
+        queue: Job queue (defaults to the configured one)
+        max_jobs: Stop after this many jobs, e.g. for tests; run forever by default
+
+    Returns:
+        Number of jobs run
+    """
+    queue = queue or get_job_queue()
+    poll_interval = poll_interval if poll_interval is not None else settings.worker_poll_interval
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    claimed = 0
+
+    async def slot() -> None:
+        nonlocal claimed
+        while max_jobs is None or claimed < max_jobs:
+            # The claim is a blocking SQLite transaction, so it runs off the event loop;
+            # the job is counted first so that concurrent slots do not claim too many
+            claimed += 1
+            job = await asyncio.to_thread(queue.claim, worker_id)
+            if job is None:
+                claimed -= 1
+                await asyncio.sleep(poll_interval)
+                continue
+            await run_job(queue, job)
+
+    await asyncio.gather(*(slot() for _ in range(concurrency)))
+    return claimed
+
+
+def _run_process(concurrency: int) -> None:
+    """Entry point of one worker process."""
+    asyncio.run(run_worker(concurrency))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run pipeline workers from the command line."""
+    parser = argparse.ArgumentParser(description="Run code generation pipeline workers")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Pipelines run at a time per process")
+    parser.add_argument("--processes", type=int, default=1, help="Number of worker processes")
+    args = parser.parse_args(argv)
+
+    if settings.task_backend == "memory":
+        raise SystemExit("Workers require a shared task backend, e.g. TASK_BACKEND=sqlite")
+
+    print(f"Starting {args.processes} worker process(es) with {args.concurrency} pipelines each")
+    if args.processes == 1:
+        _run_process(args.concurrency)
+        return
+
+    processes = [multiprocessing.Process(target=_run_process, args=(args.concurrency,), name=f"pipeline-worker-{i}")
+                 for i in range(args.processes)]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()